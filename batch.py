@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+import os
+
+# Batch matches never open a window; keep pygame quiet in every worker
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game.batch import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare per-tick time of lockstep AI updates against the AI scheduler.
+
+Run from the repository root:
+
+    python -m benchmarks.ai_scheduler --ghosts 300 --maze-size 81 --ticks 2000
+"""
+import os
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game.constants import AI_FRAME_BUDGET
+from game.simulation import Simulation
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def time_ticks(simulation, ticks):
+    """Step the simulation and return the wall time of each tick in ms"""
+    times = []
+    for _ in range(ticks):
+        if simulation.is_over():
+            break
+        start = time.perf_counter()
+        simulation.step()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run(ghosts=300, maze_size=81, ticks=2000, seed=0, budget=AI_FRAME_BUDGET):
+    variants = [
+        ('lockstep', dict(scheduled_ai=False)),
+        ('scheduled', dict(scheduled_ai=True)),
+        (f'budget {budget}ms', dict(scheduled_ai=True, ai_budget=budget)),
+    ]
+
+    print(f"{ghosts} AI ghosts, {maze_size}x{maze_size} maze, {ticks} ticks")
+    print(f"{'AI updates':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'deferred':>10}")
+    for name, options in variants:
+        simulation = Simulation(ai_player=True, ai_ghosts=ghosts, seed=seed, maze_size=maze_size, **options)
+        times = sorted(time_ticks(simulation, ticks))
+        scheduler = simulation.ai_scheduler
+        deferred = scheduler.deferred if scheduler else 0
+        print(f"{name:<14}{percentile(times, 0.5):>9.2f}{percentile(times, 0.95):>9.2f}"
+              f"{percentile(times, 0.99):>9.2f}{times[-1]:>9.2f}{deferred:>10}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark AI scheduling")
+    parser.add_argument('--ghosts', type=int, default=300, help="AI ghosts per match")
+    parser.add_argument('--maze-size', type=int, default=81, help="maze width/height in tiles")
+    parser.add_argument('--ticks', type=int, default=2000, help="simulation ticks per variant")
+    parser.add_argument('--seed', type=int, default=0, help="match seed")
+    parser.add_argument('--budget', type=float, default=AI_FRAME_BUDGET, help="per-tick AI budget in ms")
+    args = parser.parse_args(argv)
+    run(args.ghosts, args.maze_size, args.ticks, args.seed, args.budget)
+
+
+if __name__ == '__main__':
+    main()
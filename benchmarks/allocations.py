@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Trace what each phase of a steady-state headless frame allocates.
+
+Plays a fixed-seed match through the game's update and render, skips the
+first frames (sprite caches, first flow fields), then records every frame
+with the allocation profiler the game uses for --profile-allocations:
+KiB per phase, garbage collector runs, and the source lines whose memory
+grew the most over the measured frames.
+
+Run from the repository root:
+
+    python -m benchmarks.allocations --frames 600 --sites 10
+"""
+import tracemalloc
+
+from benchmarks.ai_scheduler import percentile
+from benchmarks.suite import SEED, init_display, headless_game, advance_frame
+from game import profiler as profiler_module
+from game.constants import STATE_PLAYING, STATE_SPECTATING
+from game.profiler import AllocationProfiler, SECTIONS
+
+
+def run(frames=600, warmup=120, maze_size=35, seed=SEED, sites=10):
+    init_display()
+    game = headless_game(maze_size, seed)
+    for _ in range(warmup):
+        advance_frame(game)
+        game.render()
+
+    profiler = AllocationProfiler(window=frames)
+    profiler.toggle()
+    game.simulation.profiler = profiler
+    before = tracemalloc.take_snapshot()
+    profiler.end_frame()  # Open the first frame
+    while profiler.frame_count < frames and game.state in (STATE_PLAYING, STATE_SPECTATING):
+        profiler.mark()
+        advance_frame(game)
+        profiler.mark()
+        game.render()
+        profiler.lap('render')
+        profiler.end_frame()
+    after = tracemalloc.take_snapshot()
+    measured = list(profiler.frames)
+    status = profiler.status()
+    game.simulation.profiler = None
+    profiler.toggle()  # Stops tracing and clears the window
+
+    if not measured:
+        print(f"The match was over within {warmup} warm-up frames")
+        return measured
+    print(f"{len(measured)} frames after {warmup} warm-up frames (maze {maze_size}, seed {seed})")
+    print(f"  {'KiB per frame':<16}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    for i, name in enumerate(('frame',) + SECTIONS):
+        values = sorted(frame[i] for frame in measured)
+        print(f"  {name:<16}{sum(values) / len(values):>10.2f}{percentile(values, 0.5):>10.2f}"
+              f"{percentile(values, 0.99):>10.2f}{values[-1]:>10.2f}")
+    print(f"  {status}")
+
+    if sites:
+        print("\nLargest memory growth over the measured frames:")
+        # The profiler's own window of frames isn't the game's doing
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, profiler_module.__file__)]
+        growth = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+        for stat in growth[:sites]:
+            frame = stat.traceback[0]
+            print(f"  {stat.size_diff / 1024:>9.1f} KiB {stat.count_diff:>+7} blocks  {frame.filename}:{frame.lineno}")
+    return measured
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Allocations per phase of a steady-state headless frame")
+    parser.add_argument('--frames', type=int, default=600, help="frames to measure")
+    parser.add_argument('--warmup', type=int, default=120, help="frames played before measuring")
+    parser.add_argument('--maze-size', type=int, default=35)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--sites', type=int, default=10, help="source lines with the most growth to list")
+    args = parser.parse_args(argv)
+    run(args.frames, args.warmup, args.maze_size, args.seed, args.sites)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Compare fresh A* searches against the incremental planner in long chases.
+
+Each chase puts a hunter and a fleeing target on a large maze. Every
+decision the target takes a random step and the hunter replans and
+takes the first step of its path, the way a GhostAI chasing a ghost
+does. Both planners must return paths of the same length.
+
+Run from the repository root:
+
+    python -m benchmarks.chase --maze-size 101 --chases 20 --steps 200
+"""
+import os
+import random
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game.maze import Maze
+from game.ai.pathfinding import DIRECTIONS, NO_CELL, AStar, IncrementalPlanner
+
+
+def _step(graph, position, direction):
+    """Where moving in direction from position lands (following warps), or None"""
+    cell = graph.edges[graph.cell_id(position) * 4 + direction]
+    return None if cell == NO_CELL else graph.position(cell)
+
+
+def _random_step(graph, position, rng):
+    """Land on a random neighbour of position (or stay if boxed in)"""
+    moves = [cell for cell in (_step(graph, position, d) for d in range(4)) if cell is not None]
+    return rng.choice(moves) if moves else position
+
+
+def run(maze_size=101, chases=20, steps=200, seed=0):
+    """Run the same seeded chases with both planners and report nodes per decision"""
+    rng = random.Random(seed)
+    maze = Maze(random.Random(rng.getrandbits(32)), size=maze_size)
+    graph = maze.get_graph()
+    totals = {'A*': [0.0, 0], 'incremental': [0.0, 0]}
+    decisions = 0
+
+    for _ in range(chases):
+        hunter = maze.get_random_walkable_position()
+        target = maze.get_random_walkable_position()
+        astar = AStar(maze)
+        planner = IncrementalPlanner(maze)
+
+        for _ in range(steps):
+            target = _random_step(graph, target, rng)
+            results = {}
+            for name, pathfinder in (('A*', astar), ('incremental', planner)):
+                nodes_before = pathfinder.nodes_expanded
+                start = time.perf_counter()
+                results[name] = pathfinder.find_path(hunter, target)
+                totals[name][0] += time.perf_counter() - start
+                totals[name][1] += pathfinder.nodes_expanded - nodes_before
+            decisions += 1
+
+            path = results['A*']
+            if len(path) != len(results['incremental']):
+                raise AssertionError(f"path lengths differ from {hunter} to {target}")
+            if len(path) < 2:
+                break
+            move = (path[1][0] - hunter[0], path[1][1] - hunter[1])
+            hunter = _step(graph, hunter, DIRECTIONS.index(move))
+
+    print(f"{decisions} decisions over {chases} chases on a {maze_size}x{maze_size} maze")
+    print(f"{'planner':<14}{'nodes/decision':>16}{'ms/decision':>13}")
+    for name, (elapsed, nodes) in totals.items():
+        print(f"{name:<14}{nodes / decisions:>16.1f}{elapsed * 1000 / decisions:>13.3f}")
+    ratio = totals['A*'][1] / max(1, totals['incremental'][1])
+    print(f"incremental planner expands {ratio:.1f}x fewer nodes")
+    return totals
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark incremental path repair in chases")
+    parser.add_argument('--maze-size', type=int, default=101, help="maze width/height in tiles")
+    parser.add_argument('--chases', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=200, help="decisions per chase")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    run(args.maze_size, args.chases, args.steps, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Compare the indexed A* against the original list-scanning implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.pathfinding --mazes 5 --pairs 200
+"""
+import heapq
+import os
+import random
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game.maze import Maze
+from game.ai.pathfinding import AStar
+
+
+class LegacyAStar:
+    """The original A* (list-scan membership test, tuple-keyed dicts), kept for comparison"""
+    def __init__(self, maze):
+        self.maze = maze
+        self.nodes_expanded = 0
+
+    def find_path(self, start, end):
+        if not self.maze.is_walkable(start[0], start[1]) or not self.maze.is_walkable(end[0], end[1]):
+            return []
+        if start == end:
+            return [start]
+
+        open_set = []
+        closed_set = set()
+        heapq.heappush(open_set, (0, 0, start, None))
+        g_scores = {start: 0}
+        f_scores = {start: self._heuristic(start, end)}
+        parents = {}
+        max_iterations = self.maze.size * self.maze.size
+        iterations = 0
+
+        while open_set and iterations < max_iterations:
+            iterations += 1
+            self.nodes_expanded += 1
+            _, g_score, current, parent = heapq.heappop(open_set)
+            if current == end:
+                path = [current]
+                while current in parents:
+                    current = parents[current]
+                    path.append(current)
+                path.reverse()
+                return path
+
+            closed_set.add(current)
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                neighbor = (current[0] + dx, current[1] + dy)
+                if neighbor in closed_set:
+                    continue
+                if not self.maze.is_walkable(neighbor[0], neighbor[1]):
+                    continue
+                tentative_g_score = g_score + 1
+                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
+                    parents[neighbor] = current
+                    g_scores[neighbor] = tentative_g_score
+                    f_scores[neighbor] = tentative_g_score + self._heuristic(neighbor, end)
+                    if neighbor not in [n[2] for n in open_set]:
+                        heapq.heappush(open_set, (f_scores[neighbor], g_scores[neighbor], neighbor, current))
+        return []
+
+    def _heuristic(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _time_searches(pathfinder, pairs):
+    """Run every pair once; return (seconds, nodes expanded, paths found)"""
+    nodes_before = pathfinder.nodes_expanded
+    found = 0
+    start = time.perf_counter()
+    for a, b in pairs:
+        if pathfinder.find_path(a, b):
+            found += 1
+    elapsed = time.perf_counter() - start
+    return elapsed, pathfinder.nodes_expanded - nodes_before, found
+
+
+def run(mazes=5, pairs_per_maze=200, seed=0):
+    """Benchmark both implementations on the same seeded mazes and endpoint pairs"""
+    rng = random.Random(seed)
+    totals = {'legacy': [0.0, 0, 0], 'indexed': [0.0, 0, 0]}
+
+    for _ in range(mazes):
+        maze = Maze(random.Random(rng.getrandbits(32)))
+        pairs = [(maze.get_random_walkable_position(), maze.get_random_walkable_position())
+                 for _ in range(pairs_per_maze)]
+
+        for name, pathfinder in (('legacy', LegacyAStar(maze)), ('indexed', AStar(maze))):
+            elapsed, nodes, found = _time_searches(pathfinder, pairs)
+            totals[name][0] += elapsed
+            totals[name][1] += nodes
+            totals[name][2] += found
+
+    searches = mazes * pairs_per_maze
+    print(f"{searches} searches over {mazes} mazes")
+    print(f"{'implementation':<16}{'nodes/sec':>14}{'searches/sec':>16}{'paths found':>14}")
+    for name, (elapsed, nodes, found) in totals.items():
+        print(f"{name:<16}{nodes / elapsed:>14,.0f}{searches / elapsed:>16,.1f}{found:>14}")
+    speedup = totals['legacy'][0] / totals['indexed'][0]
+    print(f"indexed A* is {speedup:.1f}x faster per search")
+    return totals
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark A* implementations")
+    parser.add_argument('--mazes', type=int, default=5)
+    parser.add_argument('--pairs', type=int, default=200, help="random start/end pairs per maze")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    run(args.mazes, args.pairs, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Time the game's hot paths on fixed-seed fixtures and compare against a baseline.
+
+Each benchmark times one operation repeatedly and reports operations per
+second and the p50/p99 time per operation. Results are written as JSON;
+given a baseline (an earlier results file) every benchmark whose p50 got
+slower by more than the threshold is flagged, and the exit status is 1.
+
+Timings only compare on the same machine, so no baseline ships with the
+repository: record one with --save-baseline on a known-good checkout, and
+later runs compare against it (benchmark_baseline.json unless --baseline
+names another file). Run from the repository root:
+
+    python -m benchmarks.suite --save-baseline
+    python -m benchmarks.suite --filter astar
+    python -m benchmarks.suite --baseline main.json -o benchmark_results.json
+"""
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from benchmarks.ai_scheduler import percentile
+from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_TICK, GHOST_COLORS, BLUE
+from game.maze import Maze
+from game.simulation import Simulation
+from game.entities.pacman import PacMan
+from game.ai.pathfinding import AStar
+from game.entities import sprites
+
+SEED = 0
+MAZE_SIZES = (25, 35, 51, 101)
+COLLISION_GHOSTS = (10, 100, 500)
+
+
+def measure(op, setup=None, min_time=0.5, min_samples=10, max_samples=100000):
+    """Time op until min_time of samples (and at least min_samples) are in.
+
+    With setup, each sample calls op(setup()) and only op is timed, for
+    operations that consume their fixture; slow setups end sampling after
+    ten times min_time of wall time.
+    """
+    samples = []
+    timed = 0
+    deadline = time.perf_counter() + min_time * 10
+    while len(samples) < max_samples:
+        if len(samples) >= min_samples and (timed >= min_time or time.perf_counter() >= deadline):
+            break
+        fixture = setup() if setup else None
+        start = time.perf_counter()
+        if setup:
+            op(fixture)
+        else:
+            op()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        timed += elapsed
+
+    samples.sort()
+    return {
+        'ops_per_sec': len(samples) / timed,
+        'p50_ms': percentile(samples, 0.5) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'samples': len(samples),
+    }
+
+
+def _maze(size, seed=SEED):
+    return Maze(random.Random(seed), size)
+
+
+def bench_maze_generation():
+    for size in MAZE_SIZES:
+        yield f'maze.generate[{size}]', lambda size=size: (lambda: _maze(size), None)
+
+
+def bench_maze_surface():
+    for size in MAZE_SIZES:
+        yield f'maze.render_surface[{size}]', lambda size=size: (_maze(size)._render_maze_surface, None)
+
+
+def _worst_pairs(maze, rng, sampled=200, kept=8):
+    """The sampled start/end pairs that make A* expand the most nodes"""
+    pathfinder = AStar(maze)
+    scored = []
+    for _ in range(sampled):
+        start = maze.get_random_walkable_position(rng)
+        end = maze.get_random_walkable_position(rng)
+        before = pathfinder.nodes_expanded
+        pathfinder.find_path(start, end)
+        scored.append((pathfinder.nodes_expanded - before, start, end))
+    scored.sort(reverse=True)
+    return [(start, end) for _, start, end in scored[:kept]]
+
+
+def _astar_fixture(size):
+    maze = _maze(size)
+    pairs = _worst_pairs(maze, random.Random(SEED))
+    pathfinder = AStar(maze)
+
+    def solve():
+        for start, end in pairs:
+            pathfinder.find_path(start, end)
+    return solve, None
+
+
+def bench_astar():
+    for size in (35, 101):
+        yield f'astar.worst_case_x8[{size}]', lambda size=size: _astar_fixture(size)
+
+
+def _ghost_ai_fixture():
+    # A match a few seconds in, so PacMans are out; every AI decides at once
+    simulation = Simulation(seed=SEED, ai_ghosts=9, maze_size=35)
+    for _ in range(500):
+        simulation.step()
+
+    def setup():
+        match = simulation.snapshot()
+        for ai in match.ai_controllers:
+            ai.last_decision_time = -ai.decision_interval
+        return match
+
+    def decide_all(match):
+        for ai in match.ai_controllers:
+            ai.update(match.pacmans, match.ghosts)
+    return decide_all, setup
+
+
+def bench_ghost_ai():
+    yield 'ghost_ai.update_all_deciding[9]', _ghost_ai_fixture
+
+
+def _crowd(simulation, group=3):
+    """Stack the ghosts in groups of `group` per tile, a PacMan on every other tile,
+    with mixed levels so both eliminations and ties happen"""
+    occupancy = simulation.occupancy
+    ghosts = simulation.ghosts
+    for start in range(0, len(ghosts) - 1, group):
+        leader = ghosts[start]
+        for offset, ghost in enumerate(ghosts[start + 1:start + group]):
+            occupancy.remove(ghost)
+            ghost.grid_x, ghost.grid_y = leader.grid_x, leader.grid_y
+            ghost.pixel_x = ghost.target_x = leader.pixel_x
+            ghost.pixel_y = ghost.target_y = leader.pixel_y
+            occupancy.add(ghost)
+            if offset % 2:
+                ghost.level_up()
+        if start // group % 2 == 0:
+            pacman = PacMan(leader.grid_x, leader.grid_y, store=simulation.pacman_store)
+            occupancy.add(pacman)
+            simulation.pacmans.append(pacman)
+
+
+def _collision_fixture(ghosts):
+    # Every ghost shares its tile: the checks run on fully crowded boards
+    simulation = Simulation(seed=SEED, ai_ghosts=ghosts, maze_size=51)
+    _crowd(simulation)
+    assert simulation.occupancy.crowded, "collision fixture has no shared tiles"
+    return (lambda match: match._check_collisions()), simulation.snapshot
+
+
+def bench_collisions():
+    for ghosts in COLLISION_GHOSTS:
+        yield f'simulation.check_collisions[{ghosts}]', lambda ghosts=ghosts: _collision_fixture(ghosts)
+
+
+def bench_sprites():
+    colors = [BLUE] + GHOST_COLORS
+
+    def draw_ghost():
+        sprites._draw_ghost(GHOST_COLORS[0], 1, (2, 0), 12)
+
+    def redraw_all():
+        sprites.clear_cache()
+        sprites.warm_cache(colors)
+    yield 'sprites.draw_ghost', lambda: (draw_ghost, None)
+    yield f'sprites.redraw_atlas[{len(colors)} colours]', lambda: (redraw_all, None)
+
+
+def init_display():
+    """Headless display and fonts, as the game sets them up"""
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def headless_game(maze_size=35, seed=SEED):
+    """A Game playing a fixed-seed match on the (dummy) display, without a maze pool"""
+    from game.game import Game
+
+    game = Game(pygame.display.get_surface(), maze_size=maze_size)
+    game.load_deferred()
+    game.maze_pool.close()
+    maze = _maze(maze_size, seed)
+    maze.seed = seed
+    game._start_new_game(seed=seed, maze=maze)
+    return game
+
+
+def advance_frame(game):
+    """Update the game by one tick of game time, whatever the wall time was"""
+    game.last_update_time = pygame.time.get_ticks() - SIMULATION_TICK
+    game.update()
+
+
+def _frame_fixture():
+    game = headless_game()
+
+    def frame():
+        advance_frame(game)
+        game.render()
+    for _ in range(30):
+        frame()
+    return frame, None
+
+
+def bench_frame():
+    yield 'game.frame[update+render]', _frame_fixture
+
+
+# Each bench_* yields (name, fixture); fixture() builds the fixed-seed
+# state and returns (op, setup) for measure(), so filtered-out benchmarks
+# cost nothing
+BENCHMARKS = [bench_maze_generation, bench_maze_surface, bench_astar, bench_ghost_ai, bench_collisions,
+              bench_sprites, bench_frame]
+
+
+def run(name_filter=None, min_time=0.5):
+    """Run every benchmark whose name contains name_filter; returns {name: stats}"""
+    init_display()
+
+    results = {}
+    for bench in BENCHMARKS:
+        for name, fixture in bench():
+            if name_filter and name_filter not in name:
+                continue
+            op, setup = fixture()
+            results[name] = measure(op, setup, min_time)
+            stats = results[name]
+            print(f"  {name:<40}{stats['ops_per_sec']:>12.1f}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """Ratio of p50 to the baseline's per benchmark, and the names slower than 1 + threshold"""
+    ratios = {}
+    for name, stats in results.items():
+        if name in baseline and baseline[name]['p50_ms'] > 0:
+            ratios[name] = stats['p50_ms'] / baseline[name]['p50_ms']
+    regressions = [name for name, ratio in ratios.items() if ratio > 1 + threshold]
+    return ratios, regressions
+
+
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+
+def save_baseline(path, report):
+    """Write report's results as the baseline at path, keeping benchmarks it didn't run"""
+    saved = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            saved = json.load(f)['results']
+    saved.update(report['results'])
+    with open(path, 'w') as f:
+        json.dump(dict(report, results=saved), f, indent=2)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', default=None,
+                        help=f"earlier results file to compare against (default: {DEFAULT_BASELINE}, if present)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="record these results as the baseline instead of comparing against it")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="flag benchmarks whose p50 is this much slower than the baseline (0.1 = 10%%)")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--min-time', type=float, default=0.5, help="seconds of timed samples per benchmark")
+    args = parser.parse_args(argv)
+    if args.baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"baseline {args.baseline} not found")
+
+    print(f"  {'benchmark':<40}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    results = run(args.filter, args.min_time)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': SEED,
+        'results': results,
+    }
+    regressions = []
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        save_baseline(baseline_path, report)
+        print(f"\nBaseline saved to {baseline_path}; later runs compare against it")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)['results']
+        ratios, regressions = compare(results, baseline, args.threshold)
+        report['baseline'] = baseline_path
+        report['vs_baseline'] = ratios
+        report['regressions'] = regressions
+
+        print(f"\n  {'vs ' + baseline_path:<40}{'p50 ratio':>12}")
+        for name, ratio in ratios.items():
+            flag = '  SLOWER' if name in regressions else ''
+            print(f"  {name:<40}{ratio:>12.2f}{flag}")
+    else:
+        print(f"\nNo baseline at {DEFAULT_BASELINE}, so nothing was compared. Timings are machine-specific")
+        print("and none ships with the repository: run with --save-baseline on a known-good checkout")
+        print("to record one, and later runs flag anything slower than it.")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"-> {args.output}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+from array import array
+from game import metrics
+from game.ai.pathfinding import DIRECTIONS, NO_CELL
+
+# Next-hop entries store the DIRECTIONS index + 1 (0 = no move)
+UNREACHABLE = 0xFFFF
+
+ROWS_BUILT = metrics.counter('pacghost_distance_rows_built_total', "Distance table rows filled on first use")
+
+
+class DistanceOracle:
+    """All-pairs shortest-path table for a static maze.
+
+    Walkable cells are numbered compactly and every pair gets a uint16
+    distance and a one-byte next-hop direction, stored row-major by target
+    so that one row answers "how far, and which way" for every source.
+    Rows are filled by one reverse BFS per target cell the first time they
+    are needed (or all at once with build_all), and warp tunnels are
+    treated as ordinary edges.
+
+    A complete table can be passed in as (distances, next_hops), e.g.
+    memory-mapped from a saved maze; it is used as is and never rebuilt.
+    """
+    def __init__(self, maze, tables=None):
+        self.maze = maze
+        self.size = maze.size
+        graph = maze.get_graph()
+
+        # Compact numbering of walkable cells (paths and tunnels)
+        self.cells = []
+        self.index = array('i', [-1]) * (self.size * self.size)
+        for cell, walkable in enumerate(graph.walkable):
+            if walkable:
+                self.index[cell] = len(self.cells)
+                self.cells.append(graph.position(cell))
+        self.count = len(self.cells)
+
+        if tables is not None:
+            self.distances, self.next_hops = tables
+            self.built = b'\x01' * self.count
+            self.reverse_edges = None  # Only needed to build rows
+            return
+
+        # Reverse adjacency: for each cell, the (source, direction) moves landing on it
+        self.reverse_edges = [[] for _ in range(self.count)]
+        for i, (x, y) in enumerate(self.cells):
+            base = (y * self.size + x) * 4
+            for d in range(4):
+                landing = graph.edges[base + d]
+                if landing != NO_CELL:
+                    self.reverse_edges[self.index[landing]].append((i, d + 1))
+
+        # Flat tables, row = target, column = source
+        self.distances = array('H', [UNREACHABLE]) * (self.count * self.count)
+        self.next_hops = bytearray(self.count * self.count)
+        self.built = bytearray(self.count)
+
+    def _cell_index(self, pos):
+        x, y = pos
+        if x < 0 or x >= self.size or y < 0 or y >= self.size:
+            return -1
+        return self.index[y * self.size + x]
+
+    def _build_row(self, target):
+        """Fill one table row with a reverse BFS from the target cell"""
+        count = self.count
+        dist = [UNREACHABLE] * count
+        hops = bytearray(count)
+        dist[target] = 0
+
+        queue = [target]
+        head = 0
+        reverse_edges = self.reverse_edges
+        while head < len(queue):
+            current = queue[head]
+            head += 1
+            next_dist = dist[current] + 1
+            for source, hop in reverse_edges[current]:
+                if dist[source] == UNREACHABLE:
+                    dist[source] = next_dist
+                    hops[source] = hop
+                    queue.append(source)
+
+        row = target * count
+        self.distances[row:row + count] = array('H', dist)
+        self.next_hops[row:row + count] = hops
+        self.built[target] = 1
+        ROWS_BUILT.inc()
+
+    def build_all(self):
+        """Fill every row up front instead of on first use"""
+        for target in range(self.count):
+            if not self.built[target]:
+                self._build_row(target)
+
+    def distance(self, start, end):
+        """Shortest path length from start to end, or None if unreachable"""
+        source = self._cell_index(start)
+        target = self._cell_index(end)
+        if source < 0 or target < 0:
+            return None
+        if not self.built[target]:
+            self._build_row(target)
+
+        dist = self.distances[target * self.count + source]
+        return None if dist == UNREACHABLE else dist
+
+    def next_step(self, start, end):
+        """Direction (dx, dy) of the first move from start toward end, or None"""
+        source = self._cell_index(start)
+        target = self._cell_index(end)
+        if source < 0 or target < 0 or source == target:
+            return None
+        if not self.built[target]:
+            self._build_row(target)
+
+        hop = self.next_hops[target * self.count + source]
+        return DIRECTIONS[hop - 1] if hop else None
+
+    def path(self, start, end):
+        """Tiles to move onto from start to end, excluding start.
+
+        When a step enters a warp tunnel the listed tile is the tunnel
+        entrance; the ghost lands on its destination after the move.
+        """
+        path = []
+        if self.distance(start, end) is None:
+            return path
+
+        current = start
+        while current != end:
+            dx, dy = self.next_step(current, end)
+            step = (current[0] + dx, current[1] + dy)
+            path.append(step)
+            current = self.maze.get_warp_destination(step[0], step[1])
+        return path
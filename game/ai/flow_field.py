@@ -0,0 +1,109 @@
+from array import array
+from game import metrics
+from game.ai.pathfinding import DIRECTIONS, NO_CELL
+
+UNREACHABLE = -1
+
+FIELD_HITS = metrics.counter('pacghost_flow_field_cache_hits_total', "Flow field requests served from the cache")
+FIELD_MISSES = metrics.counter('pacghost_flow_field_cache_misses_total', "Flow field requests that built a field")
+
+
+class FlowField:
+    """Dijkstra map toward one target: distance and downhill move per cell"""
+    def __init__(self, graph, target):
+        self.graph = graph
+        self.target = target
+        cell_count = graph.size * graph.size
+        self.distances = array('i', [UNREACHABLE]) * cell_count
+        self.moves = bytearray(cell_count)  # DIRECTIONS index + 1 toward the target, 0 = none
+
+        target_cell = graph.cell_id(target)
+        if target_cell != NO_CELL and graph.walkable[target_cell]:
+            self._build(target_cell)
+
+    def _build(self, target_cell):
+        """Reverse BFS from the target over the graph's incoming edges"""
+        distances = self.distances
+        moves = self.moves
+        reverse_edges = self.graph.reverse_edges
+        distances[target_cell] = 0
+
+        queue = [target_cell]
+        head = 0
+        while head < len(queue):
+            current = queue[head]
+            head += 1
+            next_distance = distances[current] + 1
+            base = current * 4
+            for d in range(4):
+                source = reverse_edges[base + d]
+                if source != NO_CELL and distances[source] == UNREACHABLE:
+                    distances[source] = next_distance
+                    moves[source] = d + 1
+                    queue.append(source)
+
+    def distance(self, pos):
+        """Steps from pos to the target, or None if it cannot be reached"""
+        cell = self.graph.cell_id(pos)
+        if cell == NO_CELL or self.distances[cell] == UNREACHABLE:
+            return None
+        return self.distances[cell]
+
+    def next_step(self, pos):
+        """Downhill direction (dx, dy) from pos, or None at the target or when unreachable"""
+        cell = self.graph.cell_id(pos)
+        if cell == NO_CELL or not self.moves[cell]:
+            return None
+        return DIRECTIONS[self.moves[cell] - 1]
+
+
+class TableFlowField:
+    """Flow field read straight from a row of the maze's distance oracle"""
+    def __init__(self, oracle, target):
+        self.oracle = oracle
+        self.target = target
+
+    def distance(self, pos):
+        """Steps from pos to the target, or None if it cannot be reached"""
+        return self.oracle.distance(pos, self.target)
+
+    def next_step(self, pos):
+        """Downhill direction (dx, dy) from pos, or None at the target or when unreachable"""
+        return self.oracle.next_step(pos, self.target)
+
+
+class FlowFieldService:
+    """Flow fields keyed by target cell, shared by every ghost on a maze.
+
+    Each active target costs one reverse BFS no matter how many ghosts
+    chase it. On mazes with a distance oracle the fields are rows of its
+    table and cost nothing extra.
+    """
+    def __init__(self, maze):
+        self.graph = maze.get_graph()
+        self.oracle = maze.get_distance_oracle()
+        self.fields = {}
+        self.fields_built = 0  # Reverse BFS runs so far
+
+    def get(self, target):
+        """Return the flow field toward target, building it on first request"""
+        field = self.fields.get(target)
+        if field is None:
+            FIELD_MISSES.inc()
+            if self.oracle:
+                field = TableFlowField(self.oracle, target)
+            else:
+                field = FlowField(self.graph, target)
+                self.fields_built += 1
+            self.fields[target] = field
+        else:
+            FIELD_HITS.inc()
+        return field
+
+    def retain(self, targets):
+        """Drop fields whose target is no longer in targets (moved or collected)"""
+        if len(self.fields) == 0:
+            return
+        active = set(targets)
+        for target in [t for t in self.fields if t not in active]:
+            del self.fields[target]
@@ -1,30 +1,53 @@
 import random
-import pygame
-from game.ai.pathfinding import AStar
+import numpy
+from game.ai.pathfinding import IncrementalPlanner
+from game.ai.flow_field import FlowFieldService
 from game.constants import AI_DECISION_TIME, AI_VISION_RADIUS
 
 class GhostAI:
-    def __init__(self, ghost, maze):
+    def __init__(self, ghost, maze, clock, rng=None, flow_fields=None):
         self.ghost = ghost
         self.maze = maze
-        self.pathfinder = AStar(maze)
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.oracle = maze.get_distance_oracle()  # None on mazes too large to tabulate
+        # Without an oracle, weaker ghosts are spotted with the maze's shared
+        # bounded BFS and chased with one search kept alive per target (see _find_path)
+        self.vision = maze.get_vision() if self.oracle is None else None
+        self.planner = IncrementalPlanner(maze) if self.oracle is None else None
+        self.planned_target = None
+        self.flow_fields = flow_fields or FlowFieldService(maze)  # Shared per-PacMan fields
         self.current_path = []
+        self.flow_field = None  # Set while chasing a PacMan; steps downhill instead of a path
         self.target = None
         self.last_decision_time = 0
         self.decision_interval = AI_DECISION_TIME  # ms between AI decisions
         self.last_random_move_time = 0
         self.random_move_interval = 1000  # ms between random moves
+        self.path_invalidated = False  # Set when following the path failed; cleared by decide()
     
     def update(self, pacmans, ghosts):
         """Update AI decision making"""
-        current_time = pygame.time.get_ticks()
-        
         # Only make decisions at certain intervals
-        if current_time - self.last_decision_time < self.decision_interval:
-            self._follow_path()
+        if not self.decision_due():
+            self.follow()
             return
-            
+        
+        self.decide(pacmans, ghosts)
+    
+    def decision_due(self):
+        """Check whether the decision interval has passed since the last decision"""
+        return self.clock.get_ticks() - self.last_decision_time >= self.decision_interval
+    
+    def follow(self):
+        """Keep moving along the current path or flow field (cheap, every tick)"""
+        self._follow_path()
+    
+    def decide(self, pacmans, ghosts):
+        """Pick a target and plan toward it, then take the first step"""
+        current_time = self.clock.get_ticks()
         self.last_decision_time = current_time
+        self.path_invalidated = False
         
         # Current position
         current_pos = (self.ghost.grid_x, self.ghost.grid_y)
@@ -39,29 +62,22 @@ class GhostAI:
                 continue
                 
             pacman_pos = (pacman.grid_x, pacman.grid_y)
-            distance = self._calculate_distance(current_pos, pacman_pos)
-            
-            if distance <= AI_VISION_RADIUS:
-                # Check if there's a clear path to the PacMan (no walls in between)
-                path = self.pathfinder.find_path(current_pos, pacman_pos)
-                if path and len(path) > 0:
+            if self._calculate_distance(current_pos, pacman_pos) <= AI_VISION_RADIUS:
+                # The shared flow field gives the true path distance (None if walled off)
+                distance = self.flow_fields.get(pacman_pos).distance(current_pos)
+                if distance is not None and distance <= AI_VISION_RADIUS:
                     visible_pacmans.append((pacman, distance))
         
-        # Check for visible ghosts
-        for other_ghost in ghosts:
-            if other_ghost is self.ghost or not other_ghost.alive or other_ghost.dying:
-                continue
-                
-            ghost_pos = (other_ghost.grid_x, other_ghost.grid_y)
-            distance = self._calculate_distance(current_pos, ghost_pos)
-            
-            if distance <= AI_VISION_RADIUS:
-                # Only target ghosts with lower level
-                if other_ghost.level < self.ghost.level:
-                    # Check if there's a clear path to the ghost (no walls in between)
-                    path = self.pathfinder.find_path(current_pos, ghost_pos)
-                    if path and len(path) > 0:
-                        visible_ghosts.append((other_ghost, distance))
+        # Check for visible ghosts (only weaker ones are targets, and only
+        # matter when no PacMan is in sight). All of them are checked at once
+        # for a path within the vision radius.
+        if not visible_pacmans:
+            candidates = [(other_ghost, ghost_pos)
+                          for other_ghost, ghost_pos, _ in self._weaker_ghosts_in_range(ghosts, current_pos)]
+            if candidates:
+                distances = self._path_distances(current_pos, [pos for _, pos in candidates])
+                visible_ghosts = [(other_ghost, distance) for (other_ghost, _), distance
+                                  in zip(candidates, distances) if distance is not None]
         
         # Prioritize targets
         target_entity = None
@@ -80,11 +96,13 @@ class GhostAI:
         if target_entity:
             target_pos = (target_entity.grid_x, target_entity.grid_y)
             self.target = target_entity
-            self.current_path = self.pathfinder.find_path(current_pos, target_pos)
-            
-            # Remove the first position (current position)
-            if self.current_path and len(self.current_path) > 0 and self.current_path[0] == current_pos:
-                self.current_path.pop(0)
+            if visible_pacmans:
+                # PacMans share one flow field among all chasing ghosts
+                self.flow_field = self.flow_fields.get(target_pos)
+                self.current_path = []
+            else:
+                self.flow_field = None
+                self.current_path = self._find_path(current_pos, target_pos, target_entity)
         else:
             # No target in sight, move randomly but less frequently
             if current_time - self.last_random_move_time >= self.random_move_interval:
@@ -94,27 +112,59 @@ class GhostAI:
         # Follow the path
         self._follow_path()
     
-    def _has_line_of_sight(self, start, end):
-        """Check if there's a clear line of sight between two positions"""
-        # Use A* pathfinding to check if there's a valid path
-        path = self.pathfinder.find_path(start, end)
-        
-        # If there's no path, there's no line of sight
-        if not path:
-            return False
-            
-        # Check if the path is direct (Manhattan distance equals path length)
-        manhattan_distance = abs(start[0] - end[0]) + abs(start[1] - end[1])
-        
-        # Path length includes start and end points, so we need to subtract 1
-        path_length = len(path) - 1
+    def _weaker_ghosts_in_range(self, ghosts, current_pos):
+        """(ghost, position, distance) for standing ghosts of lower level within vision radius"""
+        store = self.ghost.store
+        level = self.ghost.level
+        if ghosts is not store.views:
+            # Ghosts that don't share this ghost's store: check one by one
+            in_range = []
+            for other_ghost in ghosts:
+                if other_ghost is self.ghost or not other_ghost.alive or other_ghost.dying:
+                    continue
+                ghost_pos = (other_ghost.grid_x, other_ghost.grid_y)
+                distance = self._calculate_distance(current_pos, ghost_pos)
+                if distance <= AI_VISION_RADIUS and other_ghost.level < level:
+                    in_range.append((other_ghost, ghost_pos, distance))
+            return in_range
+        
+        # Whole-store filter over the position and state columns
+        count = store.count
+        grid_x = store.grid[0, :count]
+        grid_y = store.grid[1, :count]
+        distances = numpy.abs(grid_x - current_pos[0]) + numpy.abs(grid_y - current_pos[1])
+        mask = store.alive[:count] & ~store.dying[:count] & (store.level[:count] < level)
+        mask &= distances <= AI_VISION_RADIUS
+        mask[self.ghost.index] = False
+        return [(store.views[i], (grid_x.item(i), grid_y.item(i)), distances.item(i))
+                for i in numpy.flatnonzero(mask).tolist()]
+    
+    def _path_distances(self, start, ends):
+        """Path distance from start to each end, or None if not within vision radius"""
+        if self.oracle:
+            distances = [self.oracle.distance(start, end) for end in ends]
+            return [d if d is not None and d <= AI_VISION_RADIUS else None for d in distances]
         
-        # Only consider it line of sight if the path is direct or nearly direct
-        # (allowing for one extra step for diagonal movement)
-        return path_length <= manhattan_distance + 1
+        return self.vision.scan(start, ends, AI_VISION_RADIUS)
+    
+    def _find_path(self, start, end, target=None):
+        """Find the tiles to move onto from start to a target found by _path_distances"""
+        if self.oracle:
+            return self.oracle.path(start, end)
+        
+        # While the chase stays on one target its search tree is repaired as
+        # both ends move instead of being searched again from scratch
+        if target is None or target is not self.planned_target:
+            self.planned_target = target
+            self.planner.reset()
+        return self.planner.find_path(start, end)[1:]
     
     def _follow_path(self):
         """Follow the current path"""
+        if self.flow_field:
+            self._follow_flow_field()
+            return
+        
         if not self.current_path or len(self.current_path) == 0:
             return
             
@@ -142,6 +192,7 @@ class GhostAI:
         if not self.maze.is_walkable(new_x, new_y):
             # Invalid move, recalculate path
             self.current_path = []
+            self.path_invalidated = True
             return
         
         # Try to move
@@ -151,6 +202,21 @@ class GhostAI:
         else:
             # Move failed, clear path to force recalculation
             self.current_path = []
+            self.path_invalidated = True
+    
+    def _follow_flow_field(self):
+        """Step downhill on the current flow field"""
+        step = self.flow_field.next_step((self.ghost.grid_x, self.ghost.grid_y))
+        
+        # At the target, or it can no longer be reached
+        if step is None:
+            self.flow_field = None
+            return
+        
+        if not self.ghost.move(step[0], step[1], self.maze):
+            # Move failed, drop the field to force a new decision
+            self.flow_field = None
+            self.path_invalidated = True
     
     def _random_movement(self):
         """Choose a random direction to move"""
@@ -170,14 +236,15 @@ class GhostAI:
             # Prefer not to reverse direction if possible
             forward_moves = [m for m in possible_moves if m != (-self.ghost.direction[0], -self.ghost.direction[1])]
             
-            if forward_moves and random.random() < 0.8:  # 80% chance to not reverse
-                dx, dy = random.choice(forward_moves)
+            if forward_moves and self.rng.random() < 0.8:  # 80% chance to not reverse
+                dx, dy = self.rng.choice(forward_moves)
             else:
-                dx, dy = random.choice(possible_moves)
+                dx, dy = self.rng.choice(possible_moves)
             
             # Set path to this direction
             new_x = current_pos[0] + dx
             new_y = current_pos[1] + dy
+            self.flow_field = None
             self.current_path = [(new_x, new_y)]
     
     def _calculate_distance(self, pos1, pos2):
@@ -1,103 +1,438 @@
 import heapq
-import math
+from array import array
+from game import metrics
+
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))  # Up, Right, Down, Left
+NO_CELL = -1
+
+ASTAR_SEARCHES = metrics.counter('pacghost_astar_searches_total', "A* searches run")
+ASTAR_NODES = metrics.counter('pacghost_astar_nodes_expanded_total', "Nodes expanded by A* searches")
+ASTAR_SEARCH_NODES = metrics.histogram('pacghost_astar_search_nodes', "Nodes expanded per A* search")
+
+
+class MazeGraph:
+    """Flat, warp-aware adjacency for a static maze.
+
+    Cells are numbered y * size + x. For every cell and direction,
+    `edges[cell * 4 + d]` holds the cell a ghost lands on after moving that
+    way (the warp destination when the move enters a tunnel) or NO_CELL.
+    `reverse_edges[cell * 4 + d]` is the cell that lands here by moving d.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        self.size = maze.size
+        cell_count = self.size * self.size
+
+        self.walkable = bytearray(cell_count)
+        for y in range(self.size):
+            for x in range(self.size):
+                if maze.is_walkable(x, y):
+                    self.walkable[y * self.size + x] = 1
+
+        # Landing cell per (cell, direction), and the inverse
+        self.edges = array('i', [NO_CELL]) * (cell_count * 4)
+        self.reverse_edges = array('i', [NO_CELL]) * (cell_count * 4)
+        for cell in range(cell_count):
+            if not self.walkable[cell]:
+                continue
+            x, y = cell % self.size, cell // self.size
+            for d, (dx, dy) in enumerate(DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if not maze.is_walkable(nx, ny):
+                    continue
+                lx, ly = maze.get_warp_destination(nx, ny)
+                landing = ly * self.size + lx
+                self.edges[cell * 4 + d] = landing
+                self.reverse_edges[landing * 4 + d] = cell
+
+        # Warp tunnels as (entry cell, destination cell) pairs
+        self.warps = []
+        for cell in range(cell_count):
+            if self.walkable[cell]:
+                x, y = cell % self.size, cell // self.size
+                dest = maze.get_warp_destination(x, y)
+                if dest != (x, y):
+                    self.warps.append((cell, dest[1] * self.size + dest[0]))
+
+    def cell_id(self, pos):
+        """Cell id of an (x, y) position, or NO_CELL if it is out of bounds"""
+        x, y = pos
+        if x < 0 or x >= self.size or y < 0 or y >= self.size:
+            return NO_CELL
+        return y * self.size + x
+
+    def position(self, cell):
+        """(x, y) position of a cell id"""
+        return cell % self.size, cell // self.size
+
+
+def _count_search(expanded):
+    """Add a finished search to the metrics"""
+    ASTAR_SEARCHES.inc()
+    ASTAR_NODES.inc(expanded)
+    ASTAR_SEARCH_NODES.observe(expanded)
+
+
+def warp_heuristic(graph, end_cell):
+    """Build a consistent Manhattan heuristic toward end_cell that accounts for warps.
+
+    A warp lets a mover jump from a tunnel entrance to its destination
+    for one step, so plain Manhattan distance can overestimate. Each
+    entrance gets a lower bound on the cost from its destination to the
+    goal (relaxed over the handful of tunnels), and the heuristic is the
+    best of going straight or walking to an entrance first.
+    """
+    size = graph.size
+    ex, ey = end_cell % size, end_cell // size
+
+    # Lower bound from each warp destination to the goal, relaxed
+    # until stable (tunnels can chain)
+    portals = [(cell % size, cell // size, dest % size, dest // size) for cell, dest in graph.warps]
+    bounds = [abs(dx - ex) + abs(dy - ey) for _, _, dx, dy in portals]
+    changed = True
+    while changed:
+        changed = False
+        for i, (_, _, dx, dy) in enumerate(portals):
+            for j, (px, py, _, _) in enumerate(portals):
+                candidate = abs(dx - px) + abs(dy - py) + bounds[j]
+                if candidate < bounds[i]:
+                    bounds[i] = candidate
+                    changed = True
+
+    entries = [(px, py, bounds[i]) for i, (px, py, _, _) in enumerate(portals)]
+
+    def heuristic(cell):
+        x, y = cell % size, cell // size
+        best = abs(x - ex) + abs(y - ey)
+        for px, py, bound in entries:
+            estimate = abs(x - px) + abs(y - py) + bound
+            if estimate < best:
+                best = estimate
+        return best
+
+    return heuristic
+
 
 class AStar:
+    """A* over a MazeGraph with an indexed open set.
+
+    Per-cell search state lives in flat arrays stamped with a search id, so
+    nothing is cleared or allocated per cell between searches. Stale heap
+    entries are skipped on pop (lazy deletion) instead of being searched for.
+    """
     def __init__(self, maze):
         self.maze = maze
-    
+        self.graph = maze.get_graph()
+        cell_count = self.graph.size * self.graph.size
+
+        self.g_scores = array('i', [0]) * cell_count
+        self.parents = array('i', [NO_CELL]) * cell_count
+        self.moves = bytearray(cell_count)  # Direction used to reach each cell
+        self.stamp = array('I', [0]) * cell_count  # Search id that last touched the cell
+        self.closed = array('I', [0]) * cell_count  # Search id that closed the cell
+        self.search_id = 0
+        self.nodes_expanded = 0  # Total over the lifetime of this pathfinder
+
     def find_path(self, start, end):
         """
         Find a path from start to end using A* algorithm
-        
+
         Args:
             start: Tuple (x, y) of starting position
             end: Tuple (x, y) of ending position
-            
+
         Returns:
-            List of tuples representing the path from start to end,
-            or an empty list if no path is found
+            List of tuples starting with start, followed by each tile moved
+            onto. A step into a warp tunnel lists the tunnel entrance; the
+            mover lands on its destination. Empty if no path is found.
         """
+        graph = self.graph
+        start_cell = graph.cell_id(start)
+        end_cell = graph.cell_id(end)
+
         # Check if start or end are not walkable
-        if not self.maze.is_walkable(start[0], start[1]) or not self.maze.is_walkable(end[0], end[1]):
+        if start_cell == NO_CELL or end_cell == NO_CELL or \
+           not graph.walkable[start_cell] or not graph.walkable[end_cell]:
             return []
-            
+
         # If start and end are the same, return just that position
-        if start == end:
+        if start_cell == end_cell:
             return [start]
-            
-        # Initialize open and closed sets
-        open_set = []
-        closed_set = set()
-        
-        # Start node
-        start_node = (0, 0, start, None)  # (f_score, g_score, position, parent)
-        heapq.heappush(open_set, start_node)
-        
-        # Keep track of nodes and their scores
-        g_scores = {start: 0}
-        f_scores = {start: self._heuristic(start, end)}
-        
-        # Keep track of parents for path reconstruction
-        parents = {}
-        
-        # Limit search to prevent infinite loops
-        max_iterations = self.maze.size * self.maze.size
-        iterations = 0
-        
-        while open_set and iterations < max_iterations:
-            iterations += 1
-            
-            # Get node with lowest f_score
-            _, g_score, current, parent = heapq.heappop(open_set)
-            
+
+        self.search_id += 1
+        search_id = self.search_id
+        size = graph.size
+        edges = graph.edges
+        g_scores = self.g_scores
+        parents = self.parents
+        moves = self.moves
+        stamp = self.stamp
+        closed = self.closed
+        heuristic = self._make_heuristic(end_cell)
+
+        g_scores[start_cell] = 0
+        parents[start_cell] = NO_CELL
+        stamp[start_cell] = search_id
+        open_set = [(heuristic(start_cell), 0, start_cell)]
+        expanded = 0
+
+        while open_set:
+            _, g_score, current = heapq.heappop(open_set)
+
+            # Skip entries superseded by a cheaper push or already closed
+            if closed[current] == search_id or g_score > g_scores[current]:
+                continue
+            closed[current] = search_id
+            expanded += 1
+
             # If we reached the end, reconstruct and return the path
-            if current == end:
-                path = self._reconstruct_path(parents, current)
-                return path
-            
-            # Add current to closed set
-            closed_set.add(current)
-            
-            # Check neighbors
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                
-                # Skip if neighbor is in closed set
-                if neighbor in closed_set:
-                    continue
-                
-                # Skip if neighbor is not walkable
-                if not self.maze.is_walkable(neighbor[0], neighbor[1]):
+            if current == end_cell:
+                self._count(expanded)
+                return self._reconstruct_path(start, current)
+
+            tentative_g_score = g_score + 1
+            base = current * 4
+            for d in range(4):
+                neighbor = edges[base + d]
+                if neighbor == NO_CELL or closed[neighbor] == search_id:
                     continue
-                
-                # Calculate tentative g_score
-                tentative_g_score = g_score + 1
-                
-                # If neighbor is not in open set or has a better g_score
-                if neighbor not in g_scores or tentative_g_score < g_scores[neighbor]:
-                    # Update scores
-                    parents[neighbor] = current
+
+                if stamp[neighbor] != search_id or tentative_g_score < g_scores[neighbor]:
+                    stamp[neighbor] = search_id
                     g_scores[neighbor] = tentative_g_score
-                    f_scores[neighbor] = tentative_g_score + self._heuristic(neighbor, end)
-                    
-                    # Add to open set if not already there
-                    if neighbor not in [n[2] for n in open_set]:
-                        heapq.heappush(open_set, (f_scores[neighbor], g_scores[neighbor], neighbor, current))
-        
+                    parents[neighbor] = current
+                    moves[neighbor] = d
+                    heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor), tentative_g_score, neighbor))
+
         # No path found
+        self._count(expanded)
         return []
-    
-    def _heuristic(self, a, b):
-        """Calculate Manhattan distance heuristic"""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-    
-    def _reconstruct_path(self, parents, current):
-        """Reconstruct path from parents dictionary"""
-        path = [current]
-        while current in parents:
-            current = parents[current]
-            path.append(current)
-        
+
+    def _count(self, expanded):
+        """Add a finished search to the statistics"""
+        self.nodes_expanded += expanded
+        _count_search(expanded)
+
+    def _make_heuristic(self, end_cell):
+        """Build the consistent warp-aware heuristic toward end_cell"""
+        return warp_heuristic(self.graph, end_cell)
+
+    def _reconstruct_path(self, start, end_cell):
+        """Rebuild the path by walking parent links back from the end"""
+        size = self.graph.size
+        path = []
+        current = end_cell
+        while self.parents[current] != NO_CELL:
+            parent = self.parents[current]
+            dx, dy = DIRECTIONS[self.moves[current]]
+            # The tile moved onto, before any warp is applied
+            path.append((parent % size + dx, parent // size + dy))
+            current = parent
+        path.append(start)
+
         # Reverse to get path from start to end
         path.reverse()
         return path
+
+
+class IncrementalPlanner:
+    """A* search state kept alive across decisions while one ghost chases one target.
+
+    The maze never changes, so the only "edge updates" a chase produces are
+    its endpoints moving, and both can be repaired in place (the moving-target
+    case of D* Lite/LPA*):
+
+    - Target moved: every closed cell still holds its exact distance from the
+      root, so the open list is re-keyed with the new heuristic and the search
+      resumes. A target that is already closed costs no expansions at all.
+    - Ghost moved: if it stepped onto a closed cell, the subtree of the search
+      tree below that cell is still a valid shortest-path tree and is kept as
+      it is. Only the rest of the tree is visited: it is dropped, and the open
+      cells it fed are re-scored from the kept cells. Scores stay measured
+      from the first root, which shifts every key by the same amount and
+      leaves the open list's order intact. Otherwise the search restarts.
+
+    Paths use the same format as AStar.find_path.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        self.graph = maze.get_graph()
+        self.nodes_expanded = 0  # Total over the lifetime of this planner
+        self.repairs = 0  # Searches resumed from kept state instead of restarted
+        self.reset()
+
+    def reset(self):
+        """Forget the kept search, e.g. when the chase moves on to another target"""
+        self.root = NO_CELL
+        self.target = NO_CELL
+        self.heuristic = None
+        self.g_scores = {}  # From the first root: exact for closed cells, tentative for open ones
+        self.parents = {}  # cell -> (parent cell, direction moved)
+        self.children = {}  # closed cell -> closed cells it is the parent of
+        self.closed = set()
+        self.open_set = []  # (f, g, cell), with stale entries skipped when popped
+
+    def find_path(self, start, end):
+        """Shortest path from start to end, reusing the previous search where possible"""
+        graph = self.graph
+        start_cell = graph.cell_id(start)
+        end_cell = graph.cell_id(end)
+
+        if start_cell == NO_CELL or end_cell == NO_CELL or \
+           not graph.walkable[start_cell] or not graph.walkable[end_cell]:
+            return []
+
+        if start_cell == end_cell:
+            return [start]
+
+        if start_cell != self.root:
+            if start_cell in self.closed:
+                self._reroot(start_cell)
+            else:
+                self._restart(start_cell)
+        elif self.closed:
+            self.repairs += 1
+        if end_cell != self.target:
+            self._retarget(end_cell)
+
+        if end_cell not in self.closed and not self._search(end_cell):
+            return []
+        return self._reconstruct_path(start, end_cell)
+
+    def _restart(self, root):
+        """Drop all state and start a fresh search tree at root"""
+        self.root = root
+        self.g_scores = {root: 0}
+        self.parents = {root: None}
+        self.children = {}
+        self.closed = set()
+        self.open_set = [(self.heuristic(root) if self.heuristic else 0, 0, root)]
+
+    def _reroot(self, root):
+        """Keep the part of the search tree below root, touching only the part that is dropped"""
+        g_scores = self.g_scores
+        parents = self.parents
+        children = self.children
+        closed = self.closed
+
+        # Cut root's subtree loose, then drop everything still hanging off the old root
+        children[parents[root][0]].remove(root)
+        parents[root] = None
+        dropped = [self.root]
+        for cell in dropped:
+            dropped.extend(children.pop(cell))
+        for cell in dropped:
+            closed.discard(cell)
+            del g_scores[cell]
+            del parents[cell]
+
+        # The dropped cells and the open cells they led to are the only ones
+        # whose best kept predecessor may have changed
+        edges = self.graph.edges
+        dropped_cells = set(dropped)
+        affected = dict.fromkeys(dropped)
+        for cell in dropped:
+            base = cell * 4
+            for d in range(4):
+                neighbor = edges[base + d]
+                link = parents.get(neighbor)
+                if link is not None and neighbor not in closed and link[0] in dropped_cells:
+                    affected[neighbor] = None
+
+        reverse_edges = self.graph.reverse_edges
+        heuristic = self.heuristic
+        for cell in affected:
+            best = None
+            base = cell * 4
+            for d in range(4):
+                source = reverse_edges[base + d]
+                if source != NO_CELL and source in closed:
+                    tentative_g_score = g_scores[source] + 1
+                    if best is None or tentative_g_score < best[0]:
+                        best = (tentative_g_score, source, d)
+            if best is None:
+                g_scores.pop(cell, None)
+                parents.pop(cell, None)
+                continue
+            g_scores[cell] = best[0]
+            parents[cell] = (best[1], best[2])
+            if heuristic:
+                heapq.heappush(self.open_set, (best[0] + heuristic(cell), best[0], cell))
+
+        self.root = root
+        self.repairs += 1
+
+    def _retarget(self, target):
+        """Point the search at a new target; closed distances stay exact"""
+        self.target = target
+        self.heuristic = warp_heuristic(self.graph, target)
+        self._rebuild_open_set()
+
+    def _rebuild_open_set(self):
+        """Key every open cell with the current heuristic, dropping stale entries"""
+        heuristic = self.heuristic
+        closed = self.closed
+        g_scores = self.g_scores
+        current = {cell: g_score for _, g_score, cell in self.open_set
+                   if cell not in closed and g_scores.get(cell) == g_score}
+        self.open_set = [(g_score + heuristic(cell), g_score, cell) for cell, g_score in current.items()]
+        heapq.heapify(self.open_set)
+
+    def _search(self, end_cell):
+        """Expand cells until end_cell is closed; False if it is unreachable"""
+        edges = self.graph.edges
+        g_scores = self.g_scores
+        parents = self.parents
+        children = self.children
+        closed = self.closed
+        open_set = self.open_set
+        heuristic = self.heuristic
+        expanded = 0
+        found = False
+
+        while open_set:
+            _, g_score, current = heapq.heappop(open_set)
+
+            # Skip entries superseded by another push, dropped by a reroot or already closed
+            if current in closed or g_score != g_scores.get(current):
+                continue
+            closed.add(current)
+            children[current] = []
+            link = parents[current]
+            if link is not None:
+                children[link[0]].append(current)
+            expanded += 1
+
+            tentative_g_score = g_score + 1
+            base = current * 4
+            for d in range(4):
+                neighbor = edges[base + d]
+                if neighbor == NO_CELL or neighbor in closed:
+                    continue
+                if tentative_g_score < g_scores.get(neighbor, tentative_g_score + 1):
+                    g_scores[neighbor] = tentative_g_score
+                    parents[neighbor] = (current, d)
+                    heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor), tentative_g_score, neighbor))
+
+            if current == end_cell:
+                found = True
+                break
+
+        self.nodes_expanded += expanded
+        _count_search(expanded)
+        return found
+
+    def _reconstruct_path(self, start, end_cell):
+        """Rebuild the path by walking parent links back from the end"""
+        size = self.graph.size
+        path = []
+        link = self.parents[end_cell]
+        while link is not None:
+            parent, d = link
+            dx, dy = DIRECTIONS[d]
+            # The tile moved onto, before any warp is applied
+            path.append((parent % size + dx, parent // size + dy))
+            link = self.parents[parent]
+        path.append(start)
+        path.reverse()
+        return path
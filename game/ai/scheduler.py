@@ -0,0 +1,83 @@
+import time
+from game import metrics
+from game.constants import AI_DECISION_TIME
+
+DECISIONS = metrics.counter('pacghost_ai_decisions_total', "GhostAI decisions made")
+DEFERRED = metrics.counter('pacghost_ai_decisions_deferred_total',
+                           "Due AI decisions pushed to a later tick by the budget")
+
+
+def _priority(ai):
+    """Sort key for due decisions: failed paths first, then the longest waiting"""
+    return not ai.path_invalidated, ai.last_decision_time
+
+
+class AIScheduler:
+    """Spreads GhostAI decisions across ticks under a per-tick time budget.
+
+    Controllers start with staggered decision times, so roughly
+    1/interval of them replan on any tick instead of all at once. Due
+    decisions run in priority order -- ghosts whose path just failed
+    first, then the longest waiting -- until budget_ms of wall time is
+    spent; whatever is left stays due and runs first on the next tick.
+    Every controller not deciding keeps following its current path.
+
+    With budget_ms=None every due decision runs, which keeps headless
+    matches deterministic. A budgeted match can still be replayed: the
+    number of decisions made on each cut-short tick (`cutoff`) is all the
+    budget changes, and setting `decision_limit` reproduces it.
+    """
+    def __init__(self, controllers, budget_ms=None, decision_interval=AI_DECISION_TIME):
+        self.controllers = controllers
+        self.budget_ms = budget_ms
+
+        # Stagger first decisions evenly over one interval
+        count = len(controllers)
+        for i, ai in enumerate(controllers):
+            ai.decision_interval = decision_interval
+            ai.last_decision_time = -(i * decision_interval // count)
+
+        self.decision_limit = None  # At most this many decisions on the next tick (for replays)
+        self.cutoff = None  # Decisions made on the last tick if it was cut short, else None
+
+        # Reused every tick, so ticks don't build new containers
+        self._due = []
+        self._decided = set()
+
+        # Statistics
+        self.decisions = 0
+        self.deferred = 0  # Due decisions pushed to a later tick by the budget
+
+    def update(self, pacmans, ghosts):
+        """Run this tick's share of AI decisions, then move every other ghost along its path"""
+        due = self._due
+        due.clear()
+        for ai in self.controllers:
+            if ai.decision_due():
+                due.append(ai)
+        if len(due) > 1:
+            due.sort(key=_priority)
+
+        deadline = None
+        if self.budget_ms is not None:
+            deadline = time.perf_counter() + self.budget_ms / 1000
+
+        decided = self._decided
+        decided.clear()
+        self.cutoff = None
+        for ai in due:
+            # Always make at least one decision so a slow tick can't stall the AI
+            if (len(decided) == self.decision_limit
+                    or deadline is not None and decided and time.perf_counter() >= deadline):
+                self.cutoff = len(decided)
+                self.deferred += len(due) - len(decided)
+                DEFERRED.inc(len(due) - len(decided))
+                break
+            ai.decide(pacmans, ghosts)
+            decided.add(ai)
+        self.decisions += len(decided)
+        DECISIONS.inc(len(decided))
+
+        for ai in self.controllers:
+            if ai not in decided:
+                ai.follow()
@@ -0,0 +1,80 @@
+from array import array
+from game import metrics
+from game.ai.pathfinding import NO_CELL
+
+SCANS = metrics.counter('pacghost_vision_scans_total', "Bounded vision BFS scans run")
+SCAN_NODES = metrics.counter('pacghost_vision_nodes_expanded_total', "Nodes expanded by vision scans")
+
+
+class VisionQuery:
+    """Bounded BFS answering "what can this ghost see" in one search.
+
+    One scan from the ghost walks at most `radius` steps over the warp-aware
+    graph and reports the true path distance of every candidate position
+    it reaches. Per-cell state is stamped with a search id like AStar's, so
+    a scan only touches the cells it reaches. Scans keep nothing between
+    calls, so every AI on a maze shares one query (see Maze.get_vision).
+    """
+    def __init__(self, maze):
+        self.graph = maze.get_graph()
+        cell_count = self.graph.size * self.graph.size
+
+        self.distances = array('i', [0]) * cell_count
+        self.stamp = array('I', [0]) * cell_count  # Search id that reached the cell
+        self.search_id = 0
+        self.nodes_expanded = 0  # Total over the lifetime of this query
+
+    def scan(self, start, candidates, radius):
+        """
+        Find which candidates can be reached from start within radius steps
+
+        Args:
+            start: Tuple (x, y) to search from
+            candidates: List of (x, y) positions to look for
+            radius: Maximum path length in steps
+
+        Returns:
+            List with the path distance to each candidate, or None where it
+            cannot be reached within radius.
+        """
+        graph = self.graph
+        self.search_id += 1
+        search_id = self.search_id
+
+        cells = [graph.cell_id(pos) for pos in candidates]
+        start_cell = graph.cell_id(start)
+        if start_cell == NO_CELL or not graph.walkable[start_cell]:
+            return [None] * len(cells)
+        remaining = set(cells)
+        remaining.discard(NO_CELL)
+
+        edges = graph.edges
+        distances = self.distances
+        stamp = self.stamp
+        distances[start_cell] = 0
+        stamp[start_cell] = search_id
+        remaining.discard(start_cell)
+
+        # Stop at the radius, or as soon as every candidate has been reached
+        queue = [start_cell]
+        head = 0
+        while remaining and head < len(queue):
+            current = queue[head]
+            head += 1
+            next_distance = distances[current] + 1
+            if next_distance > radius:
+                break
+            base = current * 4
+            for d in range(4):
+                neighbor = edges[base + d]
+                if neighbor != NO_CELL and stamp[neighbor] != search_id:
+                    stamp[neighbor] = search_id
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+                    remaining.discard(neighbor)
+        self.nodes_expanded += head
+        SCANS.inc()
+        SCAN_NODES.inc(head)
+
+        return [distances[cell] if cell != NO_CELL and stamp[cell] == search_id else None
+                for cell in cells]
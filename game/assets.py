@@ -0,0 +1,124 @@
+"""SVG art rasterized once into a PNG cache.
+
+Each SVG under assets/ is turned into the variants the game draws (one
+per colour and animation frame) at the tile size, by editing the SVG
+source and letting SDL_image rasterize it. The PNGs are written to
+assets/images, named after a hash of the source file, the variant and the
+tile size, so an edited SVG gets new files and stale ones are removed.
+Later runs only load the PNGs, which also works where SDL_image was
+built without SVG support.
+
+load_art() runs once the display is up (convert_alpha needs it); until
+then, or if the art can't be produced, sprites fall back to drawing in
+code.
+"""
+import glob
+import hashlib
+import io
+import os
+import re
+import pygame
+from game.constants import TILE_SIZE, BLUE, GHOST_COLORS
+
+ASSET_DIR = 'assets'
+CACHE_DIR = os.path.join(ASSET_DIR, 'images')
+PIPELINE_VERSION = 1  # Bump when the SVG edits below change, to rebuild every PNG
+DEATH_FRAMES = 3
+
+_art = {}  # (kind, colour or None, frame) -> Surface
+
+
+def load_art(tile_size=TILE_SIZE, colors=(BLUE,) + tuple(GHOST_COLORS)):
+    """Load every art variant, rasterizing the ones missing from the cache.
+
+    Returns False (and leaves the code-drawn sprites in place) if the
+    SVGs can't be read or rasterized.
+    """
+    art = {}
+    try:
+        for frame in (0, 1):
+            art[('pacman', None, frame)] = _cached('pacman.svg', f'frame{frame}', tile_size,
+                                                   lambda svg: _show(svg, f'shimmer-frame{frame + 1}'))
+            for color in colors:
+                art[('ghost', color, frame)] = _cached('ghost.svg', f'{_hex(color)}-frame{frame}', tile_size,
+                                                       lambda svg: _ghost_variant(svg, color, frame))
+        for color in colors:
+            sheet = _cached('death-effect.svg', _hex(color), tile_size, lambda svg: _recolor(svg, color),
+                            scale=DEATH_FRAMES)
+            for frame in range(DEATH_FRAMES):
+                art[('death', color, frame)] = sheet.subsurface((frame * tile_size, 0, tile_size, tile_size))
+    except (OSError, pygame.error) as e:
+        print(f"Could not load SVG art, using fallback rendering: {e}")
+        return False
+
+    _art.clear()
+    _art.update(art)
+    return True
+
+
+def get_art(kind, color, frame):
+    """Loaded art for one variant, or None if art isn't available"""
+    return _art.get((kind, color, frame))
+
+
+def _cached(name, variant, tile_size, edit, scale=1):
+    """Surface for one variant of an SVG, from the PNG cache or freshly rasterized"""
+    with open(os.path.join(ASSET_DIR, name), 'rb') as f:
+        source = f.read()
+
+    key = b'|'.join([source, variant.encode(), str(tile_size).encode(), str(PIPELINE_VERSION).encode()])
+    digest = hashlib.sha1(key).hexdigest()[:12]
+    prefix = f'{os.path.splitext(name)[0]}-{variant}-{tile_size}px-'
+    path = os.path.join(CACHE_DIR, f'{prefix}{digest}.png')
+
+    if os.path.exists(path):
+        return pygame.image.load(path).convert_alpha()
+
+    svg = _resize(edit(source.decode('utf-8')), tile_size, scale)
+    surface = pygame.image.load(io.BytesIO(svg.encode('utf-8')), 'art.svg')
+
+    # Replace any PNG built from an older version of this source
+    try:
+        for stale in glob.glob(os.path.join(CACHE_DIR, glob.escape(prefix) + '*.png')):
+            os.remove(stale)
+        pygame.image.save(surface, path)
+    except (OSError, pygame.error) as e:
+        print(f"Could not cache {path}: {e}")
+    return surface.convert_alpha()
+
+
+def _hex(color):
+    return '%02x%02x%02x' % color
+
+
+def _shade(color, amount):
+    """Colour lightened (positive amount) or darkened, as an SVG hex colour"""
+    return '#' + _hex(tuple(max(0, min(255, c + amount)) for c in color))
+
+
+def _resize(svg, tile_size, scale):
+    """Rasterize at tile_size per 32 viewBox units instead of the SVG's own size"""
+    def sized(match):
+        return f'{match.group(1)}="{int(match.group(2)) * tile_size // 32}"'
+    head, _, body = svg.partition('viewBox')
+    return re.sub(r'\b(width|height)="(\d+)"', sized, head) + 'viewBox' + body
+
+
+def _show(svg, group_id):
+    """Make a display:none group (an animation frame) visible"""
+    return svg.replace(f'id="{group_id}" style="display:none"', f'id="{group_id}"')
+
+
+def _recolor(svg, color):
+    """Swap the art's placeholder blues for color and its highlight/shadow"""
+    return (svg.replace('#4169E1', _shade(color, 0))
+               .replace('#6495ED', _shade(color, 50))
+               .replace('#191970', _shade(color, -50)))
+
+
+def _ghost_variant(svg, color, frame):
+    """One colour/feet frame of the ghost, without pupils or level badge (drawn per sprite)"""
+    svg = _recolor(_show(svg, f'feet-frame{frame + 1}'), color)
+    svg = re.sub(r'\s*<ellipse[^>]*fill="#333"/>', '', svg)
+    svg = re.sub(r'\s*<rect[^>]*/>', '', svg)
+    return re.sub(r'\s*<text.*?</text>', '', svg, flags=re.S)
@@ -0,0 +1,132 @@
+import json
+import multiprocessing
+import os
+import time
+from functools import partial
+from game import metrics
+from game.constants import BATCH_MATCH_TIME_LIMIT, MAX_PACMANS
+from game.maze import Maze
+from game.simulation import Simulation
+
+
+def run_match(seed, ai_ghosts=9, max_time=BATCH_MATCH_TIME_LIMIT, max_pacmans=MAX_PACMANS, maze_size=None,
+              maze_file=None):
+    """Play one all-AI match headlessly and return its result as a dict.
+
+    With maze_file every match is played on that saved maze instead of a
+    generated one; it is memory-mapped, so workers share one copy. The
+    metrics counted since the last match come back under 'metrics', for
+    run_batch to merge across workers.
+    """
+    maze = Maze.load(maze_file) if maze_file else None
+    simulation = Simulation(ai_player=True, ai_ghosts=ai_ghosts, seed=seed, maze_size=maze_size,
+                            max_pacmans=max_pacmans, maze=maze)
+    simulation.run(max_time=max_time)
+
+    winner = simulation.winner_index()
+    return {
+        'seed': seed,
+        'maze_size': simulation.maze.size,
+        'winner': winner,  # Ghost index (0 is the player slot), None for a draw
+        'timed_out': not simulation.is_over(),
+        'duration': simulation.clock.get_ticks(),
+        'final_levels': [g.level for g in simulation.ghosts],
+        'level_progression': simulation.level_log,
+        'kills': simulation.kills,
+        'metrics': metrics.REGISTRY.drain(),
+    }
+
+
+def run_batch(seeds, workers=None, ai_ghosts=9, max_time=BATCH_MATCH_TIME_LIMIT, max_pacmans=MAX_PACMANS,
+              maze_size=None, maze_file=None, metrics_file=None):
+    """Run one match per seed across a process pool, ordered by seed.
+
+    Every match's metrics are merged into this process's registry as it
+    finishes, and written to metrics_file if given.
+    """
+    workers = workers or os.cpu_count() or 1
+    match = partial(run_match, ai_ghosts=ai_ghosts, max_time=max_time, max_pacmans=max_pacmans,
+                    maze_size=maze_size, maze_file=maze_file)
+
+    def collect(finished):
+        results = []
+        for result in finished:
+            metrics.REGISTRY.merge(result.pop('metrics'))
+            if metrics_file:
+                metrics.REGISTRY.write(metrics_file)
+            results.append(result)
+        return results
+
+    if workers == 1:
+        results = collect(match(seed) for seed in seeds)
+    else:
+        # Matches are independent and CPU bound, so one process per core
+        # scales close to linearly; results come back in completion order
+        with multiprocessing.Pool(workers) as pool:
+            results = collect(pool.imap_unordered(match, seeds))
+
+    results.sort(key=lambda r: r['seed'])
+    return results
+
+
+def summarize(results):
+    """Aggregate per-match results into batch-wide statistics"""
+    matches = len(results)
+    decided = [r for r in results if r['winner'] is not None]
+    wins = {}
+    for r in decided:
+        wins[r['winner']] = wins.get(r['winner'], 0) + 1
+
+    def mean(values):
+        return sum(values) / len(values) if values else 0
+
+    return {
+        'matches': matches,
+        'decided': len(decided),
+        'draws': matches - len(decided),
+        'timeouts': sum(1 for r in results if r['timed_out']),
+        'wins_by_ghost': {str(k): v for k, v in sorted(wins.items())},
+        'mean_duration': mean([r['duration'] for r in results]),
+        'mean_winner_level': mean([r['final_levels'][r['winner']] for r in decided]),
+        'mean_max_level': mean([max(r['final_levels']) for r in results]),
+        'mean_kills_per_match': mean([sum(r['kills']) for r in results]),
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run seeded all-AI Pac-Ghost matches without rendering")
+    parser.add_argument('-n', '--matches', type=int, default=100, help="number of matches to play")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first match; match i uses seed + i")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--ghosts', type=int, default=9, help="AI ghosts per match besides the player slot")
+    parser.add_argument('--pacmans', type=int, default=MAX_PACMANS, help="most PacMans on the board at once")
+    parser.add_argument('--maze-size', type=int, default=None, help="maze width/height in tiles (default: random)")
+    parser.add_argument('--maze-file', default=None, help="play every match on this saved maze (see Maze.save)")
+    parser.add_argument('--max-time', type=int, default=BATCH_MATCH_TIME_LIMIT,
+                        help="game-time limit per match in ms")
+    parser.add_argument('-o', '--output', default='batch_results.json', help="where to write the JSON summary")
+    parser.add_argument('--metrics-file', default=None,
+                        help="keep Prometheus text metrics in this file, rewritten after every match")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus metrics on this localhost port while the batch runs")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port is not None:
+        metrics.REGISTRY.serve(args.metrics_port)
+
+    seeds = range(args.seed, args.seed + args.matches)
+    start = time.perf_counter()
+    results = run_batch(seeds, args.workers, args.ghosts, args.max_time, args.pacmans, args.maze_size,
+                        args.maze_file, args.metrics_file)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    summary['wall_time'] = elapsed
+    with open(args.output, 'w') as f:
+        json.dump({'summary': summary, 'matches': results}, f, indent=2)
+
+    print(f"{summary['matches']} matches in {elapsed:.1f}s "
+          f"({summary['decided']} decided, {summary['draws']} draws) -> {args.output}")
+    return summary
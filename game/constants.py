@@ -28,6 +28,11 @@ MIN_MAZE_SIZE = 25
 MAX_MAZE_SIZE = 35
 TILE_SIZE = 32
 WALKABLE_PERCENTAGE = 0.6
+CHUNK_TILES = 8  # maze tiles per side of a cached chunk surface
+MAX_CACHED_CHUNKS = 96  # least recently drawn chunks beyond this are dropped
+CAMERA_ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.5, 2.0)  # keep TILE_SIZE * zoom a whole number
+CAMERA_DEAD_ZONE = 0.4  # fraction of the view the followed entity roams before the camera scrolls
+MAZE_POOL_SIZE = 2  # mazes generated ahead for the next match
 
 # Game mechanics
 BASE_SPEED = 1.5  # Reduced base speed
@@ -35,9 +40,16 @@ SPEED_BONUS_PER_LEVEL = 0.1  # Reduced speed bonus per level
 PACMAN_SPAWN_TIME = 7000  # milliseconds
 MAX_PACMANS = 4
 AI_DECISION_TIME = 200  # milliseconds
+AI_FRAME_BUDGET = 2  # milliseconds of AI decisions per frame in the game; the rest carry over
 AI_VISION_RADIUS = 8  # tiles (reduced from 12)
+DISTANCE_TABLE_MAX_CELLS = 2048  # walkable cells; larger mazes fall back to A* (~12 MB table)
 DEATH_BLINK_TIME = 3000  # milliseconds
 DEATH_BLINK_INTERVAL = 100  # milliseconds
+SIMULATION_TICK = 16  # milliseconds per fixed simulation step
+MAX_FRAME_TIME = 250  # ms of simulation one frame may catch up on; a longer hitch is dropped
+BATCH_MATCH_TIME_LIMIT = 600000  # milliseconds of game time before a batch match is a draw
+KEYFRAME_INTERVAL = 250  # simulation ticks between replay keyframes (4 s at 16 ms ticks)
+PROFILER_WINDOW = 300  # frames the profiler overlay keeps (5 s at 60 FPS) and dumps as CSV
 
 # Game states
 STATE_MENU = 0
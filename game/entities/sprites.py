@@ -0,0 +1,247 @@
+import pygame
+import math
+from game import metrics
+from game.constants import TILE_SIZE, WHITE, YELLOW
+from game.ui.text import render_text
+from game.assets import get_art, DEATH_FRAMES
+
+# Sprite atlas: every distinct ghost/PacMan look is drawn once and shared.
+# Ghost keys are (colour, animation frame, pupil offset, level, visible);
+# PacMan keys are the animation frame.
+_ghost_sprites = {}
+_pacman_sprites = {}
+_blank_sprite = None
+
+SPRITE_DRAWS = metrics.counter('pacghost_sprite_draws_total', "Sprites drawn into the atlas (cache misses)")
+
+
+def pupil_offset(direction):
+    """Pupil shift (-2, 0 or 2 per axis) for a movement direction"""
+    dx, dy = direction
+    return (2 if dx > 0 else -2 if dx < 0 else 0), (2 if dy > 0 else -2 if dy < 0 else 0)
+
+
+def get_ghost_sprite(color, frame, direction, level, visible=True):
+    """Return the cached ghost sprite for this look, drawing it on first use"""
+    if not visible:
+        return _get_blank_sprite()
+
+    key = (color, frame, pupil_offset(direction), level)
+    sprite = _ghost_sprites.get(key)
+    if sprite is None:
+        sprite = _draw_ghost(color, frame, key[2], level)
+        _ghost_sprites[key] = sprite
+        SPRITE_DRAWS.inc()
+    return sprite
+
+
+def get_pacman_sprite(frame):
+    """Return the shared PacMan sprite for an animation frame"""
+    sprite = _pacman_sprites.get(frame)
+    if sprite is None:
+        sprite = _draw_pacman(frame)
+        _pacman_sprites[frame] = sprite
+        SPRITE_DRAWS.inc()
+    return sprite
+
+
+def get_death_sprite(color, progress):
+    """SVG death effect frame for progress (0-1) through the animation, or None without art"""
+    return get_art('death', color, min(DEATH_FRAMES - 1, int(progress * DEATH_FRAMES)))
+
+
+def clear_cache():
+    """Forget every drawn sprite, e.g. once SVG art has loaded"""
+    _ghost_sprites.clear()
+    _pacman_sprites.clear()
+
+
+def warm_cache(colors, max_level=1):
+    """Pre-draw the sprites a match starts with so the first frames don't stall"""
+    for color in colors:
+        for frame in (0, 1):
+            for direction in ((0, 0), (0, -1), (1, 0), (0, 1), (-1, 0)):
+                for level in range(1, max_level + 1):
+                    get_ghost_sprite(color, frame, direction, level)
+    for frame in (0, 1):
+        get_pacman_sprite(frame)
+
+
+def _get_blank_sprite():
+    global _blank_sprite
+    if _blank_sprite is None:
+        _blank_sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    return _blank_sprite
+
+
+def _lighten_color(color):
+    """Create a lighter version of the color for highlights"""
+    r, g, b = color
+    return min(r + 50, 255), min(g + 50, 255), min(b + 50, 255)
+
+
+def _darken_color(color):
+    """Create a darker version of the color for shadows"""
+    r, g, b = color
+    return max(r - 50, 0), max(g - 50, 0), max(b - 50, 0)
+
+
+def _draw_ghost(color, frame, pupil, level):
+    """Draw one ghost sprite"""
+    art = get_art('ghost', color, frame)
+    if art is not None:
+        return _draw_art_ghost(art, pupil, level)
+
+    surface = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+
+    # Ghost body dimensions
+    width = 28
+    height = 28
+
+    # Center in tile
+    x_offset = (TILE_SIZE - width) // 2
+    y_offset = (TILE_SIZE - height) // 2
+
+    # Draw ghost body
+    body_rect = pygame.Rect(x_offset, y_offset, width, height - 8)
+    pygame.draw.rect(surface, color, body_rect, border_radius=width//2)
+
+    # Draw scalloped bottom
+    feet_height = 8
+    feet_width = width // 4
+
+    # Animation: alternate between two frames for the feet
+    if frame == 0:
+        feet_offsets = [0, 2, 0, 2]  # Feet positions for frame 1
+    else:
+        feet_offsets = [2, 0, 2, 0]  # Feet positions for frame 2
+
+    for i in range(4):
+        foot_x = x_offset + i * feet_width
+        foot_y = y_offset + height - feet_height - feet_offsets[i]
+        foot_rect = pygame.Rect(foot_x, foot_y, feet_width, feet_height)
+        pygame.draw.rect(surface, color, foot_rect)
+
+        # Draw arc for bottom of feet - using a filled polygon instead of arc for compatibility
+        arc_points = []
+        for angle in range(0, 180, 10):
+            rad = math.radians(angle)
+            arc_x = foot_x + feet_width // 2 + int((feet_width // 2) * math.cos(rad))
+            arc_y = foot_y + feet_height + int((feet_width // 2) * math.sin(rad))
+            arc_points.append((arc_x, arc_y))
+
+        if arc_points:
+            # Add the corners to create a filled shape
+            arc_points.insert(0, (foot_x, foot_y + feet_height))
+            arc_points.append((foot_x + feet_width, foot_y + feet_height))
+            pygame.draw.polygon(surface, color, arc_points)
+
+    # Add highlight on left side
+    pygame.draw.line(surface, _lighten_color(color),
+                     (x_offset + 3, y_offset + 3),
+                     (x_offset + 3, y_offset + height - 10), 3)
+
+    # Add shadow on right side
+    pygame.draw.line(surface, _darken_color(color),
+                     (x_offset + width - 3, y_offset + 3),
+                     (x_offset + width - 3, y_offset + height - 10), 2)
+
+    # Draw eyes
+    eye_radius = 6
+    left_eye_x = x_offset + width // 3
+    right_eye_x = x_offset + 2 * width // 3
+    eye_y = y_offset + height // 3
+
+    # White part of eyes
+    pygame.draw.circle(surface, WHITE, (left_eye_x, eye_y), eye_radius)
+    pygame.draw.circle(surface, WHITE, (right_eye_x, eye_y), eye_radius)
+
+    # Pupils (shift slightly in movement direction)
+    pupil_radius = 3
+    pupil_offset_x, pupil_offset_y = pupil
+    pygame.draw.circle(surface, (20, 20, 20),
+                       (left_eye_x + pupil_offset_x, eye_y + pupil_offset_y),
+                       pupil_radius)
+    pygame.draw.circle(surface, (20, 20, 20),
+                       (right_eye_x + pupil_offset_x, eye_y + pupil_offset_y),
+                       pupil_radius)
+
+    # Draw level number in the center of the ghost
+    level_text = render_text(f"{level}", (0, 0, 0), 16, bold=True)  # Black text
+    text_rect = level_text.get_rect(center=(TILE_SIZE // 2, TILE_SIZE // 2))
+    surface.blit(level_text, text_rect)
+
+    return surface
+
+
+def _draw_art_ghost(art, pupil, level):
+    """Finish an SVG ghost body: pupils looking the way it moves, and its level"""
+    surface = art.copy()
+    scale = TILE_SIZE / 32  # The art's viewBox is 32 units wide
+
+    # Pupils sit in the art's eye whites at (12, 12) and (20, 12); they
+    # shift half as far as the drawn ghost's so they stay inside them
+    pupil_x, pupil_y = pupil
+    for eye_x in (12, 20):
+        center_x = (eye_x + pupil_x / 2) * scale
+        center_y = (12 + pupil_y / 2) * scale
+        rect = pygame.Rect(0, 0, round(3 * scale), round(4 * scale))
+        rect.center = (round(center_x), round(center_y))
+        pygame.draw.ellipse(surface, (51, 51, 51), rect)
+
+    level_text = render_text(f"{level}", (0, 0, 0), 16, bold=True)  # Black text
+    surface.blit(level_text, level_text.get_rect(center=(TILE_SIZE // 2, TILE_SIZE * 5 // 8)))
+    return surface
+
+
+def _draw_pacman(frame):
+    """Draw one PacMan sprite"""
+    art = get_art('pacman', None, frame)
+    if art is not None:
+        return art
+
+    surface = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+
+    # PacMan dimensions
+    radius = 14  # 28px diameter
+
+    # Center in tile
+    center_x = TILE_SIZE // 2
+    center_y = TILE_SIZE // 2
+
+    # Draw PacMan body
+    pygame.draw.circle(surface, YELLOW, (center_x, center_y), radius)
+
+    # Add rim light on upper-left edge - using a polygon instead of arc for compatibility
+    rim_color = (255, 200, 100)  # Warm orange
+    rim_points = []
+    for angle in range(135, 315, 10):  # 3/4 pi to 7/4 pi in degrees
+        rad = math.radians(angle)
+        rim_x = center_x + int((radius) * math.cos(rad))
+        rim_y = center_y + int((radius) * math.sin(rad))
+        rim_points.append((rim_x, rim_y))
+
+    if len(rim_points) >= 2:
+        pygame.draw.lines(surface, rim_color, False, rim_points, 1)
+
+    # Add horizontal seam for mouth
+    seam_color = (220, 220, 0)  # Slightly darker yellow
+    pygame.draw.line(surface, seam_color,
+                     (center_x - radius + 2, center_y),
+                     (center_x + radius - 2, center_y), 2)
+
+    # Draw eye
+    eye_radius = 3
+    eye_x = center_x + radius // 2
+    eye_y = center_y - radius // 2
+    pygame.draw.ellipse(surface, (0, 0, 0),
+                        [eye_x - eye_radius, eye_y - eye_radius,
+                         eye_radius * 2, eye_radius * 1.5])
+
+    # Add shimmer based on animation frame
+    if frame == 1:
+        shimmer_pos = (center_x - radius // 2, center_y - radius // 2)
+        shimmer_radius = 3
+        pygame.draw.circle(surface, (255, 255, 200), shimmer_pos, shimmer_radius)
+
+    return surface
@@ -0,0 +1,216 @@
+import numpy
+from game.constants import TILE_SIZE, DEATH_BLINK_TIME, DEATH_BLINK_INTERVAL
+
+# Per-entity columns: dtype and number of components (x/y pairs are
+# stored as one 2 x capacity array so both axes update in the same pass)
+_COLUMNS = {
+    'grid': (numpy.int32, 2),
+    'pixel': (numpy.float64, 2),
+    'target': (numpy.float64, 2),
+    'direction': (numpy.int8, 2),
+    'level': (numpy.int32, 1),
+    'speed': (numpy.float64, 1),
+    'alive': (numpy.bool_, 1),
+    'dying': (numpy.bool_, 1),
+    'death_timer': (numpy.float64, 1),  # ms since death started
+    'blink_state': (numpy.bool_, 1),
+    'blink_timer': (numpy.float64, 1),
+    'animation_frame': (numpy.uint8, 1),
+    'animation_timer': (numpy.float64, 1),
+    'animation_speed': (numpy.float64, 1),  # ms between frames
+}
+
+# Scratch buffers update() computes into instead of allocating temporaries
+_SCRATCH = {
+    'moving': (numpy.bool_, 1),
+    'dying_now': (numpy.bool_, 1),
+    'flip': (numpy.bool_, 1),
+    'step': (numpy.float64, 1),
+    'below': (numpy.bool_, 2),
+    'ahead': (numpy.float64, 2),
+    'behind': (numpy.float64, 2),
+}
+
+
+def column(name, axis=None):
+    """Property exposing one store column (or one axis of a pair) on an entity view"""
+    if axis is None:
+        def get(self):
+            return getattr(self.store, name).item(self.index)
+
+        def put(self, value):
+            getattr(self.store, name)[self.index] = value
+    else:
+        def get(self):
+            return getattr(self.store, name).item(axis, self.index)
+
+        def put(self, value):
+            getattr(self.store, name)[axis, self.index] = value
+
+    return property(get, put)
+
+
+class EntityStore:
+    """Structure-of-arrays state for a set of ghosts or PacMans.
+
+    Each entity owns one row of NumPy columns; Ghost and PacMan objects are
+    thin views that read and write their row. Tweening, death timers and
+    animation advance for every entity in one vectorized update(), which
+    writes its intermediates into preallocated scratch columns so a
+    steady tick allocates no arrays.
+    """
+    def __init__(self, capacity=16, movable=True):
+        self.count = 0
+        self.movable = movable  # False skips tweening (PacMans never move)
+        self.views = []  # Entity object for each row
+        self.free = []  # Released rows add() hands out again before growing
+        self.standing = 0  # Rows alive and not dying; see standing_count()
+        for name, (dtype, components) in _COLUMNS.items():
+            shape = capacity if components == 1 else (components, capacity)
+            setattr(self, name, numpy.zeros(shape, dtype=dtype))
+        self.previous_pixel = self.pixel.copy()  # Positions at the last save_positions()
+        self._allocate_scratch(capacity)
+
+    def _allocate_scratch(self, capacity):
+        for name, (dtype, components) in _SCRATCH.items():
+            shape = capacity if components == 1 else (components, capacity)
+            setattr(self, f'_{name}', numpy.empty(shape, dtype=dtype))
+        self._interpolated = numpy.empty((2, capacity))
+
+    def add(self, view):
+        """Allocate a row for a new entity, reusing a released one if any, and return its index"""
+        if self.free:
+            index = self.free.pop()
+            self._detach(index)
+            self.views[index] = view
+            self.standing += 1
+            return index
+
+        capacity = len(self.alive)
+        if self.count == capacity:
+            for name in _COLUMNS:
+                old = getattr(self, name)
+                grown = numpy.zeros(old.shape[:-1] + (capacity * 2,), dtype=old.dtype)
+                grown[..., :capacity] = old
+                setattr(self, name, grown)
+            self._allocate_scratch(capacity * 2)
+
+        index = self.count
+        self.count += 1
+        self.views.append(view)
+        self.standing += 1  # Entities start out alive
+        return index
+
+    def release(self, index):
+        """Hand a collected entity's row back for a later add() to reuse"""
+        self.free.append(index)
+        self.standing -= 1
+
+    def _detach(self, index):
+        """Move a released row's entity to a one-row store of its own and clear the row.
+
+        Views of collected entities may still be referenced (AI targets,
+        lists cleaned up on the next update), so they keep their final state.
+        """
+        view = self.views[index]
+        store = EntityStore(capacity=1, movable=self.movable)
+        for name in _COLUMNS:
+            values = getattr(self, name)
+            getattr(store, name)[..., 0] = values[..., index]
+            values[..., index] = 0
+        self.previous_pixel[:, index] = 0
+        store.count = 1
+        store.views.append(view)
+        view.store = store
+        view.index = 0
+
+    def save_positions(self):
+        """Remember pixel positions as the state render interpolation starts from"""
+        if self.previous_pixel.shape != self.pixel.shape:
+            self.previous_pixel = self.pixel.copy()
+        else:
+            numpy.copyto(self.previous_pixel, self.pixel)
+
+    def interpolated_pixels(self, alpha):
+        """Pixel x and y lists, alpha (0-1) of the way from the saved positions to the current ones"""
+        count = self.count
+        previous = self.previous_pixel[:, :count]
+        interpolated = self._interpolated[:, :count]
+        numpy.subtract(self.pixel[:, :count], previous, out=interpolated)
+        numpy.multiply(interpolated, alpha, out=interpolated)
+        numpy.add(interpolated, previous, out=interpolated)
+        return interpolated.tolist()
+
+    def standing_count(self):
+        """Number of entities alive and not in their death animation.
+
+        Kept as rows are added and released and as ghosts start dying
+        (Ghost.start_death); finishing a death changes nothing, since a
+        dying entity already doesn't count.
+        """
+        return self.standing
+
+    def update(self, dt, index=None):
+        """Advance movement, death and animation timers by dt ms.
+
+        Updates every entity, or only the row at index.
+        """
+        if self.count == 0:
+            return
+        rows = slice(0, self.count) if index is None else slice(index, index + 1)
+        alive = self.alive[rows]
+        dying = self.dying[rows]
+
+        # Death animation (count_nonzero is much cheaper than any() on small arrays)
+        dying_now = numpy.logical_and(alive, dying, out=self._dying_now[rows])
+        if numpy.count_nonzero(dying_now):
+            self._update_death(dt, rows, dying_now)
+
+        moving = numpy.greater(alive, dying, out=self._moving[rows])  # Alive and not dying
+        if not numpy.count_nonzero(moving):
+            return
+
+        # Move towards target position, at most half a tile per update:
+        # the step ahead where below the target, the step back elsewhere
+        if self.movable:
+            pixel = self.pixel[:, rows]
+            target = self.target[:, rows]
+            step = numpy.multiply(self.speed[rows], dt, out=self._step[rows])
+            numpy.minimum(step, TILE_SIZE / 2, out=step)
+            ahead = numpy.add(pixel, step, out=self._ahead[:, rows])
+            numpy.minimum(ahead, target, out=ahead)
+            stepped = numpy.subtract(pixel, step, out=self._behind[:, rows])
+            numpy.maximum(stepped, target, out=stepped)
+            numpy.copyto(stepped, ahead, where=numpy.less(pixel, target, out=self._below[:, rows]))
+            numpy.copyto(pixel, stepped, where=moving)
+
+        # Update animation
+        animation_timer = self.animation_timer[rows]
+        numpy.add(animation_timer, dt, out=animation_timer, where=moving)
+        flip = numpy.greater_equal(animation_timer, self.animation_speed[rows], out=self._flip[rows])
+        numpy.logical_and(flip, moving, out=flip)
+        if numpy.count_nonzero(flip):
+            numpy.copyto(animation_timer, 0, where=flip)
+            frame = self.animation_frame[rows]
+            numpy.subtract(1, frame, out=frame, where=flip)  # Toggle between 0 and 1
+
+    def _update_death(self, dt, rows, dying_now):
+        death_timer = self.death_timer[rows]
+        blink_timer = self.blink_timer[rows]
+        numpy.add(death_timer, dt, out=death_timer, where=dying_now)
+        numpy.add(blink_timer, dt, out=blink_timer, where=dying_now)
+
+        # Blink until the animation is complete
+        finished = dying_now & (death_timer >= DEATH_BLINK_TIME)
+        blink = dying_now & (blink_timer >= DEATH_BLINK_INTERVAL) & ~finished
+        if numpy.count_nonzero(blink):
+            blink_state = self.blink_state[rows]
+            blink_state[blink] = ~blink_state[blink]
+            blink_timer[blink] = 0
+
+        if numpy.count_nonzero(finished):
+            self.alive[rows][finished] = False
+            for index in (numpy.flatnonzero(finished) + rows.start).tolist():
+                view = self.views[index]
+                if view.occupancy is not None:
+                    view.occupancy.remove(view)
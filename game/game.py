@@ -1,40 +1,91 @@
 import pygame
-import random
-import numpy
+import gc
 import os
+import random
+import time
 from game.constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, BLACK, BLUE, GHOST_COLORS, MAZE_BLACK,
-    STATE_MENU, STATE_PLAYING, STATE_SPECTATING, STATE_GAME_OVER,
-    PACMAN_SPAWN_TIME, MAX_PACMANS
+    BLACK, MAZE_BLACK, MAX_PACMANS, AI_FRAME_BUDGET,
+    SIMULATION_TICK, MAX_FRAME_TIME,
+    STATE_MENU, STATE_PLAYING, STATE_SPECTATING, STATE_GAME_OVER
 )
-from game.maze import Maze
-from game.entities.ghost import Ghost
-from game.entities.pacman import PacMan
-from game.ai.ghost_ai import GhostAI
+from game.profiler import FrameProfiler, SUMMARY_INTERVAL
+from game import metrics
 from game.ui.menu import Menu, GameOverMenu
 from game.ui.hud import HUD, PacManTimer
-from utils.helpers import get_random_color, calculate_offset, load_sound, create_placeholder_sound
+from game.ui.renderer import DirtyRectRenderer
+from game.ui.camera import Camera
+from utils.helpers import load_sound, create_placeholder_sound
+
+MATCHES_STARTED = metrics.counter('pacghost_matches_started_total', "Matches started in the game")
+FRAMES = metrics.counter('pacghost_frames_rendered_total', "Frames rendered")
+FULL_REDRAWS = metrics.counter('pacghost_full_redraws_total', "Frames that redrew the whole screen")
+MATCH_START_MS = metrics.gauge('pacghost_match_start_ms', "Time the last match took to start, in ms")
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, ai_ghosts=9, max_pacmans=MAX_PACMANS, maze_size=None, tick=SIMULATION_TICK,
+                 record_dir=None, profile_allocations=False):
         self.screen = screen
         self.state = STATE_MENU
         self.menu = Menu(screen)
         self.game_over_menu = None
         self.hud = HUD(screen)
         self.pacman_timer = PacManTimer(screen)
+        self.renderer = DirtyRectRenderer(screen)
+        self.rendered_state = None
         
-        # Game objects
-        self.maze = None
-        self.player = None
-        self.ghosts = []
-        self.ai_controllers = []
-        self.pacmans = []
+        # Match state (maze, ghosts, PacMans, AI) lives in the simulation
+        self.simulation = None
+        self.ai_ghosts = ai_ghosts
+        self.max_pacmans = max_pacmans
+        self.maze_size = maze_size  # None picks a random size per match
+        self.tick = tick  # ms per simulation step, independent of the frame rate
+        self.accumulator = 0  # Real time not yet simulated, less than one tick
+        self.recorder = None  # Seed and inputs of the current match, for replays, with --record only
+        self.record_dir = record_dir  # Where finished matches' recordings are saved, if anywhere
+        self.maze_pool = None  # Next matches' mazes, generated in the background (see load_deferred)
+        self.last_start_ms = None  # How long the last match took to start
+        self.camera = None
+        self.spectated_ghost = None  # Ghost the camera follows in spectator mode
+        self.draw_list = []  # (entity, sprite, position) to draw this frame, reused every frame
+        self.overlays = []  # [rect, state, draw] HUD overlays, built per match; states are set each frame
+        self.profiled_overlays = []  # The same, plus the profiler overlay
+        self.hud_state = None  # (player level, ghosts alive, spectating) the HUD shows
+        # F3 shows the profiler overlay, F4 dumps it as CSV; it times each
+        # phase, or with profile_allocations traces what each one allocates
+        if profile_allocations:
+            from game.profiler import AllocationProfiler
+            self.profiler = AllocationProfiler()
+        else:
+            self.profiler = FrameProfiler()
         
         # Game settings
         self.last_update_time = pygame.time.get_ticks()
         
-        # Load sounds
+        # Sounds (and the mixer) are loaded by load_deferred
+        self.pickup_sound = None
+        self.elimination_sound = None
+    
+    def load_deferred(self):
+        """Do the startup work the menu doesn't need: art, sounds and maze pre-generation.
+
+        Called once the menu is on screen; a match started before then
+        loads them itself.
+        """
+        if self.maze_pool is not None:
+            return
+        # The match modules (and numpy through the maze) are imported here
+        # rather than at startup, since the menu needs none of them
+        from game.maze_pool import MazePool
+        from game.entities.sprites import clear_cache
+        from game.assets import load_art
+        
+        self.maze_pool = MazePool(self.maze_size)
+        
+        # SVG art from the PNG cache (rasterized on the first run)
+        if load_art():
+            clear_cache()
+        
+        # Load sounds (initializes the mixer)
         self.pickup_sound = load_sound('pickup.wav')
         self.elimination_sound = load_sound('elimination.wav')
         
@@ -49,11 +100,15 @@ class Game:
     
     def handle_event(self, event):
         """Handle input events"""
-        if self.state == STATE_MENU:
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+            self._handle_profiler_key(event.key)
+        
+        elif self.state == STATE_MENU:
             option = self.menu.handle_event(event)
             if option == 'Start Game':
                 self._start_new_game()
             elif option == 'Quit':
+                self.shutdown()
                 pygame.quit()
                 exit()
         
@@ -62,20 +117,54 @@ class Game:
             if option == 'Play Again':
                 self._start_new_game()
             elif option == 'Quit':
+                self.shutdown()
                 pygame.quit()
                 exit()
         
-        elif self.state == STATE_PLAYING:
-            if event.type == pygame.KEYDOWN:
+        elif self.state in (STATE_PLAYING, STATE_SPECTATING):
+            if event.type != pygame.KEYDOWN:
+                return
+            
+            # Camera zoom
+            if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.camera.zoom_in()
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.camera.zoom_out()
+            
+            elif self.state == STATE_SPECTATING:
+                # Cycle the spectated ghost
+                if event.key in (pygame.K_RIGHT, pygame.K_d, pygame.K_TAB):
+                    self._cycle_spectated_ghost(1)
+                elif event.key in (pygame.K_LEFT, pygame.K_a):
+                    self._cycle_spectated_ghost(-1)
+            
+            else:
                 # Player movement
                 if event.key in (pygame.K_UP, pygame.K_w):
-                    self.player.move(0, -1, self.maze)
+                    self._move_player(0, -1)
                 elif event.key in (pygame.K_DOWN, pygame.K_s):
-                    self.player.move(0, 1, self.maze)
+                    self._move_player(0, 1)
                 elif event.key in (pygame.K_LEFT, pygame.K_a):
-                    self.player.move(-1, 0, self.maze)
+                    self._move_player(-1, 0)
                 elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                    self.player.move(1, 0, self.maze)
+                    self._move_player(1, 0)
+    
+    def _handle_profiler_key(self, key):
+        """F3 toggles the profiler overlay; F4 writes its window to a CSV file"""
+        profiler = self.profiler
+        if key == pygame.K_F3:
+            enabled = profiler.toggle()
+            if self.simulation:
+                self.simulation.profiler = profiler if enabled else None
+            self.renderer.invalidate()
+        elif profiler.frames:
+            print(f"Profile written to {profiler.dump_csv()}")
+    
+    def _move_player(self, dx, dy):
+        """Move the player ghost, logging the input for replays"""
+        if self.recorder:
+            self.recorder.record_move(dx, dy)
+        self.simulation.move_player(dx, dy)
     
     def update(self):
         """Update game state"""
@@ -91,45 +180,55 @@ class Game:
             self.game_over_menu.update(dt)
         
         elif self.state in (STATE_PLAYING, STATE_SPECTATING):
-            # Update PacMan timer
-            if self.pacman_timer.update(dt):
-                # Spawn new PacMan if we haven't reached the cap
-                if self.pacman_timer.increment_count():
-                    self._spawn_pacman()
-            
-            # Update entities
-            for ghost in self.ghosts:
-                ghost.update(dt)
-            
-            # Clean up inactive PacMans
-            self.pacmans = [p for p in self.pacmans if p.active]
-            
-            for pacman in self.pacmans:
-                pacman.update(dt)
-            
-            # Update AI
-            for ai in self.ai_controllers:
-                ai.update(self.pacmans, self.ghosts)
-            
-            # Check collisions
-            self._check_collisions()
+            # Advance the match in fixed ticks covering the real elapsed
+            # time, so frame rate and hitches never change what happens;
+            # the remainder carries over and render() interpolates it
+            self.accumulator = min(self.accumulator + dt, MAX_FRAME_TIME)
+            while self.accumulator >= self.tick and not self.simulation.is_over():
+                self.simulation.ghost_store.save_positions()
+                self.simulation.update(self.tick)
+                if self.recorder:
+                    self.recorder.tick_done()
+                self.accumulator -= self.tick
             
             # Check game over condition
-            alive_ghosts = [g for g in self.ghosts if g.alive and not g.dying]
-            if len(alive_ghosts) <= 1:
+            if self.simulation.is_over():
                 # Game over
-                player_won = self.player.alive and not self.player.dying
+                self.save_recording()
+                
+                # Collect behind the static screen what the match left, and
+                # the match before it (frozen when this one started)
+                gc.unfreeze()
+                gc.collect()
+                player_won = self.simulation.player_alive()
                 self.game_over_menu = GameOverMenu(self.screen, player_won)
                 self.state = STATE_GAME_OVER
             
             # Check if player died
-            elif self.state == STATE_PLAYING and (not self.player.alive or self.player.dying):
+            elif self.state == STATE_PLAYING and not self.simulation.player_alive():
                 # Switch to spectator mode
                 self.state = STATE_SPECTATING
     
     def render(self):
-        """Render the game"""
+        """Render the game.
+
+        Returns the list of screen rects that changed, or None when the
+        whole screen was redrawn and should be flipped.
+        """
+        # Any state change (menu, new match, spectating...) needs a full redraw
+        if self.state != self.rendered_state:
+            self.rendered_state = self.state
+            self.renderer.invalidate()
+        FRAMES.inc()
+        
+        if self.state in (STATE_PLAYING, STATE_SPECTATING):
+            dirty_rects = self._render_match()
+            if dirty_rects is None:
+                FULL_REDRAWS.inc()
+            return dirty_rects
+        
         # Clear screen
+        FULL_REDRAWS.inc()
         self.screen.fill(MAZE_BLACK)  # Use classic Pac-Man black background
         
         if self.state == STATE_MENU:
@@ -137,131 +236,146 @@ class Game:
         
         elif self.state == STATE_GAME_OVER:
             self.game_over_menu.render()
+        return None
+    
+    def _render_match(self):
+        """Render the maze, entities and HUD through the dirty-rect renderer"""
+        simulation = self.simulation
+        camera = self.camera
         
-        elif self.state in (STATE_PLAYING, STATE_SPECTATING):
-            # Calculate offset to center maze
-            offset_x, offset_y = calculate_offset(
-                self.maze.size, TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
-            )
-            
-            # Render maze
-            self.maze.render(self.screen, offset_x, offset_y)
-            
-            # Render PacMans
-            for pacman in self.pacmans:
-                pacman.render(self.screen, offset_x, offset_y)
-            
-            # Render ghosts
-            for ghost in self.ghosts:
-                ghost.render(self.screen, offset_x, offset_y)
-            
-            # Render HUD
-            player_level = self.player.level if self.player.alive else 0
-            alive_ghosts = len([g for g in self.ghosts if g.alive and not g.dying])
-            self.hud.render(player_level, alive_ghosts, self.state == STATE_SPECTATING)
-            self.pacman_timer.render()
+        # Ghosts are drawn between their last two simulated positions
+        pixel_x, pixel_y = simulation.ghost_store.interpolated_pixels(self.accumulator / self.tick)
+        
+        # Follow the player, or the spectated ghost once the player is out;
+        # a scrolled or zoomed view makes the whole screen stale
+        if simulation.player.alive:
+            target = simulation.player
+        else:
+            target = self._spectated_target()
+        focus = None if target is None else (pixel_x[target.index], pixel_y[target.index])
+        if camera.follow(focus):
+            self.renderer.invalidate()
+        
+        # PacMans first, then ghosts on top; anything off screen is culled
+        size = camera.tile_size
+        entities = self.draw_list
+        entities.clear()
+        for entity in simulation.pacmans:
+            if entity.active:
+                x, y = camera.to_screen(entity.pixel_x, entity.pixel_y)
+                if camera.is_visible(x, y, size, size):
+                    entities.append((entity, camera.scale(entity.sprite()), (x, y)))
+        for entity in simulation.ghosts:
+            if entity.alive:
+                x, y = camera.to_screen(pixel_x[entity.index], pixel_y[entity.index])
+                if camera.is_visible(x, y, size, size):
+                    entities.append((entity, camera.scale(entity.sprite()), (x, y)))
+        
+        # HUD overlays with the values they display
+        player_level = simulation.player.level if simulation.player.alive else 0
+        self.hud_state = hud_state = (player_level, simulation.alive_ghost_count(), self.state == STATE_SPECTATING)
+        spawn_timer = simulation.spawn_timer
+        overlays = self.profiled_overlays if self.profiler.enabled else self.overlays
+        for overlay in overlays:
+            overlay[1] = hud_state
+        overlays[len(self.hud.regions)][1] = (spawn_timer.pacman_count, spawn_timer.max_pacmans,
+                                              self.pacman_timer.progress_width(spawn_timer))
+        if self.profiler.enabled:
+            # Redrawn a few times a second, so drawing it barely shows in its own numbers
+            overlays[-1][1] = self.profiler.frame_count // SUMMARY_INTERVAL
+        
+        return self.renderer.render(camera.background_blits, entities, overlays)
     
-    def _start_new_game(self):
-        """Initialize a new game"""
-        # Create maze
-        self.maze = Maze()
+    def _build_overlays(self):
+        """Create the match's HUD overlays once; _render_match only updates their states"""
+        spawn_timer = self.simulation.spawn_timer
+        draw_hud = lambda: self.hud.render(*self.hud_state)
+        self.overlays = [[region, None, draw_hud] for region in self.hud.regions]
+        self.overlays.append([self.pacman_timer.region, None, lambda: self.pacman_timer.render(spawn_timer)])
+        self.profiled_overlays = self.overlays + [
+            [self.hud.profiler_region, None, lambda: self.hud.render_profiler(self.profiler)]]
+    
+    def _spectated_target(self):
+        """Ghost to follow in spectator mode, moving on when it dies"""
+        ghost = self.spectated_ghost
+        if ghost is None or not ghost.alive:
+            self._cycle_spectated_ghost(1)
+        return self.spectated_ghost
+    
+    def _cycle_spectated_ghost(self, step):
+        """Switch the spectated ghost to the next (or previous) one still alive"""
+        ghosts = self.simulation.ghosts
+        start = ghosts.index(self.spectated_ghost) if self.spectated_ghost in ghosts else 0
+        for i in range(1, len(ghosts) + 1):
+            ghost = ghosts[(start + step * i) % len(ghosts)]
+            if ghost.alive and not ghost.is_player:
+                self.spectated_ghost = ghost
+                return
+        self.spectated_ghost = None
+    
+    def _start_new_game(self, seed=None, maze=None):
+        """Initialize a new game.
+
+        seed and maze fix the match (e.g. for benchmarks); by default it
+        gets a random seed and a maze from the pool.
+        """
+        from game.simulation import Simulation
+        from game.entities.sprites import warm_cache
         
-        # Create player ghost
-        player_pos = self.maze.get_random_walkable_position()
-        self.player = Ghost(player_pos[0], player_pos[1], BLUE, is_player=True)
-        self.ghosts = [self.player]
+        start = time.perf_counter()
+        self.load_deferred()
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.simulation = Simulation(ai_ghosts=self.ai_ghosts, seed=seed, maze=maze or self.maze_pool.take(),
+                                     max_pacmans=self.max_pacmans, ai_budget=AI_FRAME_BUDGET)
+        self.recorder = None
+        if self.record_dir is not None:
+            from game.replay import Recorder
+            self.recorder = Recorder(self.simulation, self.ai_ghosts, self.maze_size, self.tick)
+        self.simulation.on_pickup = lambda ghost, pacman: self._play_sound(self.pickup_sound)
+        self.simulation.on_elimination = lambda winner, losers: self._play_sound(self.elimination_sound)
+        self.simulation.profiler = self.profiler if self.profiler.enabled else None
+        self.camera = Camera(self.simulation.maze)
+        self.simulation.ghost_store.save_positions()
+        self.accumulator = 0
+        self.spectated_ghost = None
+        self._build_overlays()
+        self.renderer.invalidate()
         
-        # Create AI ghosts
-        for _ in range(9):
-            # Find position not occupied by another ghost
-            while True:
-                pos = self.maze.get_random_walkable_position()
-                if not any(g.grid_x == pos[0] and g.grid_y == pos[1] for g in self.ghosts):
-                    break
-            
-            # Create ghost with random color (not blue)
-            ghost = Ghost(pos[0], pos[1], get_random_color(exclude_color=BLUE))
-            self.ghosts.append(ghost)
-            
-            # Create AI controller for this ghost
-            ai = GhostAI(ghost, self.maze)
-            self.ai_controllers.append(ai)
+        # Draw the starting sprites now rather than during the first frames
+        warm_cache({ghost.color for ghost in self.simulation.ghosts})
         
-        # Reset PacMans
-        self.pacmans = []
-        self.pacman_timer = PacManTimer(self.screen)
+        # The maze, its graphs, entities and AIs live until the match ends, and
+        # a full garbage collection walking them all takes about a frame:
+        # collect what setting up the match left, then move everything alive
+        # out of the collector's reach until the game over screen (see update)
+        gc.collect()
+        gc.freeze()
         
         # Set game state
         self.state = STATE_PLAYING
+        self.last_start_ms = (time.perf_counter() - start) * 1000
+        MATCHES_STARTED.inc()
+        MATCH_START_MS.set(self.last_start_ms)
     
-    def _spawn_pacman(self):
-        """Spawn a new PacMan at a random position"""
-        # Find position not occupied by another entity
-        while True:
-            pos = self.maze.get_random_walkable_position()
-            if not any(g.grid_x == pos[0] and g.grid_y == pos[1] for g in self.ghosts) and \
-               not any(p.grid_x == pos[0] and p.grid_y == pos[1] for p in self.pacmans):
-                break
-        
-        # Create PacMan
-        pacman = PacMan(pos[0], pos[1])
-        self.pacmans.append(pacman)
+    def shutdown(self):
+        """Save the match recording and stop the maze pool's worker before quitting"""
+        self.save_recording()
+        if self.maze_pool is not None:
+            self.maze_pool.close()
     
-    def _check_collisions(self):
-        """Check for collisions between entities"""
-        # Check ghost-pacman collisions
-        for ghost in self.ghosts:
-            if not ghost.alive or ghost.dying:
-                continue
-                
-            for pacman in self.pacmans[:]:  # Create a copy of the list to safely remove items
-                if not pacman.active:
-                    continue
-                    
-                if ghost.collides_with(pacman):
-                    # Ghost eats PacMan
-                    pacman.collect()
-                    ghost.level_up()
-                    self.pacman_timer.decrement_count()
-                    
-                    # Play sound
-                    try:
-                        if self.pickup_sound:
-                            self.pickup_sound.play()
-                    except Exception as e:
-                        print(f"Error playing pickup sound: {e}")
-        
-        # Check ghost-ghost collisions
-        for i, ghost1 in enumerate(self.ghosts):
-            if not ghost1.alive or ghost1.dying:
-                continue
-                
-            for ghost2 in self.ghosts[i+1:]:
-                if not ghost2.alive or ghost2.dying:
-                    continue
-                    
-                if ghost1.collides_with(ghost2):
-                    # Higher level ghost eliminates lower level
-                    if ghost1.level > ghost2.level:
-                        ghost2.start_death()
-                        try:
-                            if self.elimination_sound:
-                                self.elimination_sound.play()
-                        except Exception as e:
-                            print(f"Error playing elimination sound: {e}")
-                    elif ghost2.level > ghost1.level:
-                        ghost1.start_death()
-                        try:
-                            if self.elimination_sound:
-                                self.elimination_sound.play()
-                        except Exception as e:
-                            print(f"Error playing elimination sound: {e}")
-                    else:
-                        # Equal levels, both die
-                        ghost1.start_death()
-                        ghost2.start_death()
-                        try:
-                            if self.elimination_sound:
-                                self.elimination_sound.play()
-                        except Exception as e:
-                            print(f"Error playing elimination sound: {e}")
+    def save_recording(self):
+        """Save the current match's recording, once, if recording is on"""
+        if not self.recorder:
+            return
+        path = self.recorder.save(self.record_dir)
+        self.recorder = None
+        print(f"Match recorded to {path}")
+    
+    def _play_sound(self, sound):
+        """Play a sound effect, ignoring mixer errors"""
+        try:
+            if sound:
+                sound.play()
+        except Exception as e:
+            print(f"Error playing sound: {e}")
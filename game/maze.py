@@ -1,120 +1,214 @@
 import random
+import time
+import numpy
 import pygame
-from game.constants import TILE_SIZE, MIN_MAZE_SIZE, MAX_MAZE_SIZE, WALKABLE_PERCENTAGE, MAZE_BLUE, MAZE_BLACK
+from collections import OrderedDict
+from game import metrics
+from game.constants import (
+    TILE_SIZE, MIN_MAZE_SIZE, MAX_MAZE_SIZE, WALKABLE_PERCENTAGE, MAZE_BLUE, MAZE_BLACK,
+    DISTANCE_TABLE_MAX_CELLS, CHUNK_TILES, MAX_CACHED_CHUNKS
+)
+
+MAZES_GENERATED = metrics.counter('pacghost_mazes_generated_total', "Mazes generated")
+TOPUP_ROUNDS = metrics.counter('pacghost_maze_topup_rounds_total',
+                               "Batches of walls opened to reach the walkable share")
+GENERATION_MS = metrics.histogram('pacghost_maze_generation_ms', "Time to generate a maze, in ms")
 
 class Maze:
-    def __init__(self):
-        # Determine maze size (random between min and max)
-        self.size = random.randint(MIN_MAZE_SIZE, MAX_MAZE_SIZE)
+    seed = None  # Seed of the generator that carved the maze, when known (see MazePool)
+    
+    def __init__(self, rng=None, size=None):
+        # All randomness goes through one generator so a seeded match
+        # always produces the same maze
+        self.rng = rng or random.Random()
+        
+        # Determine maze size (random between min and max unless given)
+        self.size = size or self.rng.randint(MIN_MAZE_SIZE, MAX_MAZE_SIZE)
         
-        # Initialize maze grid (0 = wall, 1 = path)
-        self.grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        # Maze grid as a contiguous uint8 array indexed [y, x]
+        # (0 = wall, 1 = path, 2 = tunnel)
+        self.grid = numpy.zeros((self.size, self.size), dtype=numpy.uint8)
         
         # Generate the maze
+        start = time.perf_counter()
         self._generate_maze()
         
         # Create warp tunnels
         self._create_warp_tunnels()
         
-        # Create surface for rendering
-        self.surface = pygame.Surface((self.size * TILE_SIZE, self.size * TILE_SIZE))
-        self._render_maze_surface()
+        # Lookup structures derived from the finished grid
+        self._build_index()
+        self._reset_caches()
+        MAZES_GENERATED.inc()
+        GENERATION_MS.observe((time.perf_counter() - start) * 1000)
+    
+    def _reset_caches(self):
+        """Start with no surfaces or search structures; all are built on first use"""
+        # Surface for rendering is built on first render, so mazes can be
+        # generated without a display
+        self.surface = None
+        self.chunks = OrderedDict()  # (chunk x, chunk y, tile size) -> surface, least recent first
+        
+        # Search structures shared by every AI on this maze
+        self._graph = None
+        self._distance_oracle = None
+        self._vision = None
+    
+    @classmethod
+    def load(cls, path):
+        """Open a maze saved with save(); large tables are memory-mapped, not read"""
+        from game.maze_file import load_maze
+        return load_maze(cls, path)
+    
+    def save(self, path, distance_tables=False):
+        """Write the maze in the binary maze format (see game.maze_file).
+
+        With distance_tables the full distance oracle is built and stored
+        too, so loaded copies never run a BFS. Mazes too large for an
+        oracle raise ValueError.
+        """
+        from game.maze_file import save_maze
+        save_maze(self, path, distance_tables)
     
     def _generate_maze(self):
         """Generate a procedural maze with at least 60% walkable area"""
-        # Start with a completely walled maze
-        self.grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        size = self.size
+        
+        # Carve into a flat bytearray: plain indexing is much faster than
+        # numpy scalar access inside the Python loop below
+        cells = bytearray(size * size)  # Start with a completely walled maze
         
-        # Use a modified recursive backtracking algorithm
-        # Start from the center
-        start_x, start_y = self.size // 2, self.size // 2
-        self.grid[start_y][start_x] = 1  # Mark as path
+        # Use a modified recursive backtracking algorithm on flat cell
+        # indices. Start from the center
+        start = (size // 2) * size + size // 2
+        cells[start] = 1  # Mark as path
         
         # Use stack for backtracking
-        stack = [(start_x, start_y)]
-        directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]  # Up, Right, Down, Left
+        stack = [start]
+        row = size
+        choice = self.rng.choice
         
         while stack:
-            current_x, current_y = stack[-1]
+            current = stack[-1]
+            x = current % size
             
-            # Find unvisited neighbors
+            # Find unvisited neighbors two tiles away, as (next, wall) in
+            # Up, Right, Down, Left order
             unvisited = []
-            for dx, dy in directions:
-                nx, ny = current_x + dx, current_y + dy
-                if 0 <= nx < self.size and 0 <= ny < self.size and self.grid[ny][nx] == 0:
-                    unvisited.append((nx, ny, dx // 2, dy // 2))
+            if current >= 2 * row and cells[current - 2 * row] == 0:
+                unvisited.append((current - 2 * row, current - row))
+            if x + 2 < size and cells[current + 2] == 0:
+                unvisited.append((current + 2, current + 1))
+            if current + 2 * row < size * size and cells[current + 2 * row] == 0:
+                unvisited.append((current + 2 * row, current + row))
+            if x >= 2 and cells[current - 2] == 0:
+                unvisited.append((current - 2, current - 1))
             
             if unvisited:
                 # Choose random unvisited neighbor
-                next_x, next_y, wall_x, wall_y = random.choice(unvisited)
+                next_cell, wall = choice(unvisited)
                 
-                # Remove wall between current and next
-                self.grid[current_y + wall_y][current_x + wall_x] = 1
-                
-                # Mark next cell as path
-                self.grid[next_y][next_x] = 1
+                # Remove wall between current and next, mark next as path
+                cells[wall] = 1
+                cells[next_cell] = 1
                 
                 # Push next cell to stack
-                stack.append((next_x, next_y))
+                stack.append(next_cell)
             else:
                 # Backtrack
                 stack.pop()
         
+        # The grid shares memory with cells from here on
+        self.grid = numpy.frombuffer(cells, dtype=numpy.uint8).reshape(size, size)
+        
         # Ensure we have at least 60% walkable area
-        walkable_count = sum(row.count(1) for row in self.grid)
-        total_cells = self.size * self.size
-        
-        # If we don't have enough walkable area, add more paths
-        while walkable_count / total_cells < WALKABLE_PERCENTAGE:
-            # Find a wall adjacent to a path
-            x, y = random.randint(1, self.size - 2), random.randint(1, self.size - 2)
-            if self.grid[y][x] == 0:  # If it's a wall
-                # Check if it's adjacent to a path
-                adjacent_paths = 0
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.size and 0 <= ny < self.size and self.grid[ny][nx] == 1:
-                        adjacent_paths += 1
-                
-                if adjacent_paths > 0:
-                    self.grid[y][x] = 1  # Convert to path
-                    walkable_count += 1
+        walkable_count = int(numpy.count_nonzero(self.grid))
+        total_cells = size * size
+        needed = int(numpy.ceil(WALKABLE_PERCENTAGE * total_cells)) - walkable_count
+        
+        # Open walls next to a path until we have enough walkable area.
+        # Candidates come from the frontier of such walls and are opened in
+        # vectorized batches, drawn from a numpy generator seeded by self.rng
+        sampler = None
+        while needed > 0:
+            frontier = self._wall_frontier()
+            if len(frontier) == 0:
+                break
+            if sampler is None:
+                sampler = numpy.random.default_rng(self.rng.getrandbits(64))
+            
+            chosen = sampler.choice(frontier, size=min(needed, len(frontier)), replace=False)
+            self.grid.ravel()[chosen] = 1  # Convert to path
+            needed -= len(chosen)
+            TOPUP_ROUNDS.inc()
+    
+    def _wall_frontier(self):
+        """Flat indices of interior walls with at least one path neighbour"""
+        grid = self.grid
+        interior_walls = grid[1:-1, 1:-1] == 0
+        next_to_path = (grid[:-2, 1:-1] == 1) | (grid[2:, 1:-1] == 1) | \
+                       (grid[1:-1, :-2] == 1) | (grid[1:-1, 2:] == 1)
+        ys, xs = numpy.nonzero(interior_walls & next_to_path)
+        return (ys + 1) * self.size + xs + 1
+    
+    def _build_index(self):
+        """Cache the walkability mask and the flat index of spawnable cells"""
+        flat = self.grid.ravel()
+        
+        # bytes indexing is the fast path for per-tile checks from the AI
+        self._walkable = (flat > 0).tobytes()
+        
+        # Regular paths only (not tunnels), in row-major order
+        self.walkable_cells = numpy.flatnonzero(flat == 1)
     
     def _create_warp_tunnels(self):
         """Create warp tunnels at the center of each edge"""
-        # Top and bottom tunnels
+        last = self.size - 1
         mid_x = self.size // 2
-        self.grid[0][mid_x] = 2  # Top tunnel
-        self.grid[self.size - 1][mid_x] = 2  # Bottom tunnel
-        
-        # Left and right tunnels
         mid_y = self.size // 2
-        self.grid[mid_y][0] = 2  # Left tunnel
-        self.grid[mid_y][self.size - 1] = 2  # Right tunnel
+        
+        # Top/bottom and left/right tunnels lead to each other
+        self.warps = {
+            (mid_x, 0): (mid_x, last),
+            (mid_x, last): (mid_x, 0),
+            (0, mid_y): (last, mid_y),
+            (last, mid_y): (0, mid_y),
+        }
+        for x, y in self.warps:
+            self.grid[y, x] = 2
     
     def _render_maze_surface(self):
         """Pre-render the maze surface for efficient drawing"""
-        self.surface.fill(MAZE_BLACK)  # Fill with classic Pac-Man black background
+        self.surface = self._render_tiles(0, 0, self.size, self.size, TILE_SIZE)
+    
+    def _render_tiles(self, start_x, start_y, width, height, tile_size):
+        """Render a block of tiles, clipped to the maze, at the given tile size"""
+        width = max(0, min(width, self.size - start_x))
+        height = max(0, min(height, self.size - start_y))
+        surface = pygame.Surface((width * tile_size, height * tile_size))
+        surface.fill(MAZE_BLACK)  # Fill with classic Pac-Man black background
         
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.grid[y][x] > 0:  # Path or tunnel
+        rows = self.grid[start_y:start_y + height, start_x:start_x + width].tolist()
+        for y in range(height):
+            for x in range(width):
+                if rows[y][x] > 0:  # Path or tunnel
                     # Draw path tile (black for classic Pac-Man look)
-                    rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                    pygame.draw.rect(self.surface, MAZE_BLACK, rect)
+                    rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+                    pygame.draw.rect(surface, MAZE_BLACK, rect)
                 else:
                     # Draw wall (blue for classic Pac-Man look)
-                    rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                    pygame.draw.rect(self.surface, MAZE_BLUE, rect)
+                    rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+                    pygame.draw.rect(surface, MAZE_BLUE, rect)
                     
                     # Add subtle inner bevel for walls
                     inner_rect = rect.inflate(-2, -2)
-                    pygame.draw.rect(self.surface, MAZE_BLUE, inner_rect)
+                    pygame.draw.rect(surface, MAZE_BLUE, inner_rect)
                 
                 # Add visual indicator for tunnels
-                if self.grid[y][x] == 2:
-                    tunnel_rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                    pygame.draw.rect(self.surface, (50, 50, 150), tunnel_rect, 2)
+                if rows[y][x] == 2:
+                    tunnel_rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+                    pygame.draw.rect(surface, (50, 50, 150), tunnel_rect, 2)
+        return surface
     
     def is_walkable(self, x, y):
         """Check if a position is walkable"""
@@ -123,42 +217,71 @@ class Maze:
             return False
             
         # Check if it's a path or tunnel
-        return self.grid[y][x] > 0
+        return self._walkable[y * self.size + x] == 1
     
     def get_warp_destination(self, x, y):
         """Get destination coordinates when entering a warp tunnel"""
-        mid_x = self.size // 2
-        mid_y = self.size // 2
-        
-        # Top tunnel
-        if y == 0 and x == mid_x:
-            return x, self.size - 1
-        
-        # Bottom tunnel
-        if y == self.size - 1 and x == mid_x:
-            return x, 0
-        
-        # Left tunnel
-        if x == 0 and y == mid_y:
-            return self.size - 1, y
-        
-        # Right tunnel
-        if x == self.size - 1 and y == mid_y:
-            return 0, y
-        
-        # Not a tunnel
-        return x, y
+        # Not a tunnel: stay in place
+        return self.warps.get((x, y), (x, y))
+    
+    def get_graph(self):
+        """Return the maze's shared warp-aware adjacency graph"""
+        if self._graph is None:
+            from game.ai.pathfinding import MazeGraph
+            self._graph = MazeGraph(self)
+        return self._graph
+    
+    def get_vision(self):
+        """Return the maze's shared bounded-BFS vision query (scratch buffers for one scan at a time)"""
+        if self._vision is None:
+            from game.ai.vision import VisionQuery
+            self._vision = VisionQuery(self)
+        return self._vision
+    
+    def get_distance_oracle(self):
+        """Return the maze's shared distance table, or None if the maze is too large to tabulate"""
+        if self._distance_oracle is None:
+            from game.ai.distance_oracle import DistanceOracle
+            
+            walkable_count = int(numpy.count_nonzero(self.grid))
+            if walkable_count > DISTANCE_TABLE_MAX_CELLS:
+                return None
+            self._distance_oracle = DistanceOracle(self)
+        return self._distance_oracle
     
-    def get_random_walkable_position(self):
+    def get_random_walkable_position(self, rng=None):
         """Get a random walkable position in the maze"""
-        walkable_positions = []
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.grid[y][x] == 1:  # Only regular paths, not tunnels
-                    walkable_positions.append((x, y))
+        # Only regular paths, not tunnels
+        if len(self.walkable_cells) == 0:
+            return self.size // 2, self.size // 2
+        
+        cell = int(self.walkable_cells[(rng or self.rng).randrange(len(self.walkable_cells))])
+        return cell % self.size, cell // self.size
+    
+    def get_surface(self):
+        """Return the pre-rendered maze surface, building it on first use"""
+        if self.surface is None:
+            self._render_maze_surface()
+        return self.surface
+    
+    def get_chunk(self, chunk_x, chunk_y, tile_size=TILE_SIZE):
+        """Return the cached surface for one CHUNK_TILES x CHUNK_TILES block of the maze.
+
+        Only recently drawn chunks are kept, so memory stays flat however
+        large the maze is.
+        """
+        key = (chunk_x, chunk_y, tile_size)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
         
-        return random.choice(walkable_positions) if walkable_positions else (self.size // 2, self.size // 2)
+        chunk = self._render_tiles(chunk_x * CHUNK_TILES, chunk_y * CHUNK_TILES, CHUNK_TILES, CHUNK_TILES, tile_size)
+        self.chunks[key] = chunk
+        if len(self.chunks) > MAX_CACHED_CHUNKS:
+            self.chunks.popitem(last=False)
+        return chunk
     
     def render(self, screen, offset_x=0, offset_y=0):
         """Render the maze to the screen"""
-        screen.blit(self.surface, (offset_x, offset_y))
+        screen.blit(self.get_surface(), (offset_x, offset_y))
@@ -0,0 +1,136 @@
+"""Binary maze format.
+
+A saved maze is one little-endian file: a fixed header followed by
+sections, each starting on an 8-byte boundary.
+
+    header       magic b'PGMZ', version, flags, size, path cell count,
+                 warp count, distance table cell count (0 if absent)
+    grid         walkable bit per cell, row-major, packed 8 per byte
+    warps        (entry cell, destination cell) uint32 pairs
+    path cells   uint32 flat index of every regular path cell (the spawn index)
+    distances    uint16 all-pairs table in DistanceOracle layout (optional)
+    next hops    uint8 all-pairs table in DistanceOracle layout (optional)
+
+Loading maps the file read-only: the spawn index and distance tables are
+views into the mapping rather than copies, so opening a maze is instant
+and processes loading the same file share its pages.
+"""
+import mmap
+import random
+import struct
+import sys
+from array import array
+import numpy
+
+MAGIC = b'PGMZ'
+VERSION = 1
+FLAG_DISTANCE_TABLES = 1
+_HEADER = struct.Struct('<4sHHIIII')
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _layout(size, path_count, warp_count, table_count):
+    """Offset of each section, and the total file length"""
+    offsets = {}
+    offset = _HEADER.size
+    for name, length in (('grid', (size * size + 7) // 8),
+                         ('warps', warp_count * 8),
+                         ('path_cells', path_count * 4),
+                         ('distances', table_count * table_count * 2),
+                         ('next_hops', table_count * table_count)):
+        offset = _align(offset)
+        offsets[name] = offset
+        offset += length
+    return offsets, offset
+
+
+def save_maze(maze, path, distance_tables=False):
+    """Write maze to path; see Maze.save"""
+    size = maze.size
+    oracle = None
+    if distance_tables:
+        oracle = maze.get_distance_oracle()
+        if oracle is None:
+            raise ValueError(f"{size}x{size} maze is too large for distance tables")
+        oracle.build_all()
+
+    cell_of = lambda pos: pos[1] * size + pos[0]
+    warps = numpy.array([(cell_of(entry), cell_of(dest)) for entry, dest in maze.warps.items()],
+                        dtype='<u4').reshape(-1, 2)
+    path_cells = numpy.asarray(maze.walkable_cells, dtype='<u4')
+    table_count = oracle.count if oracle else 0
+    offsets, length = _layout(size, len(path_cells), len(warps), table_count)
+
+    sections = {
+        'grid': numpy.packbits(maze.grid.ravel() > 0).tobytes(),
+        'warps': warps.tobytes(),
+        'path_cells': path_cells.tobytes(),
+    }
+    if oracle:
+        sections['distances'] = numpy.frombuffer(oracle.distances, dtype=numpy.uint16).astype('<u2').tobytes()
+        sections['next_hops'] = bytes(oracle.next_hops)
+
+    data = bytearray(length)
+    flags = FLAG_DISTANCE_TABLES if oracle else 0
+    _HEADER.pack_into(data, 0, MAGIC, VERSION, flags, size, len(path_cells), len(warps), table_count)
+    for name, section in sections.items():
+        data[offsets[name]:offsets[name] + len(section)] = section
+
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def load_maze(cls, path):
+    """Map path and build a cls (Maze) over it; see Maze.load"""
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapping) < _HEADER.size:
+        raise ValueError(f"{path}: not a maze file")
+    magic, version, flags, size, path_count, warp_count, table_count = _HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a maze file")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported maze format version {version}")
+    offsets, length = _layout(size, path_count, warp_count, table_count)
+    if len(mapping) < length:
+        raise ValueError(f"{path}: truncated maze file")
+
+    maze = cls.__new__(cls)
+    maze.rng = random.Random()
+    maze.size = size
+
+    # The grid is small; unpack it into a writable array like a generated maze's
+    bits = numpy.frombuffer(mapping, dtype=numpy.uint8, count=(size * size + 7) // 8, offset=offsets['grid'])
+    maze.grid = numpy.unpackbits(bits, count=size * size).reshape(size, size)
+
+    warps = numpy.frombuffer(mapping, dtype='<u4', count=warp_count * 2, offset=offsets['warps']).tolist()
+    maze.warps = {}
+    for i in range(0, len(warps), 2):
+        entry, dest = warps[i], warps[i + 1]
+        maze.warps[(entry % size, entry // size)] = (dest % size, dest // size)
+        maze.grid.ravel()[entry] = 2
+
+    maze._walkable = (maze.grid.ravel() > 0).tobytes()
+    maze.walkable_cells = numpy.frombuffer(mapping, dtype='<u4', count=path_count, offset=offsets['path_cells'])
+    maze._reset_caches()
+    maze._mapping = mapping  # Keeps the views above valid
+
+    if flags & FLAG_DISTANCE_TABLES:
+        from game.ai.distance_oracle import DistanceOracle
+        view = memoryview(mapping)
+        table_size = table_count * table_count
+        distances = view[offsets['distances']:offsets['distances'] + table_size * 2].cast('H')
+        if sys.byteorder != 'little':
+            distances = array('H', distances.tobytes())
+            distances.byteswap()
+        next_hops = view[offsets['next_hops']:offsets['next_hops'] + table_size]
+        oracle = DistanceOracle(maze, (distances, next_hops))
+        if oracle.count != table_count:
+            raise ValueError(f"{path}: distance tables don't match the grid")
+        maze._distance_oracle = oracle
+
+    return maze
@@ -0,0 +1,76 @@
+import queue
+import random
+import threading
+from game import metrics
+from game.constants import MAZE_POOL_SIZE
+from game.maze import Maze
+
+POOL_HITS = metrics.counter('pacghost_maze_pool_hits_total', "Matches started on a pre-generated maze")
+POOL_MISSES = metrics.counter('pacghost_maze_pool_misses_total', "Matches that had to generate their maze")
+
+
+class MazePool:
+    """A few mazes generated ahead of time on a background thread.
+
+    Generation (backtracking carve, top-up, lookup index, search graph and
+    distance table) runs on the worker, so starting a match only takes a
+    ready maze off the queue. The maze surface is still drawn lazily on the
+    main thread, chunk by chunk, as the camera reaches it.
+
+    `hits` counts matches that got a ready maze, `misses` those that had to
+    generate one on the spot because the worker hadn't caught up.
+    """
+    def __init__(self, maze_size=None, capacity=MAZE_POOL_SIZE):
+        self.maze_size = maze_size  # None picks a random size per maze
+        self.ready = queue.Queue(maxsize=capacity)
+        self.hits = 0
+        self.misses = 0
+        self._closed = threading.Event()
+        self._worker = threading.Thread(target=self._fill, name='maze-pool', daemon=True)
+        self._worker.start()
+
+    def take(self):
+        """Return a ready maze, or generate one now if the pool is empty"""
+        try:
+            maze = self.ready.get_nowait()
+            self.hits += 1
+            POOL_HITS.inc()
+        except queue.Empty:
+            maze = self._build()
+            self.misses += 1
+            POOL_MISSES.inc()
+        return maze
+
+    def close(self, timeout=1.0):
+        """Stop the worker and drop the mazes it had ready.
+
+        Waits up to timeout seconds for a maze still being generated; the
+        worker is a daemon thread, so a slow one can't hold up exit.
+        """
+        self._closed.set()
+        self._worker.join(timeout)
+        while True:
+            try:
+                self.ready.get_nowait()
+            except queue.Empty:
+                break
+
+    def _build(self):
+        """Generate a maze with its shared search structures already built"""
+        seed = random.getrandbits(64)
+        maze = Maze(random.Random(seed), self.maze_size)
+        maze.seed = seed  # Lets a match recording regenerate it
+        maze.get_graph()
+        maze.get_distance_oracle()
+        return maze
+
+    def _fill(self):
+        """Worker loop: keep the queue topped up until closed"""
+        while not self._closed.is_set():
+            maze = self._build()
+            while not self._closed.is_set():
+                try:
+                    self.ready.put(maze, timeout=0.25)
+                    break
+                except queue.Full:
+                    continue
@@ -0,0 +1,196 @@
+"""Process-wide counters, gauges and histograms, exported as Prometheus text.
+
+Modules declare their metrics once at import time and update them where
+the work happens:
+
+    SEARCHES = metrics.counter('pacghost_astar_searches_total', "A* searches run")
+    SEARCHES.inc()
+
+Updating a metric is a plain attribute increment, cheap enough for per-search
+and per-tick paths. REGISTRY.write() saves the text exposition format
+to a file, and REGISTRY.serve() answers scrapes on a localhost port from
+a background thread.
+
+Worker processes have registries of their own: drain() hands over (and
+resets) what a worker counted so the parent can merge() it into its own.
+"""
+import copy
+import os
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Counter:
+    """A count that only goes up"""
+    kind = 'counter'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+    def _merge(self, other):
+        self.value += other.value
+
+    def _reset(self):
+        self.value = 0
+
+
+class Gauge:
+    """A value that is set, e.g. the size of something right now"""
+    kind = 'gauge'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+    def _merge(self, other):
+        self.value = other.value  # Latest report wins
+
+    def _reset(self):
+        pass  # A gauge describes the present; draining leaves it alone
+
+
+class Histogram:
+    """Observations counted into cumulative buckets (upper bounds), with their sum"""
+    kind = 'histogram'
+
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot: above every bound
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            samples.append((f'{self.name}_bucket{{le="{bound}"}}', cumulative))
+        samples.append((f'{self.name}_bucket{{le="+Inf"}}', self.count))
+        samples.append((f'{self.name}_sum', self.sum))
+        samples.append((f'{self.name}_count', self.count))
+        return samples
+
+    def _merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def _reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+
+class Registry:
+    """Every metric of the process, by name"""
+    def __init__(self):
+        self.metrics = {}
+
+    def _get(self, cls, name, help, *args):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help, *args)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name, help):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help):
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name, help, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, buckets)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(f'{name} {value}' for name, value in metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Save render() to path, replacing it atomically so a scraper never reads half a file"""
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port, host='127.0.0.1'):
+        """Answer GET /metrics on host:port from a daemon thread; returns the server"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Only --metrics-port needs it
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        return server
+
+    def drain(self):
+        """Copies of every metric (picklable), after which counters and histograms restart from zero"""
+        drained = {}
+        for name, metric in self.metrics.items():
+            drained[name] = copy.copy(metric)
+            metric._reset()
+        return drained
+
+    def merge(self, drained):
+        """Add a drain() from another process, registering metrics this one hasn't imported"""
+        for name, other in drained.items():
+            metric = self.metrics.get(name)
+            if metric is None:
+                self.metrics[name] = other
+            else:
+                metric._merge(other)
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
@@ -0,0 +1,78 @@
+import numpy
+
+
+class OccupancyIndex:
+    """Tile occupancy for ghosts and PacMans.
+
+    Entities register themselves when placed and report every tile change,
+    so "who is standing here" is a dictionary lookup instead of a scan over
+    every entity.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        self.size = maze.size
+        self.cells = {}  # cell id -> list of entities on that tile (kept once empty, for reuse)
+        self.crowded = set()  # cell ids with two or more entities, i.e. possible collisions
+
+    def add(self, entity):
+        """Register an entity on its current tile"""
+        entity.occupancy = self
+        self._place(entity, entity.grid_y * self.size + entity.grid_x)
+
+    def remove(self, entity):
+        """Forget an entity (collected, or finished dying)"""
+        self._discard(entity, entity.grid_x, entity.grid_y)
+        entity.occupancy = None
+
+    def move(self, entity, old_x, old_y):
+        """Move an entity's entry from (old_x, old_y) to its current tile"""
+        self._discard(entity, old_x, old_y)
+        self._place(entity, entity.grid_y * self.size + entity.grid_x)
+
+    def _place(self, entity, cell):
+        occupants = self.cells.get(cell)
+        if occupants is None:
+            occupants = self.cells[cell] = []
+        occupants.append(entity)
+        if len(occupants) == 2:
+            self.crowded.add(cell)
+
+    def _discard(self, entity, x, y):
+        cell = y * self.size + x
+        occupants = self.cells.get(cell)
+        if occupants is None:
+            return
+        occupants.remove(entity)
+        if len(occupants) == 1:
+            self.crowded.discard(cell)
+
+    def at(self, x, y):
+        """Entities on tile (x, y), in the order they arrived"""
+        return self.cells.get(y * self.size + x, ())
+
+    def crowded_entities(self):
+        """Every entity sharing its tile with another one"""
+        return [entity for cell in self.crowded for entity in self.cells[cell]]
+
+    def is_free(self, x, y):
+        """Check whether no entity stands on tile (x, y)"""
+        return not self.cells.get(y * self.size + x)
+
+    def random_free_position(self, rng, attempts=32):
+        """Pick a uniformly random free walkable tile, or None if there is none.
+
+        Rejection sampling over the maze's walkable index is exact and cheap
+        while the maze is mostly empty; crowded mazes fall back to drawing
+        from the explicit set of free cells.
+        """
+        for _ in range(attempts):
+            pos = self.maze.get_random_walkable_position(rng)
+            if self.is_free(pos[0], pos[1]):
+                return pos
+
+        occupied = numpy.fromiter((cell for cell, occupants in self.cells.items() if occupants), dtype=numpy.int64)
+        free_cells = numpy.setdiff1d(self.maze.walkable_cells, occupied)
+        if len(free_cells) == 0:
+            return None
+        cell = int(free_cells[rng.randrange(len(free_cells))])
+        return cell % self.size, cell // self.size
@@ -0,0 +1,189 @@
+"""Per-frame timings (or allocations) of the game loop, for the profiler overlay.
+
+The game loop and the simulation charge their phases to the sections
+below. Everything is skipped while the profiler is disabled: the loop
+checks `enabled` and the simulation only calls a profiler it was given.
+"""
+import csv
+import gc
+import time
+import tracemalloc
+from collections import deque
+from game.constants import FPS, PROFILER_WINDOW
+
+# Game loop phases, in the order they run
+SECTIONS = ('events', 'pacman_timer', 'entities', 'ai', 'collisions', 'render', 'flip')
+SUMMARY_INTERVAL = 15  # frames between percentile refreshes, so the overlay text stays readable
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Section timings of the last `window` frames.
+
+    mark() starts timing, lap(section) charges the time since the last
+    mark() or lap() to that section of the current frame, and end_frame()
+    closes the frame. A frame's total runs from one end_frame() to the
+    next, so it includes waiting for the frame cap. Garbage collector runs
+    are counted while enabled, as their pauses show up as frame spikes.
+    """
+    unit = 'ms'
+    graph_max = 50  # Frame value at the top of the overlay graph
+    budget = 1000 / FPS  # Frame value drawn as the overlay's budget line
+    csv_prefix = 'frame-profile'
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.enabled = False
+        self.frames = deque(maxlen=window)  # (frame ms, ms per section...) per frame
+        self.frame_count = 0  # Frames recorded since enabled
+        self.summary = None  # Percentiles over the window, refreshed every SUMMARY_INTERVAL frames
+        self._current = dict.fromkeys(SECTIONS, 0.0)
+        self._last = 0.0
+        self._frame_start = None
+        self.gc_collections = 0  # Collector runs since enabled
+        self.gc_longest_ms = 0.0
+        self._gc_start = None
+
+    def toggle(self):
+        """Switch recording on or off, starting from an empty window; returns whether enabled"""
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.frame_count = 0
+        self.summary = None
+        self._frame_start = None
+        self._current = dict.fromkeys(SECTIONS, 0.0)
+        self.gc_collections = 0
+        self.gc_longest_ms = 0.0
+        if self.enabled:
+            gc.callbacks.append(self._on_gc)
+        else:
+            gc.callbacks.remove(self._on_gc)
+        self._last = time.perf_counter()
+        return self.enabled
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc_collections += 1
+            self.gc_longest_ms = max(self.gc_longest_ms, (time.perf_counter() - self._gc_start) * 1000)
+            self._gc_start = None
+
+    def status(self):
+        """One line on garbage collection since enabled, for the overlay"""
+        return f"GC: {self.gc_collections} collections, longest {self.gc_longest_ms:.2f} ms"
+
+    def mark(self):
+        """Start timing the next section"""
+        self._last = time.perf_counter()
+
+    def lap(self, section):
+        """Charge the time since the last mark() or lap() to section"""
+        now = time.perf_counter()
+        self._current[section] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        """Record the current frame into the window"""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._record((now - self._frame_start) * 1000)
+        self._frame_start = now
+        self._current = dict.fromkeys(SECTIONS, 0.0)
+
+    def _record(self, total):
+        """Add a frame with this total and the current section values to the window"""
+        current = self._current
+        self.frames.append((total,) + tuple(current[s] for s in SECTIONS))
+        self.frame_count += 1
+        if self.summary is None or self.frame_count % SUMMARY_INTERVAL == 0:
+            self.summary = self._summarize()
+
+    def frame_times(self):
+        """Total of each frame in the window (in `unit`), oldest first"""
+        return [frame[0] for frame in self.frames]
+
+    def _summarize(self):
+        """{'frame' or section: (p50, p95, p99)} over the window"""
+        summary = {}
+        for i, name in enumerate(('frame',) + SECTIONS):
+            values = sorted(frame[i] for frame in self.frames)
+            summary[name] = tuple(_percentile(values, f) for f in (0.5, 0.95, 0.99))
+        return summary
+
+    def dump_csv(self, path=None):
+        """Write the window as CSV (one row per frame, `unit` per column); returns the path"""
+        path = path or time.strftime(f'{self.csv_prefix}-%Y%m%d-%H%M%S.csv')
+        first = self.frame_count - len(self.frames)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            unit = self.unit.lower()
+            writer.writerow(['frame', f'frame_{unit}'] + [f'{s}_{unit}' for s in SECTIONS])
+            for i, frame in enumerate(self.frames):
+                writer.writerow([first + i] + [f'{ms:.3f}' for ms in frame])
+        return path
+
+
+class AllocationProfiler(FrameProfiler):
+    """FrameProfiler that charges KiB allocated instead of milliseconds.
+
+    Allocations are traced with tracemalloc, which only runs while the
+    profiler is enabled (it slows everything down). Each lap() charges its
+    section with how far traced memory peaked above where it stood at the
+    previous mark() or lap(): what the section kept plus its largest burst
+    of temporaries. A frame's total also counts the stretches between
+    sections, so everything allocated in the frame lands somewhere.
+    """
+    unit = 'KiB'
+    graph_max = 64
+    budget = 1  # A steady-state frame allocates next to nothing
+    csv_prefix = 'alloc-profile'
+
+    def __init__(self, window=PROFILER_WINDOW):
+        super().__init__(window)
+        self._between = 0.0  # KiB allocated outside any section this frame
+        self._started_tracing = False
+
+    def toggle(self):
+        enabled = super().toggle()
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not enabled and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._between = 0.0
+        self._rebase()
+        return enabled
+
+    def _rebase(self):
+        """Measure from the current traced size, charging nobody"""
+        self._last = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def _charge(self):
+        """KiB traced memory peaked above its level at the last measurement"""
+        current, peak = tracemalloc.get_traced_memory()
+        allocated = (peak - self._last) / 1024
+        self._last = current
+        tracemalloc.reset_peak()
+        return allocated
+
+    def mark(self):
+        self._between += self._charge()
+
+    def lap(self, section):
+        self._current[section] += self._charge()
+
+    def end_frame(self):
+        self.mark()  # The rest of the frame, e.g. waiting for the frame cap
+        if self._frame_start is not None:
+            self._record(self._between + sum(self._current.values()))
+        self._frame_start = True
+        self._between = 0.0
+        self._current = dict.fromkeys(SECTIONS, 0.0)
+        self._rebase()  # Recording the frame isn't the next frame's doing
@@ -0,0 +1,193 @@
+"""Match recordings and fast, seekable replays.
+
+A match is fully determined by its seed, the seed and requested size of
+its maze, its settings and tick length, and what happened from outside the
+simulation: the player's moves, and the ticks where the AI frame budget
+cut decisions short. A recording stores just those, as one little-endian
+file:
+
+    header       magic b'PGRC', version, tick ms, match seed, maze seed,
+                 requested maze size (0: random), AI ghosts, PacMan cap,
+                 ticks played, event count
+    events       (tick, kind, value) records in tick order: a player move
+                 (value: DIRECTIONS index) applied before that tick, or an
+                 AI cutoff (value: decisions made) during it
+
+Replayer re-runs a recording without a display as fast as it can, keeping
+a snapshot of the match every KEYFRAME_INTERVAL ticks, so seeking to any
+tick re-simulates at most one interval.
+"""
+import os
+import random
+import struct
+from game.constants import KEYFRAME_INTERVAL, SIMULATION_TICK, MAX_PACMANS
+from game.maze import Maze
+from game.simulation import Simulation
+from game.ai.pathfinding import DIRECTIONS
+
+MAGIC = b'PGRC'
+VERSION = 1
+MOVE = 0
+AI_CUTOFF = 1
+_HEADER = struct.Struct('<4sHHQQHIHII')
+_EVENT = struct.Struct('<IHH')
+
+
+class Recording:
+    """Everything needed to play a match again"""
+    def __init__(self, seed, maze_seed, maze_size=None, ai_ghosts=9, max_pacmans=MAX_PACMANS,
+                 tick=SIMULATION_TICK):
+        self.seed = seed
+        self.maze_seed = maze_seed
+        self.maze_size = maze_size  # As requested; None means the maze seed picked it
+        self.ai_ghosts = ai_ghosts
+        self.max_pacmans = max_pacmans
+        self.tick = tick  # ms per simulation step
+        self.ticks = 0  # Steps played
+        self.events = []  # (tick, kind, value) in tick order
+
+    def new_simulation(self):
+        """The match as it was before its first tick"""
+        maze = Maze(random.Random(self.maze_seed), self.maze_size)
+        return Simulation(seed=self.seed, ai_ghosts=self.ai_ghosts, max_pacmans=self.max_pacmans, maze=maze)
+
+    def save(self, path):
+        """Write the recording to path"""
+        data = bytearray(_HEADER.pack(MAGIC, VERSION, self.tick, self.seed, self.maze_seed,
+                                      self.maze_size or 0, self.ai_ghosts, self.max_pacmans,
+                                      self.ticks, len(self.events)))
+        for event in self.events:
+            data += _EVENT.pack(*event)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path):
+        """Read a recording written by save(); raises ValueError for anything else"""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path}: not a match recording")
+        (magic, version, tick, seed, maze_seed, maze_size, ai_ghosts, max_pacmans,
+         ticks, event_count) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a match recording")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported recording version {version}")
+        if len(data) < _HEADER.size + event_count * _EVENT.size:
+            raise ValueError(f"{path}: truncated match recording")
+
+        recording = cls(seed, maze_seed, maze_size or None, ai_ghosts, max_pacmans, tick)
+        recording.ticks = ticks
+        recording.events = list(_EVENT.iter_unpack(data[_HEADER.size:_HEADER.size + event_count * _EVENT.size]))
+        return recording
+
+
+class Recorder:
+    """Builds the Recording of a match as it is played.
+
+    The game reports each player move as it is made and calls tick_done()
+    after every simulation step.
+    """
+    def __init__(self, simulation, ai_ghosts, maze_size=None, tick=SIMULATION_TICK):
+        if simulation.maze.seed is None:
+            raise ValueError("only matches on a seeded maze can be recorded")
+        self.simulation = simulation
+        self.recording = Recording(simulation.seed, simulation.maze.seed, maze_size, ai_ghosts,
+                                   simulation.spawn_timer.max_pacmans, tick)
+
+    def record_move(self, dx, dy):
+        """Log a player move, made before the next tick"""
+        if (dx, dy) in DIRECTIONS:
+            self.recording.events.append((self.recording.ticks, MOVE, DIRECTIONS.index((dx, dy))))
+
+    def tick_done(self):
+        """Count a simulation step, noting whether the AI budget cut it short"""
+        scheduler = self.simulation.ai_scheduler
+        if scheduler is not None and scheduler.cutoff is not None:
+            self.recording.events.append((self.recording.ticks, AI_CUTOFF, scheduler.cutoff))
+        self.recording.ticks += 1
+
+    def save(self, directory):
+        """Write the recording into directory, named after the match seed; returns the path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'match-{self.recording.seed:016x}.pgr')
+        self.recording.save(path)
+        return path
+
+
+class Replayer:
+    """Plays a Recording back headlessly, with keyframes for seeking.
+
+    `simulation` is the match as of `tick` steps in.
+    """
+    def __init__(self, recording, keyframe_interval=KEYFRAME_INTERVAL):
+        self.recording = recording
+        self.keyframe_interval = keyframe_interval
+        self.moves = {}  # tick -> [(dx, dy), ...]
+        self.cutoffs = {}  # tick -> AI decisions made
+        for tick, kind, value in recording.events:
+            if kind == MOVE:
+                self.moves.setdefault(tick, []).append(DIRECTIONS[value])
+            elif kind == AI_CUTOFF:
+                self.cutoffs[tick] = value
+
+        self.simulation = recording.new_simulation()
+        self.tick = 0
+        self.keyframes = {0: self.simulation.snapshot()}  # tick -> snapshot, every keyframe_interval ticks
+
+    def step(self):
+        """Play the next recorded tick"""
+        simulation = self.simulation
+        for dx, dy in self.moves.get(self.tick, ()):
+            simulation.move_player(dx, dy)
+        if simulation.ai_scheduler is not None:
+            simulation.ai_scheduler.decision_limit = self.cutoffs.get(self.tick)
+        simulation.update(self.recording.tick)
+        self.tick += 1
+
+        if self.tick % self.keyframe_interval == 0 and self.tick not in self.keyframes:
+            self.keyframes[self.tick] = simulation.snapshot()
+
+    def run(self, until=None):
+        """Play up to tick until (default: the end of the recording); returns the simulation"""
+        end = self.recording.ticks if until is None else min(until, self.recording.ticks)
+        while self.tick < end:
+            self.step()
+        return self.simulation
+
+    def seek(self, tick):
+        """Jump to tick, from the nearest keyframe at or before it; returns the simulation"""
+        tick = max(0, min(tick, self.recording.ticks))
+        base = tick - tick % self.keyframe_interval
+        if base in self.keyframes and not base <= self.tick <= tick:
+            # Copy the keyframe so it can be restored again later
+            self.simulation = self.keyframes[base].snapshot()
+            self.tick = base
+        return self.run(tick)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Pac-Ghost match without rendering")
+    parser.add_argument('recording', help="a .pgr file written by main.py --record")
+    parser.add_argument('--seek', type=int, default=None, help="stop at this tick instead of the end")
+    parser.add_argument('--keyframe-interval', type=int, default=KEYFRAME_INTERVAL,
+                        help="ticks between keyframes")
+    args = parser.parse_args(argv)
+
+    recording = Recording.load(args.recording)
+    start = time.perf_counter()
+    replayer = Replayer(recording, args.keyframe_interval)
+    simulation = replayer.seek(recording.ticks if args.seek is None else args.seek)
+    elapsed = time.perf_counter() - start
+
+    game_time = replayer.tick * recording.tick
+    print(f"Replayed {replayer.tick}/{recording.ticks} ticks ({game_time / 1000:.1f}s of play) "
+          f"in {elapsed:.2f}s, {len(replayer.keyframes)} keyframes")
+    print(f"  standing: {simulation.alive_ghost_count()}, winner: {simulation.winner_index()}, "
+          f"levels: {[g.level for g in simulation.ghosts]}, kills: {simulation.kills}")
+    return simulation
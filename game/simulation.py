@@ -0,0 +1,335 @@
+import copy
+import random
+from game import metrics
+from game.constants import BLUE, PACMAN_SPAWN_TIME, MAX_PACMANS, SIMULATION_TICK
+from game.maze import Maze
+from game.entities.ghost import Ghost
+from game.entities.pacman import PacMan
+from game.entities.store import EntityStore
+from game.ai.ghost_ai import GhostAI
+from game.ai.scheduler import AIScheduler
+from game.ai.flow_field import FlowFieldService
+from game.occupancy import OccupancyIndex
+from utils.helpers import get_random_color
+
+TICKS = metrics.counter('pacghost_simulation_ticks_total', "Simulation steps run")
+COLLISIONS_CHECKED = metrics.counter('pacghost_collisions_checked_total',
+                                     "Ghosts on shared tiles checked for collisions")
+PACMANS_SPAWNED = metrics.counter('pacghost_pacmans_spawned_total', "PacMans spawned")
+PACMANS_SKIPPED_CAP = metrics.counter('pacghost_pacmans_skipped_cap_total',
+                                      "PacMan spawns skipped because the PacMan cap was reached")
+PACMANS_SKIPPED_FULL = metrics.counter('pacghost_pacmans_skipped_full_total',
+                                       "PacMan spawns skipped because no tile was free")
+PACMANS_EATEN = metrics.counter('pacghost_pacmans_eaten_total', "PacMans collected by ghosts")
+ELIMINATIONS = metrics.counter('pacghost_ghost_eliminations_total',
+                               "Ghosts eliminated in ghost-ghost collisions")
+GHOSTS_STANDING = metrics.gauge('pacghost_ghosts_standing', "Ghosts alive and not dying in the latest match")
+
+
+class LogicalClock:
+    """Millisecond clock that only moves when the simulation advances it"""
+    def __init__(self, start=0):
+        self.ticks = start
+
+    def get_ticks(self):
+        """Return the current logical time in milliseconds"""
+        return self.ticks
+
+    def advance(self, dt):
+        """Move the clock forward by dt milliseconds"""
+        self.ticks += dt
+
+
+class SpawnTimer:
+    def __init__(self, max_pacmans=MAX_PACMANS):
+        self.spawn_time = PACMAN_SPAWN_TIME  # ms
+        self.max_pacmans = max_pacmans
+        self.timer = 0
+        self.pacman_count = 0
+
+    def update(self, dt):
+        """Update the PacMan spawn timer"""
+        self.timer += dt
+
+        # Reset timer when it reaches spawn time
+        if self.timer >= self.spawn_time:
+            self.timer = 0
+            return True
+
+        return False
+
+    def increment_count(self):
+        """Increment the PacMan count"""
+        if self.pacman_count < self.max_pacmans:
+            self.pacman_count += 1
+            return True
+        return False
+
+    def decrement_count(self):
+        """Decrement the PacMan count"""
+        if self.pacman_count > 0:
+            self.pacman_count -= 1
+            return True
+        return False
+
+
+class Simulation:
+    """Headless match state: maze, ghosts, PacMans, AI and collisions.
+
+    Time only moves through update()/step(), so a match can run at real
+    time under the pygame loop or as fast as possible without a display.
+    """
+    def __init__(self, clock=None, ai_player=False, ai_ghosts=9, seed=None, maze_size=None,
+                 max_pacmans=MAX_PACMANS, scheduled_ai=True, ai_budget=None, maze=None):
+        self.clock = clock or LogicalClock()
+        self.spawn_timer = SpawnTimer(max_pacmans)
+        
+        # Per-match RNG: the same seed replays the same match
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Optional hooks for presentation (sounds etc.)
+        self.on_pickup = None
+        self.on_elimination = None
+        self.profiler = None  # Profiler measuring each phase, while the overlay is on
+
+        # Create maze (random size unless given, e.g. for large arenas),
+        # unless a pre-generated one is passed in
+        self.maze = maze or Maze(self.rng, maze_size)
+        self.flow_fields = FlowFieldService(self.maze)
+        self.occupancy = OccupancyIndex(self.maze)
+
+        # Entity state lives in one array store per kind, updated in bulk
+        self.ghost_store = EntityStore(capacity=ai_ghosts + 1)
+        self.pacman_store = EntityStore(capacity=max(max_pacmans, 1) * 4, movable=False)
+
+        # Create player ghost
+        player_pos = self.maze.get_random_walkable_position(self.rng)
+        self.player = Ghost(player_pos[0], player_pos[1], BLUE, is_player=True, store=self.ghost_store)
+        self.occupancy.add(self.player)
+        self.ghosts = self.ghost_store.views  # Every ghost, in store row order
+        self.ai_controllers = []
+        self.pacmans = []
+        self.pacmans_collected = False  # Set on pickups; the next update drops them from self.pacmans
+
+        # In all-AI matches the player ghost is driven by the AI as well
+        if ai_player:
+            self.ai_controllers.append(GhostAI(self.player, self.maze, self.clock, self.rng, self.flow_fields))
+
+        # Create AI ghosts
+        for _ in range(ai_ghosts):
+            # Find position not occupied by another ghost
+            pos = self.occupancy.random_free_position(self.rng)
+            if pos is None:
+                break  # Maze is full
+
+            # Create ghost with random color (not blue)
+            ghost = Ghost(pos[0], pos[1], get_random_color(exclude_color=BLUE, rng=self.rng), store=self.ghost_store)
+            self.occupancy.add(ghost)
+
+            # Create AI controller for this ghost
+            ai = GhostAI(ghost, self.maze, self.clock, self.rng, self.flow_fields)
+            self.ai_controllers.append(ai)
+
+        # Staggered, optionally time-budgeted AI decisions; without a scheduler
+        # every controller decides on its own interval (all in the same tick)
+        self.ai_scheduler = None
+        if scheduled_ai and self.ai_controllers:
+            self.ai_scheduler = AIScheduler(self.ai_controllers, budget_ms=ai_budget)
+
+        # Collision order follows self.ghosts
+        self.ghost_order = {ghost: i for i, ghost in enumerate(self.ghosts)}
+
+        # Match statistics, indexed like self.ghosts
+        GHOSTS_STANDING.set(len(self.ghosts))
+        self.kills = [0] * len(self.ghosts)
+        self.level_log = []  # (time ms, ghost index, new level)
+
+    def move_player(self, dx, dy):
+        """Queue a one-tile move for the player ghost"""
+        return self.player.move(dx, dy, self.maze)
+
+    def snapshot(self):
+        """Independent copy of the whole match state, e.g. a replay keyframe.
+
+        The maze and its search structures never change during a match (its
+        vision query only holds scratch buffers), so copies share those
+        instead of duplicating them.
+        """
+        shared = [self.maze, self.maze._graph, self.maze._distance_oracle, self.maze._vision, self.profiler]
+        memo = {id(obj): obj for obj in shared if obj is not None}
+        return copy.deepcopy(self, memo)
+
+    def step(self):
+        """Advance the match by one fixed simulation tick"""
+        self.update(SIMULATION_TICK)
+
+    def run(self, max_time=None):
+        """Step until the match is over or max_time ms have elapsed"""
+        start_time = self.clock.get_ticks()
+        while not self.is_over():
+            if max_time is not None and self.clock.get_ticks() - start_time >= max_time:
+                break
+            self.step()
+
+    def update(self, dt):
+        """Advance the match by dt milliseconds"""
+        profiler = self.profiler
+        if profiler:
+            profiler.mark()
+        self.clock.advance(dt)
+
+        # Update PacMan timer
+        if self.spawn_timer.update(dt):
+            # Spawn new PacMan if we haven't reached the cap
+            if self.spawn_timer.increment_count():
+                self._spawn_pacman()
+            else:
+                PACMANS_SKIPPED_CAP.inc()
+        if profiler:
+            profiler.lap('pacman_timer')
+
+        # Update entities
+        self.ghost_store.update(dt)
+
+        # Clean up collected PacMans and the flow fields toward them (only
+        # after a pickup, so a steady tick doesn't rebuild any lists)
+        if self.pacmans_collected:
+            self.pacmans_collected = False
+            self.pacmans = [p for p in self.pacmans if p.active]
+            self.flow_fields.retain([(p.grid_x, p.grid_y) for p in self.pacmans])
+
+        self.pacman_store.update(dt)
+        if profiler:
+            profiler.lap('entities')
+
+        # Update AI
+        if self.ai_scheduler:
+            self.ai_scheduler.update(self.pacmans, self.ghosts)
+        else:
+            for ai in self.ai_controllers:
+                ai.update(self.pacmans, self.ghosts)
+        if profiler:
+            profiler.lap('ai')
+
+        # Check collisions
+        self._check_collisions()
+        if profiler:
+            profiler.lap('collisions')
+        TICKS.inc()
+
+    def alive_ghost_count(self):
+        """Count ghosts that are alive and not in their death animation"""
+        return self.ghost_store.standing_count()
+
+    def player_alive(self):
+        """Check whether the player ghost is still in the match"""
+        return self.player.alive and not self.player.dying
+
+    def is_over(self):
+        """The match ends when at most one ghost is left standing"""
+        return self.alive_ghost_count() <= 1
+
+    def winner_index(self):
+        """Index in self.ghosts of the last ghost standing, or None"""
+        if not self.is_over():
+            return None
+        for i, ghost in enumerate(self.ghosts):
+            if ghost.alive and not ghost.dying:
+                return i
+        return None
+
+    def _spawn_pacman(self):
+        """Spawn a new PacMan at a random position"""
+        # Find position not occupied by another entity
+        pos = self.occupancy.random_free_position(self.rng)
+        if pos is None:
+            self.spawn_timer.decrement_count()  # No room, skip this spawn
+            PACMANS_SKIPPED_FULL.inc()
+            return
+
+        # Create PacMan
+        pacman = PacMan(pos[0], pos[1], store=self.pacman_store)
+        self.occupancy.add(pacman)
+        self.pacmans.append(pacman)
+        PACMANS_SPAWNED.inc()
+
+    def _check_collisions(self):
+        """Check for collisions between entities sharing a tile"""
+        occupancy = self.occupancy
+        if not occupancy.crowded:
+            return  # Nobody shares a tile
+
+        # Only ghosts sharing a tile can collide; visit them in self.ghosts order
+        candidates = sorted((o for o in occupancy.crowded_entities() if isinstance(o, Ghost)),
+                            key=self.ghost_order.get)
+        COLLISIONS_CHECKED.inc(len(candidates))
+
+        # Check ghost-pacman collisions
+        for ghost in candidates:
+            if not ghost.alive or ghost.dying:
+                continue
+            i = self.ghost_order[ghost]
+
+            occupants = occupancy.at(ghost.grid_x, ghost.grid_y)
+            if len(occupants) < 2:
+                continue  # Alone on the tile
+
+            for pacman in [o for o in occupants if isinstance(o, PacMan)]:
+                if not pacman.active:
+                    continue
+
+                # Ghost eats PacMan
+                pacman.collect()
+                self.pacmans_collected = True
+                PACMANS_EATEN.inc()
+                ghost.level_up()
+                self.spawn_timer.decrement_count()
+                self.level_log.append((self.clock.get_ticks(), i, ghost.level))
+
+                if self.on_pickup:
+                    self.on_pickup(ghost, pacman)
+
+        # Check ghost-ghost collisions
+        for ghost1 in candidates:
+            if not ghost1.alive or ghost1.dying:
+                continue
+            i = self.ghost_order[ghost1]
+
+            occupants = occupancy.at(ghost1.grid_x, ghost1.grid_y)
+            if len(occupants) < 2:
+                continue
+
+            # Pair with later ghosts on the same tile, in self.ghosts order
+            rivals = [o for o in occupants if isinstance(o, Ghost) and self.ghost_order[o] > i]
+            rivals.sort(key=self.ghost_order.get)
+
+            for ghost2 in rivals:
+                if not ghost2.alive or ghost2.dying:
+                    continue
+                j = self.ghost_order[ghost2]
+
+                # Higher level ghost eliminates lower level
+                if ghost1.level > ghost2.level:
+                    ghost2.start_death()
+                    self._eliminated(i, [ghost2])
+                elif ghost2.level > ghost1.level:
+                    ghost1.start_death()
+                    self._eliminated(j, [ghost1])
+                else:
+                    # Equal levels, both die
+                    ghost1.start_death()
+                    ghost2.start_death()
+                    self._eliminated(None, [ghost1, ghost2])
+
+    def _eliminated(self, winner_index, losers):
+        """Record a ghost-ghost elimination and report it to the presentation layer"""
+        ELIMINATIONS.inc(len(losers))
+        GHOSTS_STANDING.set(self.alive_ghost_count())
+        winner = None
+        if winner_index is not None:
+            winner = self.ghosts[winner_index]
+            self.kills[winner_index] += len(losers)
+
+        if self.on_elimination:
+            self.on_elimination(winner, losers)
@@ -0,0 +1,125 @@
+import pygame
+from game.constants import TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, CHUNK_TILES, CAMERA_ZOOM_LEVELS, CAMERA_DEAD_ZONE
+from utils.helpers import calculate_offset
+
+
+class Camera:
+    """Viewport onto the maze that follows one entity.
+
+    Mazes that fit in the view at the current zoom stay centred as before;
+    larger ones scroll with the followed entity, clamped to the maze edges.
+    The view only re-centres once the entity leaves a dead zone around its
+    centre, so most frames keep the same offset and need no full redraw.
+    The maze is drawn from the chunks under the view, and entities outside
+    it are culled.
+    """
+    def __init__(self, maze, view=None, zoom=1.0):
+        self.maze = maze
+        self.view = pygame.Rect(view or (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.zoom = zoom
+        self.tile_size = int(TILE_SIZE * zoom)
+        self.offset_x = 0  # Screen position of the maze's top-left corner
+        self.offset_y = 0
+        self.followed_zoom = None  # Zoom at the last follow()
+        self.anchor_x = 0  # World pixel the view is centred on, kept while the focus is in the dead zone
+        self.anchor_y = 0
+        self.scaled_sprites = {}  # sprite -> copy scaled to the current zoom
+
+    def set_zoom(self, zoom):
+        """Switch zoom level; scaled sprites are redrawn on demand"""
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
+        self.tile_size = int(TILE_SIZE * zoom)
+        self.scaled_sprites.clear()
+
+    def zoom_in(self):
+        """Step to the next larger zoom level"""
+        larger = [z for z in CAMERA_ZOOM_LEVELS if z > self.zoom]
+        if larger:
+            self.set_zoom(larger[0])
+
+    def zoom_out(self):
+        """Step to the next smaller zoom level"""
+        smaller = [z for z in CAMERA_ZOOM_LEVELS if z < self.zoom]
+        if smaller:
+            self.set_zoom(smaller[-1])
+
+    def follow(self, position):
+        """Centre the view on a tile-sized thing at world pixel position, or on the maze for None.
+
+        Returns True when the maze moved on screen, i.e. everything drawn
+        last frame is stale.
+        """
+        world_size = self.maze.size * self.tile_size
+        if position is None:
+            focus_x = focus_y = world_size // 2
+        else:
+            focus_x = int(position[0] * self.zoom) + self.tile_size // 2
+            focus_y = int(position[1] * self.zoom) + self.tile_size // 2
+
+        if position is None or self.zoom != self.followed_zoom:
+            self.anchor_x, self.anchor_y = focus_x, focus_y
+        else:
+            self.anchor_x = self._axis_anchor(focus_x, self.anchor_x, self.view.width)
+            self.anchor_y = self._axis_anchor(focus_y, self.anchor_y, self.view.height)
+
+        center_x, center_y = calculate_offset(self.maze.size, self.tile_size, self.view.width, self.view.height)
+        offset_x = self.view.x + self._axis_offset(self.anchor_x, world_size, self.view.width, center_x)
+        offset_y = self.view.y + self._axis_offset(self.anchor_y, world_size, self.view.height, center_y)
+
+        moved = (offset_x, offset_y, self.zoom) != (self.offset_x, self.offset_y, self.followed_zoom)
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.followed_zoom = self.zoom
+        return moved
+
+    def _axis_anchor(self, focus, anchor, view_size):
+        """Keep the view's centre along one axis until the focus leaves the dead zone"""
+        if abs(focus - anchor) <= int(view_size * CAMERA_DEAD_ZONE) // 2:
+            return anchor
+        return focus
+
+    def _axis_offset(self, focus, world_size, view_size, centered):
+        """Maze offset along one axis: centred if it fits, else scrolled to focus"""
+        if world_size <= view_size:
+            return centered
+        return -max(0, min(focus - view_size // 2, world_size - view_size))
+
+    def to_screen(self, pixel_x, pixel_y):
+        """Screen position of a world pixel position"""
+        return int(pixel_x * self.zoom) + self.offset_x, int(pixel_y * self.zoom) + self.offset_y
+
+    def is_visible(self, x, y, width, height):
+        """Check whether a screen rect overlaps the view"""
+        view = self.view
+        return x < view.right and y < view.bottom and x + width > view.x and y + height > view.y
+
+    def scale(self, sprite):
+        """Return the sprite scaled to the current zoom"""
+        if self.zoom == 1.0:
+            return sprite
+        scaled = self.scaled_sprites.get(sprite)
+        if scaled is None:
+            size = (int(sprite.get_width() * self.zoom), int(sprite.get_height() * self.zoom))
+            scaled = pygame.transform.smoothscale(sprite, size)
+            self.scaled_sprites[sprite] = scaled
+        return scaled
+
+    def background_blits(self, area):
+        """(chunk, dest, source area) blits that repaint the maze inside a screen rect"""
+        world = self.view.clip(area).move(-self.offset_x, -self.offset_y)
+        world = world.clip(pygame.Rect(0, 0, self.maze.size * self.tile_size, self.maze.size * self.tile_size))
+        if not world.width or not world.height:
+            return []
+
+        chunk_size = CHUNK_TILES * self.tile_size
+        blits = []
+        for chunk_y in range(world.top // chunk_size, (world.bottom - 1) // chunk_size + 1):
+            for chunk_x in range(world.left // chunk_size, (world.right - 1) // chunk_size + 1):
+                chunk = self.maze.get_chunk(chunk_x, chunk_y, self.tile_size)
+                chunk_rect = chunk.get_rect(topleft=(chunk_x * chunk_size, chunk_y * chunk_size))
+                part = chunk_rect.clip(world)
+                blits.append((chunk, (part.x + self.offset_x, part.y + self.offset_y),
+                              part.move(-chunk_rect.x, -chunk_rect.y)))
+        return blits
@@ -1,74 +1,120 @@
 import pygame
-from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLUE, MAZE_BLUE
+from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLUE, MAZE_BLUE, GREEN, YELLOW, RED
+from game.profiler import SECTIONS
+from game.ui.text import get_font, render_text
+
+PROFILER_GRAPH_HEIGHT = 50
 
 class HUD:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.SysFont('Arial', 24)
-        self.small_font = pygame.font.SysFont('Arial', 18)
+        self.font_size = 24
+        self.small_font_size = 18
+        self.font = get_font(self.font_size)
+        self.small_font = get_font(self.small_font_size)
+        
+        # Screen areas the HUD draws into, for partial redraws
+        line_height = self.font.get_linesize()
+        level_width = max(self.font.size("Your Level: 000")[0], self.font.size("Spectator Mode")[0])
+        self.regions = [
+            pygame.Rect(20, 20, level_width, line_height),
+            pygame.Rect(SCREEN_WIDTH - 150, 20, 150, line_height),
+            pygame.Rect(20, SCREEN_HEIGHT - 30, self.small_font.size("Controls: Arrow Keys or WASD")[0],
+                        self.small_font.get_linesize()),
+        ]
+        
+        # Profiler overlay: frame graph over per-section values and a GC line, bottom right
+        self.profiler_font_size = 15
+        self.profiler_line = get_font(self.profiler_font_size).get_linesize()
+        height = 16 + PROFILER_GRAPH_HEIGHT + self.profiler_line * (len(SECTIONS) + 3)
+        self.profiler_region = pygame.Rect(SCREEN_WIDTH - 330, SCREEN_HEIGHT - height - 10, 320, height)
+        self.profiler_panel = None
     
     def render(self, player_level, ghosts_alive, spectator_mode=False):
         """Render the HUD with game information"""
         # Player level
         if not spectator_mode:
-            level_text = self.font.render(f"Your Level: {player_level}", True, MAZE_BLUE)
+            level_text = render_text(f"Your Level: {player_level}", MAZE_BLUE, self.font_size)
             self.screen.blit(level_text, (20, 20))
         else:
-            spectator_text = self.font.render("Spectator Mode", True, MAZE_BLUE)
+            spectator_text = render_text("Spectator Mode", MAZE_BLUE, self.font_size)
             self.screen.blit(spectator_text, (20, 20))
         
         # Ghosts remaining
-        ghosts_text = self.font.render(f"Ghosts: {ghosts_alive}", True, WHITE)
+        ghosts_text = render_text(f"Ghosts: {ghosts_alive}", WHITE, self.font_size)
         self.screen.blit(ghosts_text, (SCREEN_WIDTH - 150, 20))
         
         # Controls reminder
         if not spectator_mode:
-            controls_text = self.small_font.render("Controls: Arrow Keys or WASD", True, WHITE)
+            controls_text = render_text("Controls: Arrow Keys or WASD", WHITE, self.small_font_size)
             self.screen.blit(controls_text, (20, SCREEN_HEIGHT - 30))
+    
+    def render_profiler(self, profiler):
+        """Draw the frame profiler: frame graph and p50/p95/p99 per section, in the profiler's unit"""
+        region = self.profiler_region
+        if self.profiler_panel is None:
+            self.profiler_panel = pygame.Surface(region.size, pygame.SRCALPHA)
+            self.profiler_panel.fill((0, 0, 0, 220))
+        self.screen.blit(self.profiler_panel, region.topleft)
+        x, y = region.x + 8, region.y + 8
+        line = self.profiler_line
+        size = self.profiler_font_size
+        
+        # Frame totals, newest on the right, against the frame budget
+        graph = pygame.Rect(x, y, region.width - 16, PROFILER_GRAPH_HEIGHT)
+        budget = profiler.budget
+        top = profiler.graph_max
+        budget_y = graph.bottom - int(graph.height * budget / top)
+        pygame.draw.line(self.screen, (90, 90, 90), (graph.left, budget_y), (graph.right - 1, budget_y))
+        times = profiler.frame_times()[-graph.width:]
+        if len(times) > 1:
+            worst = max(times)
+            color = GREEN if worst <= budget * 1.1 else YELLOW if worst <= budget * 2 else RED
+            scale = graph.height / top
+            left = graph.right - len(times)
+            points = [(left + i, graph.bottom - int(min(value, top) * scale)) for i, value in enumerate(times)]
+            pygame.draw.lines(self.screen, color, False, points)
+        y = graph.bottom + 4
+        
+        summary = profiler.summary
+        if summary is None:
+            self.screen.blit(render_text("Profiling...", WHITE, size), (x, y))
+            return
+        
+        # One row per section: name, then p50/p95/p99
+        columns = (x + 110, x + 175, x + 240)
+        rows = [("", ("p50", "p95", f"p99 {profiler.unit}"))]
+        for name in ('frame',) + SECTIONS:
+            rows.append((name, tuple(f"{value:.2f}" for value in summary[name])))
+        for name, values in rows:
+            if name:
+                self.screen.blit(render_text(name, YELLOW if name == 'frame' else WHITE, size), (x, y))
+            for column, value in zip(columns, values):
+                self.screen.blit(render_text(value, WHITE, size), (column, y))
+            y += line
+        self.screen.blit(render_text(profiler.status(), WHITE, size), (x, y))
 
 
 class PacManTimer:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.SysFont('Arial', 18)
-        self.spawn_time = 7000  # ms
-        self.max_pacmans = 4
-        self.timer = 0
-        self.pacman_count = 0
-    
-    def update(self, dt):
-        """Update the PacMan spawn timer"""
-        self.timer += dt
-        
-        # Reset timer when it reaches spawn time
-        if self.timer >= self.spawn_time:
-            self.timer = 0
-            return True
+        self.font_size = 18
+        self.bar_width = 150
+        self.bar_height = 15
         
-        return False
+        # Screen area covered by the label and bar, for partial redraws
+        self.region = pygame.Rect(SCREEN_WIDTH - self.bar_width - 20, 30, self.bar_width, 20 + self.bar_height)
     
-    def increment_count(self):
-        """Increment the PacMan count"""
-        if self.pacman_count < self.max_pacmans:
-            self.pacman_count += 1
-            return True
-        return False
+    def progress_width(self, spawn_timer):
+        """Width in pixels of the filled part of the bar"""
+        progress = min(spawn_timer.timer / spawn_timer.spawn_time, 1.0)
+        return int(self.bar_width * progress)
     
-    def decrement_count(self):
-        """Decrement the PacMan count"""
-        if self.pacman_count > 0:
-            self.pacman_count -= 1
-            return True
-        return False
-    
-    def render(self):
+    def render(self, spawn_timer):
         """Render the PacMan timer"""
-        # Calculate progress
-        progress = min(self.timer / self.spawn_time, 1.0)
-        
         # Draw timer bar
-        bar_width = 150
-        bar_height = 15
+        bar_width = self.bar_width
+        bar_height = self.bar_height
         x = SCREEN_WIDTH - bar_width - 20
         y = 50
         
@@ -76,12 +122,12 @@ class PacManTimer:
         pygame.draw.rect(self.screen, (50, 50, 50), (x, y, bar_width, bar_height))
         
         # Progress
-        progress_width = int(bar_width * progress)
+        progress_width = self.progress_width(spawn_timer)
         pygame.draw.rect(self.screen, (255, 255, 0), (x, y, progress_width, bar_height))
         
         # Border
         pygame.draw.rect(self.screen, WHITE, (x, y, bar_width, bar_height), 1)
         
         # Text
-        timer_text = self.font.render(f"PacMan: {self.pacman_count}/{self.max_pacmans}", True, WHITE)
+        timer_text = render_text(f"PacMan: {spawn_timer.pacman_count}/{spawn_timer.max_pacmans}", WHITE, self.font_size)
         self.screen.blit(timer_text, (x, y - 20))
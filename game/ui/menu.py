@@ -1,12 +1,13 @@
 import pygame
 from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLUE, BLACK, MAZE_BLACK, MAZE_BLUE
+from game.ui.text import render_text
 
 class Menu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.SysFont('Arial', 48)
-        self.font_medium = pygame.font.SysFont('Arial', 32)
-        self.font_small = pygame.font.SysFont('Arial', 24)
+        self.font_large_size = 48
+        self.font_medium_size = 32
+        self.font_small_size = 24
         
         # Menu options
         self.options = ['Start Game', 'Quit']
@@ -42,25 +43,25 @@ class Menu:
         self.screen.fill(MAZE_BLACK)  # Classic Pac-Man black background
         
         # Draw title
-        title = self.font_large.render('PAC-GHOST', True, MAZE_BLUE)  # Classic Pac-Man blue
+        title = render_text('PAC-GHOST', MAZE_BLUE, self.font_large_size)  # Classic Pac-Man blue
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
         self.screen.blit(title, title_rect)
         
         # Draw subtitle
-        subtitle = self.font_small.render('Battle Royale Edition', True, WHITE)
+        subtitle = render_text('Battle Royale Edition', WHITE, self.font_small_size)
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4 + 50))
         self.screen.blit(subtitle, subtitle_rect)
         
         # Draw menu options
         for i, option in enumerate(self.options):
             color = MAZE_BLUE if i == self.selected else WHITE  # Classic Pac-Man blue for selected
-            text = self.font_medium.render(option, True, color)
+            text = render_text(option, color, self.font_medium_size)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 50))
             self.screen.blit(text, text_rect)
         
         # Draw prompt
         if self.show_prompt:
-            prompt = self.font_small.render('Press ENTER to select', True, WHITE)
+            prompt = render_text('Press ENTER to select', WHITE, self.font_small_size)
             prompt_rect = prompt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4))
             self.screen.blit(prompt, prompt_rect)
 
@@ -69,9 +70,9 @@ class GameOverMenu:
     def __init__(self, screen, player_won):
         self.screen = screen
         self.player_won = player_won
-        self.font_large = pygame.font.SysFont('Arial', 48)
-        self.font_medium = pygame.font.SysFont('Arial', 32)
-        self.font_small = pygame.font.SysFont('Arial', 24)
+        self.font_large_size = 48
+        self.font_medium_size = 32
+        self.font_small_size = 24
         
         # Menu options
         self.options = ['Play Again', 'Quit']
@@ -108,21 +109,21 @@ class GameOverMenu:
         
         # Draw title
         if self.player_won:
-            title = self.font_large.render('YOU WIN!', True, MAZE_BLUE)  # Classic Pac-Man blue
+            title = render_text('YOU WIN!', MAZE_BLUE, self.font_large_size)  # Classic Pac-Man blue
         else:
-            title = self.font_large.render('GAME OVER', True, (255, 0, 0))
+            title = render_text('GAME OVER', (255, 0, 0), self.font_large_size)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
         self.screen.blit(title, title_rect)
         
         # Draw menu options
         for i, option in enumerate(self.options):
             color = MAZE_BLUE if i == self.selected else WHITE  # Classic Pac-Man blue for selected
-            text = self.font_medium.render(option, True, color)
+            text = render_text(option, color, self.font_medium_size)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + i * 50))
             self.screen.blit(text, text_rect)
         
         # Draw prompt
         if self.show_prompt:
-            prompt = self.font_small.render('Press ENTER to select', True, WHITE)
+            prompt = render_text('Press ENTER to select', WHITE, self.font_small_size)
             prompt_rect = prompt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4))
             self.screen.blit(prompt, prompt_rect)
@@ -0,0 +1,135 @@
+import pygame
+from game.constants import MAZE_BLACK
+
+
+class DirtyRectRenderer:
+    """Redraws only the parts of the play screen that changed.
+
+    Each frame the caller passes a function returning the background blits
+    for a screen rect (the camera's maze chunks), the entities to draw as
+    (key, sprite, position) in draw order and the HUD overlays as
+    (rect, state, draw) entries. Entities whose
+    position or sprite changed, and overlays whose state changed, mark their
+    old and new rects dirty; those rects get the background restored,
+    entities re-blitted in one Surface.blits batch and overlays redrawn
+    clipped to them. render() returns the dirty rects for
+    pygame.display.update, or None after a full redraw.
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.needs_full_redraw = True
+        self.entity_rects = {}  # entity key -> (rect, sprite) as last drawn
+        self._next_rects = {}  # Cleared and refilled each frame, then swapped with entity_rects
+        self.overlay_states = []
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (state change, new maze...)"""
+        self.needs_full_redraw = True
+
+    def render(self, background, entities, overlays):
+        """Draw a frame and return the changed rects, or None for a full redraw"""
+        current = self._next_rects
+        current.clear()
+        for key, sprite, (x, y) in entities:
+            current[key] = (pygame.Rect(int(x), int(y), sprite.get_width(), sprite.get_height()), sprite)
+
+        if self.needs_full_redraw:
+            self._render_full(background, entities, current, overlays)
+            return None
+
+        # Entities that appeared, moved, changed sprite or disappeared
+        dirty = []
+        for key, (rect, sprite) in current.items():
+            previous = self.entity_rects.get(key)
+            if previous is None:
+                dirty.append(rect)
+            elif previous[0] != rect or previous[1] is not sprite:
+                dirty.append(previous[0])
+                dirty.append(rect)
+        for key, (rect, _) in self.entity_rects.items():
+            if key not in current:
+                dirty.append(rect)
+
+        # Overlays whose displayed state changed
+        redraw = [i for i, (_, state, _) in enumerate(overlays)
+                  if i >= len(self.overlay_states) or self.overlay_states[i] != state]
+        dirty.extend(overlays[i][0] for i in redraw)
+
+        self._next_rects = self.entity_rects
+        self.entity_rects = current
+        self.overlay_states = [state for _, state, _ in overlays]
+        if not dirty:
+            return []
+
+        # Merge into disjoint on-screen rects (Surface.fill shifts rects that
+        # start off screen instead of clipping them); any overlay they touch
+        # is restored whole and drawn again on top
+        screen_rect = self.screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in self._merge(dirty) if rect.colliderect(screen_rect)]
+        if not dirty:
+            return []
+        while True:
+            touched = [i for i, (rect, _, _) in enumerate(overlays)
+                       if i not in redraw and rect.collidelist(dirty) != -1]
+            if not touched:
+                break
+            redraw.extend(touched)
+            dirty = self._merge(dirty + [overlays[i][0] for i in touched])
+
+        self._restore(background, dirty, entities, current)
+
+        for i in sorted(redraw):
+            rect, _, draw = overlays[i]
+            self.screen.set_clip(rect)
+            draw()
+        self.screen.set_clip(None)
+        return dirty
+
+    def _render_full(self, background, entities, current, overlays):
+        """Redraw the whole screen"""
+        self.screen.fill(MAZE_BLACK)
+        self.screen.blits(background(self.screen.get_rect()) +
+                          [(sprite, current[key][0].topleft) for key, sprite, _ in entities],
+                          doreturn=False)
+        # Clipped like partial redraws, so an overlay drawing several regions
+        # blends each of them exactly once
+        for rect, _, draw in overlays:
+            self.screen.set_clip(rect)
+            draw()
+        self.screen.set_clip(None)
+
+        self._next_rects = self.entity_rects
+        self.entity_rects = current
+        self.overlay_states = [state for _, state, _ in overlays]
+        self.needs_full_redraw = False
+
+    def _restore(self, background, dirty, entities, current):
+        """Repaint background and entities inside the dirty rects in one batch"""
+        batch = []
+        for area in dirty:
+            # Anything the background doesn't cover is plain black
+            self.screen.fill(MAZE_BLACK, area)
+            batch.extend(background(area))
+
+        # Entities are clipped to each rect so nothing is blended twice
+        for key, sprite, _ in entities:
+            rect = current[key][0]
+            for area in dirty:
+                clip = rect.clip(area)
+                if clip.width and clip.height:
+                    batch.append((sprite, clip.topleft, clip.move(-rect.x, -rect.y)))
+
+        self.screen.blits(batch, doreturn=False)
+
+    def _merge(self, rects):
+        """Union overlapping rects until the set is disjoint"""
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            while True:
+                hit = rect.collidelist(merged)
+                if hit == -1:
+                    break
+                rect.union_ip(merged.pop(hit))
+            merged.append(rect)
+        return merged
@@ -0,0 +1,36 @@
+import pygame
+from collections import OrderedDict
+
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept before the least recently used is dropped
+
+# Font registry: every (name, size, bold) is loaded once for the whole game
+_fonts = {}
+_text_cache = OrderedDict()
+
+
+def get_font(size, name='Arial', bold=False):
+    """Return the shared font object, loading it on first use"""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, color, size, name='Arial', bold=False):
+    """Return an antialiased surface for text, rasterizing it only on a cache miss.
+
+    Surfaces are shared between callers, so they must not be drawn on.
+    """
+    key = (name, size, bold, text, tuple(color))
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+
+    surface = get_font(size, name, bold).render(text, True, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
@@ -1,41 +1,122 @@
 #!/usr/bin/env python3
+import time
+STARTED = time.perf_counter()  # Before the heavy imports, for --profile-startup
+
 import pygame
 import sys
 from game.game import Game
-from game.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE
+from game.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, MAX_PACMANS, MIN_MAZE_SIZE, MAX_MAZE_SIZE, SIMULATION_TICK
+)
+
+IMPORTED = time.perf_counter()
+
+def parse_args(argv=None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--ghosts', type=int, default=9, help="AI ghosts per match")
+    parser.add_argument('--pacmans', type=int, default=MAX_PACMANS, help="most PacMans on the board at once")
+    parser.add_argument('--maze-size', type=int, default=None,
+                        help=f"maze width/height in tiles (default: random {MIN_MAZE_SIZE}-{MAX_MAZE_SIZE})")
+    parser.add_argument('--fps', type=int, default=FPS, help="frame rate cap (0: uncapped)")
+    parser.add_argument('--tick', type=int, default=SIMULATION_TICK,
+                        help="ms per simulation step; independent of --fps")
+    parser.add_argument('--record', metavar='DIR', default=None,
+                        help="save a replayable recording of every match into DIR (see replay.py)")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus metrics on this localhost port")
+    parser.add_argument('--profile-allocations', action='store_true',
+                        help="make the F3 profiler trace KiB allocated per phase instead of timing it")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print how long each startup phase takes to reach the menu, then exit")
+    return parser.parse_args(argv)
+
+def report_startup(phases):
+    """Print the startup phases as ms and the total time to menu"""
+    print("Startup profile:")
+    for name, ms in phases:
+        print(f"  {name:<12}{ms:>9.1f} ms")
+    print(f"  {'time to menu':<12}{sum(ms for name, ms in phases if name != 'deferred'):>9.1f} ms")
 
 def main():
-    # Initialize pygame
-    pygame.init()
+    args = parse_args()
+    
+    phases = [('imports', (IMPORTED - STARTED) * 1000)]
+    
+    # Initialize only what the menu needs; the mixer starts when sounds load
+    mark = time.perf_counter()
+    pygame.display.init()
+    pygame.font.init()
     pygame.display.set_caption(TITLE)
     
     # Create screen
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
+    phases.append(('init', (time.perf_counter() - mark) * 1000))
     
     # Create game instance
-    game = Game(screen)
+    mark = time.perf_counter()
+    game = Game(screen, ai_ghosts=args.ghosts, max_pacmans=args.pacmans, maze_size=args.maze_size,
+                tick=args.tick, record_dir=args.record, profile_allocations=args.profile_allocations)
+    phases.append(('game', (time.perf_counter() - mark) * 1000))
+    mark = time.perf_counter()
+    first_frame = True
     
-    # Main game loop
+    # Main game loop; the profiler measures each phase while its overlay is on
+    # (the simulation's phases are timed inside game.update)
+    profiler = game.profiler
     while True:
         # Handle events
+        if profiler.enabled:
+            profiler.mark()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                game.shutdown()
                 pygame.quit()
                 sys.exit()
             game.handle_event(event)
+        if profiler.enabled:
+            profiler.lap('events')
         
         # Update game state
         game.update()
         
         # Render game
-        game.render()
+        if profiler.enabled:
+            profiler.mark()
+        dirty_rects = game.render()
+        if profiler.enabled:
+            profiler.lap('render')
         
-        # Update display
-        pygame.display.flip()
+        # Update display: only the changed areas, unless the whole screen was redrawn
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        if profiler.enabled:
+            profiler.lap('flip')
+        
+        # The menu is up: now load what it didn't need
+        if first_frame:
+            phases.append(('first frame', (time.perf_counter() - mark) * 1000))
+            mark = time.perf_counter()
+            game.load_deferred()
+            if args.metrics_port is not None:
+                from game import metrics
+                metrics.REGISTRY.serve(args.metrics_port)
+            phases.append(('deferred', (time.perf_counter() - mark) * 1000))
+            first_frame = False
+            if args.profile_startup:
+                report_startup(phases)
+                game.shutdown()
+                pygame.quit()
+                return
         
-        # Cap the frame rate
-        clock.tick(FPS)
+        # Cap the frame rate (the simulation runs at its own fixed rate)
+        clock.tick(args.fps)
+        if profiler.enabled:
+            profiler.end_frame()
 
 if __name__ == "__main__":
     main()
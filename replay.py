@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+import os
+
+# Replays never open a window
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game.replay import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import os
+import random
+import pytest
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game.constants import DISTANCE_TABLE_MAX_CELLS
+from game.maze import Maze
+
+
+@pytest.fixture(scope='session')
+def maze():
+    """A seeded maze small enough for a distance oracle"""
+    maze = Maze(random.Random(7), 25)
+    assert maze.get_distance_oracle() is not None
+    return maze
+
+
+@pytest.fixture(scope='session')
+def large_maze():
+    """A seeded maze with more walkable cells than a distance oracle covers"""
+    maze = Maze(random.Random(7), 81)
+    assert len(maze.walkable_cells) > DISTANCE_TABLE_MAX_CELLS
+    return maze
+
+
+@pytest.fixture
+def sample_cells(maze):
+    """A fixed sample of the maze's walkable positions"""
+    rng = random.Random(1)
+    return [maze.get_random_walkable_position(rng) for _ in range(12)]
@@ -0,0 +1,35 @@
+"""Reference computations and checks shared by the tests"""
+
+
+def walk_distances(maze, start):
+    """Reference BFS: steps from start to every reachable (x, y), warping like the game does"""
+    distances = {start: 0}
+    queue = [start]
+    for x, y in queue:
+        for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)):
+            if maze.is_walkable(x + dx, y + dy):
+                landing = maze.get_warp_destination(x + dx, y + dy)
+                if landing not in distances:
+                    distances[landing] = distances[(x, y)] + 1
+                    queue.append(landing)
+    return distances
+
+
+def match_state(simulation):
+    """Everything a match's outcome depends on, as plain values"""
+    store = simulation.ghost_store
+    return (store.grid[:, :store.count].tolist(), store.pixel[:, :store.count].tolist(),
+            [ghost.level for ghost in simulation.ghosts], simulation.kills, simulation.level_log,
+            [(pacman.grid_x, pacman.grid_y) for pacman in simulation.pacmans], simulation.clock.get_ticks())
+
+
+def assert_shortest_path(maze, path, start, end):
+    """path (start included, as AStar.find_path returns it) walks from start to end in the fewest steps"""
+    assert path[0] == start
+    position = start
+    for x, y in path[1:]:
+        assert abs(x - position[0]) + abs(y - position[1]) == 1
+        assert maze.is_walkable(x, y)
+        position = maze.get_warp_destination(x, y)
+    assert position == end
+    assert len(path) - 1 == walk_distances(maze, start)[end]
@@ -0,0 +1,52 @@
+import random
+from game.ai.pathfinding import AStar, NO_CELL, warp_heuristic
+
+from tests.helpers import assert_shortest_path, walk_distances
+
+
+def test_paths_are_shortest(large_maze):
+    rng = random.Random(5)
+    astar = AStar(large_maze)
+    for _ in range(25):
+        start = large_maze.get_random_walkable_position(rng)
+        end = large_maze.get_random_walkable_position(rng)
+        assert_shortest_path(large_maze, astar.find_path(start, end), start, end)
+
+
+def test_warp_heuristic_is_consistent(large_maze):
+    graph = large_maze.get_graph()
+    assert graph.warps
+    rng = random.Random(2)
+    for _ in range(3):
+        end = large_maze.get_random_walkable_position(rng)
+        heuristic = warp_heuristic(graph, graph.cell_id(end))
+        assert heuristic(graph.cell_id(end)) == 0
+        for cell in range(len(graph.walkable)):
+            if not graph.walkable[cell]:
+                continue
+            # Never more than one step between neighbours (so never above the true distance)
+            for d in range(4):
+                landing = graph.edges[cell * 4 + d]
+                if landing != NO_CELL:
+                    assert heuristic(cell) <= heuristic(landing) + 1
+        for start in (large_maze.get_random_walkable_position(rng) for _ in range(5)):
+            assert heuristic(graph.cell_id(start)) <= walk_distances(large_maze, start)[end]
+
+
+def test_paths_take_warps(large_maze):
+    graph = large_maze.get_graph()
+    # A move that lands far from where it started went through a tunnel
+    cell, landing = next((cell, landing) for cell in range(len(graph.walkable))
+                         for landing in graph.edges[cell * 4:cell * 4 + 4]
+                         if landing != NO_CELL and abs(landing % graph.size - cell % graph.size) > 1)
+    path = AStar(large_maze).find_path(graph.position(cell), graph.position(landing))
+    assert len(path) == 2
+
+
+def test_blocked_ends_give_no_path(maze):
+    astar = AStar(maze)
+    start = maze.get_random_walkable_position(random.Random(1))
+    wall = next((x, y) for y in range(maze.size) for x in range(maze.size) if not maze.is_walkable(x, y))
+    assert astar.find_path(start, wall) == []
+    assert astar.find_path(start, (maze.size, 0)) == []
+    assert astar.find_path(start, start) == [start]
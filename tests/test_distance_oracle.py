@@ -0,0 +1,33 @@
+from tests.helpers import walk_distances
+
+
+def test_distances_match_bfs(maze, sample_cells):
+    oracle = maze.get_distance_oracle()
+    for start in sample_cells:
+        reachable = walk_distances(maze, start)
+        for end in oracle.cells:
+            assert oracle.distance(start, end) == reachable.get(end)
+
+
+def test_path_is_a_shortest_walk(maze, sample_cells):
+    oracle = maze.get_distance_oracle()
+    for start in sample_cells:
+        for end in sample_cells:
+            path = oracle.path(start, end)
+            assert len(path) == oracle.distance(start, end)
+
+            # Each step is one tile from where the last one landed
+            position = start
+            for x, y in path:
+                assert abs(x - position[0]) + abs(y - position[1]) == 1
+                assert maze.is_walkable(x, y)
+                position = maze.get_warp_destination(x, y)
+            assert position == end
+
+
+def test_walls_and_outside_positions_are_unreachable(maze, sample_cells):
+    oracle = maze.get_distance_oracle()
+    wall = next((x, y) for y in range(maze.size) for x in range(maze.size) if not maze.is_walkable(x, y))
+    assert oracle.distance(sample_cells[0], wall) is None
+    assert oracle.distance((-1, 0), sample_cells[0]) is None
+    assert oracle.path(sample_cells[0], wall) == []
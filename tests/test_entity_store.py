@@ -0,0 +1,83 @@
+from game.constants import BLUE, RED, TILE_SIZE, DEATH_BLINK_TIME, DEATH_BLINK_INTERVAL
+from game.entities.ghost import Ghost
+from game.entities.pacman import PacMan
+from game.entities.store import EntityStore
+
+
+def test_views_read_and_write_their_rows():
+    store = EntityStore(capacity=1)
+    first = Ghost(1, 2, BLUE, store=store)
+    second = Ghost(3, 4, RED, store=store)  # Grows the columns
+    assert (first.index, second.index) == (0, 1)
+    assert len(store.alive) >= 2
+
+    second.level_up()
+    assert store.level[:2].tolist() == [1, 2]
+    assert store.grid[:, 1].tolist() == [3, 4]
+    assert (first.grid_x, first.grid_y) == (1, 2)
+
+
+def test_collected_pacman_rows_are_reused():
+    store = EntityStore(capacity=2, movable=False)
+    first = PacMan(1, 1, store=store)
+    second = PacMan(2, 2, store=store)
+    first.collect()
+    third = PacMan(3, 3, store=store)
+
+    assert third.index == 0 and store.count == 2
+    assert store.views[0] is third
+    assert (third.grid_x, third.grid_y, third.active) == (3, 3, True)
+    # The collected PacMan keeps its final state, detached from the store
+    assert first.store is not store
+    assert (first.grid_x, first.grid_y, first.active) == (1, 1, False)
+    assert (second.grid_x, second.active) == (2, True)
+
+
+def test_collect_releases_a_row_once():
+    store = EntityStore(capacity=2, movable=False)
+    pacman = PacMan(1, 1, store=store)
+    pacman.collect()
+    pacman.collect()
+    assert store.free == [0]
+
+
+def test_update_moves_ghosts_toward_their_targets():
+    store = EntityStore(capacity=2)
+    ghost = Ghost(1, 1, RED, store=store)
+    ghost.target_x += TILE_SIZE
+    for _ in range(200):
+        store.update(16)
+    assert (ghost.pixel_x, ghost.pixel_y) == (ghost.target_x, ghost.target_y)
+
+
+def test_dying_ghosts_blink_then_finish():
+    store = EntityStore(capacity=2)
+    dying = Ghost(1, 1, RED, store=store)
+    standing = Ghost(2, 2, RED, store=store)
+    dying.start_death()
+    assert store.standing_count() == 1
+
+    store.update(DEATH_BLINK_INTERVAL)
+    assert dying.blink_state and dying.alive
+    store.update(DEATH_BLINK_INTERVAL)
+    assert not dying.blink_state
+
+    store.update(DEATH_BLINK_TIME)
+    assert not dying.alive and standing.alive
+
+
+def test_standing_count_follows_deaths_and_reuse():
+    ghosts = EntityStore(capacity=4)
+    first, second, _ = (Ghost(i, i, RED, store=ghosts) for i in range(3))
+    first.start_death()
+    first.start_death()  # Dying again doesn't count twice
+    assert ghosts.standing_count() == 2
+    ghosts.update(DEATH_BLINK_TIME + 1)
+    assert ghosts.standing_count() == 2 and not first.alive
+
+    pacmans = EntityStore(capacity=2, movable=False)
+    pacman = PacMan(1, 1, store=pacmans)
+    pacman.collect()
+    assert pacmans.standing_count() == 0
+    PacMan(2, 2, store=pacmans)
+    assert pacmans.standing_count() == 1
@@ -0,0 +1,52 @@
+import random
+from game.ai.flow_field import FlowField, FlowFieldService, TableFlowField
+from game.ai.pathfinding import DIRECTIONS
+
+from tests.helpers import walk_distances
+
+
+def test_field_distances_match_the_oracle(maze, sample_cells):
+    oracle = maze.get_distance_oracle()
+    for target in sample_cells:
+        field = FlowField(maze.get_graph(), target)
+        for position in oracle.cells:
+            assert field.distance(position) == oracle.distance(position, target)
+
+
+def test_following_the_field_reaches_the_target(large_maze):
+    target = large_maze.get_random_walkable_position(random.Random(2))
+    field = FlowField(large_maze.get_graph(), target)
+    reachable = walk_distances(large_maze, target)
+    for start in list(reachable)[::97]:
+        position, steps = start, 0
+        while position != target:
+            dx, dy = field.next_step(position)
+            position = large_maze.get_warp_destination(position[0] + dx, position[1] + dy)
+            steps += 1
+        assert steps == field.distance(start)
+    assert field.next_step(target) is None
+
+
+def test_table_field_steps_downhill(maze, sample_cells):
+    oracle = maze.get_distance_oracle()
+    target = sample_cells[0]
+    field = TableFlowField(oracle, target)
+    for start in sample_cells[1:]:
+        dx, dy = field.next_step(start)
+        assert (dx, dy) in DIRECTIONS
+        landing = maze.get_warp_destination(start[0] + dx, start[1] + dy)
+        assert field.distance(landing) == field.distance(start) - 1
+
+
+def test_service_shares_fields_until_their_target_is_dropped(large_maze):
+    service = FlowFieldService(large_maze)
+    rng = random.Random(2)
+    first, second = (large_maze.get_random_walkable_position(rng) for _ in range(2))
+    field = service.get(first)
+    assert service.get(first) is field
+    service.get(second)
+    assert service.fields_built == 2
+
+    service.retain([second])
+    assert list(service.fields) == [second]
+    assert service.get(first) is not field
@@ -0,0 +1,67 @@
+import random
+from game.ai.pathfinding import IncrementalPlanner
+
+from tests.helpers import assert_shortest_path, walk_distances
+
+
+def _neighbours(maze, position):
+    x, y = position
+    return [maze.get_warp_destination(x + dx, y + dy)
+            for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0)) if maze.is_walkable(x + dx, y + dy)]
+
+
+def test_chase_paths_stay_shortest_while_both_ends_move(large_maze):
+    rng = random.Random(4)
+    planner = IncrementalPlanner(large_maze)
+    hunter = large_maze.get_random_walkable_position(rng)
+    target = large_maze.get_random_walkable_position(rng)
+
+    for _ in range(60):
+        target = rng.choice(_neighbours(large_maze, target))
+        path = planner.find_path(hunter, target)
+        assert_shortest_path(large_maze, path, hunter, target)
+        if len(path) < 2:
+            break
+        hunter = large_maze.get_warp_destination(*path[1])
+    assert planner.repairs > 0
+
+
+def test_repairs_expand_fewer_nodes_than_fresh_searches(large_maze):
+    rng = random.Random(6)
+    kept = IncrementalPlanner(large_maze)
+    fresh = IncrementalPlanner(large_maze)
+    hunter = large_maze.get_random_walkable_position(rng)
+    target = large_maze.get_random_walkable_position(rng)
+
+    for _ in range(40):
+        target = rng.choice(_neighbours(large_maze, target))
+        path = kept.find_path(hunter, target)
+        fresh.reset()
+        assert len(fresh.find_path(hunter, target)) == len(path)
+        if len(path) < 2:
+            break
+        hunter = large_maze.get_warp_destination(*path[1])
+    assert kept.nodes_expanded < fresh.nodes_expanded
+
+
+def test_retargeting_to_a_closed_cell_expands_nothing(large_maze):
+    rng = random.Random(8)
+    planner = IncrementalPlanner(large_maze)
+    start = large_maze.get_random_walkable_position(rng)
+    far = max(walk_distances(large_maze, start).items(), key=lambda item: item[1])[0]
+    path = planner.find_path(start, far)
+
+    expanded = planner.nodes_expanded
+    midway = large_maze.get_warp_destination(*path[len(path) // 2])
+    assert_shortest_path(large_maze, planner.find_path(start, midway), start, midway)
+    assert planner.nodes_expanded == expanded
+
+
+def test_unreachable_ends_give_no_path(large_maze):
+    planner = IncrementalPlanner(large_maze)
+    start = large_maze.get_random_walkable_position(random.Random(1))
+    wall = next((x, y) for y in range(large_maze.size) for x in range(large_maze.size)
+                if not large_maze.is_walkable(x, y))
+    assert planner.find_path(start, wall) == []
+    assert planner.find_path(start, (-1, 0)) == []
+    assert planner.find_path(start, start) == [start]
@@ -0,0 +1,39 @@
+import pytest
+from game.maze import Maze
+
+
+def test_round_trip_keeps_the_layout(maze, tmp_path):
+    path = tmp_path / 'maze.pgm'
+    maze.save(path)
+    loaded = Maze.load(path)
+
+    assert loaded.size == maze.size
+    assert (loaded.grid == maze.grid).all()
+    assert loaded.warps == maze.warps
+    assert list(loaded.walkable_cells) == list(maze.walkable_cells)
+    assert loaded.get_graph().edges == maze.get_graph().edges
+
+
+def test_round_trip_with_distance_tables(maze, sample_cells, tmp_path):
+    path = tmp_path / 'maze.pgm'
+    maze.save(path, distance_tables=True)
+    loaded = Maze.load(path).get_distance_oracle()
+    oracle = maze.get_distance_oracle()
+
+    assert loaded.built == b'\x01' * loaded.count
+    for start in sample_cells:
+        for end in sample_cells:
+            assert loaded.distance(start, end) == oracle.distance(start, end)
+            assert loaded.next_step(start, end) == oracle.next_step(start, end)
+
+
+def test_distance_tables_need_a_small_maze(large_maze, tmp_path):
+    with pytest.raises(ValueError):
+        large_maze.save(tmp_path / 'maze.pgm', distance_tables=True)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'not-a-maze.pgm'
+    path.write_bytes(b'PGRC' + bytes(60))
+    with pytest.raises(ValueError):
+        Maze.load(path)
@@ -0,0 +1,95 @@
+import random
+from game.entities.pacman import PacMan
+from game.occupancy import OccupancyIndex
+from game.simulation import Simulation
+
+
+class Token:
+    """Anything standing on a tile"""
+    def __init__(self, x, y):
+        self.grid_x = x
+        self.grid_y = y
+        self.occupancy = None
+
+
+def _walkable(maze, count):
+    rng = random.Random(3)
+    cells = []
+    while len(cells) < count:
+        position = maze.get_random_walkable_position(rng)
+        if position not in cells:
+            cells.append(position)
+    return cells
+
+
+def test_index_tracks_tiles_and_crowding(maze):
+    occupancy = OccupancyIndex(maze)
+    here, there = _walkable(maze, 2)
+    first, second = Token(*here), Token(*here)
+    occupancy.add(first)
+    assert not occupancy.crowded
+    occupancy.add(second)
+    assert list(occupancy.at(*here)) == [first, second]
+    assert occupancy.crowded_entities() == [first, second]
+
+    second.grid_x, second.grid_y = there
+    occupancy.move(second, *here)
+    assert not occupancy.crowded
+    assert list(occupancy.at(*there)) == [second]
+    assert not occupancy.is_free(*there)
+
+    occupancy.remove(second)
+    assert occupancy.is_free(*there) and second.occupancy is None
+
+
+def test_random_free_position_skips_taken_tiles(maze):
+    occupancy = OccupancyIndex(maze)
+    cells = [(int(cell) % maze.size, int(cell) // maze.size) for cell in maze.walkable_cells]
+    for position in cells[:-1]:
+        occupancy.add(Token(*position))
+
+    # Only the last spawn tile is left, found past the rejection sampling
+    assert occupancy.random_free_position(random.Random(1)) == cells[-1]
+    occupancy.add(Token(*cells[-1]))
+    assert occupancy.random_free_position(random.Random(1)) is None
+
+
+def _gather(simulation, ghosts, position):
+    """Stand ghosts on one tile, registered in the given order"""
+    for ghost in ghosts:
+        simulation.occupancy.remove(ghost)
+        ghost.grid_x, ghost.grid_y = position
+        simulation.occupancy.add(ghost)
+
+
+def test_pickups_come_before_fights_in_ghost_order():
+    simulation = Simulation(seed=2, ai_ghosts=3, maze_size=25)
+    first, second, third = simulation.ghosts[1:]
+    position = simulation.maze.get_random_walkable_position(random.Random(4))
+    _gather(simulation, [third, second, first], position)
+    pacman = PacMan(*position, store=simulation.pacman_store)
+    simulation.pacmans.append(pacman)
+    simulation.occupancy.add(pacman)
+
+    # The first ghost in simulation.ghosts order eats, then outranks the others
+    simulation._check_collisions()
+    assert not pacman.active
+    assert first.level == 2 and not first.dying
+    assert second.dying and third.dying
+    assert simulation.kills == [0, 2, 0, 0]
+
+
+def test_ghosts_meet_their_rivals_in_ghost_order():
+    simulation = Simulation(seed=2, ai_ghosts=3, maze_size=25)
+    first, second, third = simulation.ghosts[1:]
+    third.level_up()
+    eliminations = []
+    simulation.on_elimination = lambda winner, losers: eliminations.append((winner, losers))
+    _gather(simulation, [third, second, first], simulation.maze.get_random_walkable_position(random.Random(4)))
+
+    # Like the all-pairs loop it replaced: the first ghost meets each later
+    # rival in turn, even once it has fallen to an equal
+    simulation._check_collisions()
+    assert eliminations == [(None, [first, second]), (third, [first])]
+    assert not third.dying
+    assert simulation.kills == [0, 0, 0, 1]
@@ -0,0 +1,61 @@
+import random
+import pytest
+from game.maze import Maze
+from game.replay import Recorder, Recording, Replayer
+from game.simulation import Simulation
+from game.ai.pathfinding import DIRECTIONS
+
+from tests.helpers import match_state
+
+MAZE_SEED = 21
+MAZE_SIZE = 25
+GHOSTS = 6
+
+
+def _recorded_match(ticks=1200):
+    """Play a match with random player moves, recording it; returns the recorder and final state"""
+    maze = Maze(random.Random(MAZE_SEED), MAZE_SIZE)
+    maze.seed = MAZE_SEED
+    simulation = Simulation(seed=4, ai_ghosts=GHOSTS, maze=maze, max_pacmans=4)
+    recorder = Recorder(simulation, GHOSTS, MAZE_SIZE)
+    moves = random.Random(9)
+    for tick in range(ticks):
+        if tick % 8 == 0:
+            dx, dy = moves.choice(DIRECTIONS)
+            recorder.record_move(dx, dy)
+            simulation.move_player(dx, dy)
+        simulation.step()
+        recorder.tick_done()
+    return recorder, match_state(simulation)
+
+
+def test_replay_reproduces_the_match(tmp_path):
+    recorder, final = _recorded_match()
+    path = recorder.save(tmp_path)
+    recording = Recording.load(path)
+
+    assert recording.ticks == recorder.recording.ticks
+    assert recording.events == recorder.recording.events
+    assert match_state(Replayer(recording).run()) == final
+
+
+def test_seeking_back_replays_from_a_keyframe():
+    recorder, _ = _recorded_match()
+    replayer = Replayer(recorder.recording, keyframe_interval=250)
+    later = match_state(replayer.seek(900))
+    replayer.seek(300)
+    assert replayer.tick == 300
+    assert match_state(replayer.seek(900)) == later
+
+
+def test_unseeded_mazes_cannot_be_recorded():
+    simulation = Simulation(seed=4, ai_ghosts=1, maze_size=MAZE_SIZE)
+    with pytest.raises(ValueError):
+        Recorder(simulation, 1, MAZE_SIZE)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'match.pgr'
+    path.write_bytes(b'PGMZ' + bytes(60))
+    with pytest.raises(ValueError):
+        Recording.load(path)
@@ -0,0 +1,84 @@
+from game.ai.scheduler import AIScheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+
+class StubAI:
+    """Just enough of GhostAI for the scheduler: timing, decide and follow"""
+    def __init__(self, clock, log):
+        self.clock = clock
+        self.log = log
+        self.path_invalidated = False
+        self.follows = 0
+
+    def decision_due(self):
+        return self.clock.now - self.last_decision_time >= self.decision_interval
+
+    def decide(self, pacmans, ghosts):
+        self.last_decision_time = self.clock.now
+        self.path_invalidated = False
+        self.log.append(self)
+
+    def follow(self):
+        self.follows += 1
+
+
+def _scheduler(count, budget_ms=None, interval=400):
+    clock = Clock()
+    log = []
+    controllers = [StubAI(clock, log) for _ in range(count)]
+    return AIScheduler(controllers, budget_ms=budget_ms, decision_interval=interval), clock, log
+
+
+def test_decisions_are_staggered_over_the_interval():
+    scheduler, clock, log = _scheduler(40)
+    per_tick = []
+    for tick in range(26):
+        clock.now = tick * 16
+        del log[:]
+        scheduler.update([], [])
+        per_tick.append(len(log))
+
+    # Over one interval (0-400 ms) everyone decides once, a couple per tick
+    assert sum(per_tick) == 40
+    assert max(per_tick) <= 2
+    assert all(ai.follows == 25 for ai in scheduler.controllers)
+
+
+def test_an_exhausted_budget_defers_the_rest_to_the_next_tick():
+    scheduler, clock, log = _scheduler(6, budget_ms=0, interval=100)
+    clock.now = 1000  # Everyone is due
+    scheduler.update([], [])
+    assert len(log) == 1 and scheduler.cutoff == 1
+    assert scheduler.deferred == 5
+
+    # The longest waiting go first
+    waiting = sorted(scheduler.controllers, key=lambda ai: ai.last_decision_time)
+    clock.now += 16
+    scheduler.update([], [])
+    assert log[1] is waiting[0]
+
+
+def test_failed_paths_are_replanned_first():
+    scheduler, clock, log = _scheduler(4, budget_ms=0, interval=100)
+    failed = scheduler.controllers[2]
+    failed.path_invalidated = True
+    clock.now = 1000
+    scheduler.update([], [])
+    assert log == [failed]
+
+
+def test_decision_limit_reproduces_a_cutoff():
+    scheduler, clock, log = _scheduler(5, interval=100)
+    clock.now = 1000
+    scheduler.decision_limit = 3
+    scheduler.update([], [])
+    assert len(log) == 3 and scheduler.cutoff == 3
+
+    scheduler.decision_limit = None
+    clock.now += 16
+    scheduler.update([], [])
+    assert len(log) == 5 and scheduler.cutoff is None
@@ -0,0 +1,38 @@
+from game.simulation import Simulation
+
+from tests.helpers import match_state
+
+
+def _play(simulation, ticks):
+    for _ in range(ticks):
+        simulation.step()
+    return match_state(simulation)
+
+
+def test_same_seed_plays_the_same_match():
+    first = _play(Simulation(seed=11, ai_ghosts=8, maze_size=25), 1500)
+    second = _play(Simulation(seed=11, ai_ghosts=8, maze_size=25), 1500)
+    assert first == second
+
+
+def test_different_seeds_play_different_matches():
+    first = _play(Simulation(seed=11, ai_ghosts=8, maze_size=25), 300)
+    second = _play(Simulation(seed=12, ai_ghosts=8, maze_size=25), 300)
+    assert first != second
+
+
+def test_snapshot_continues_like_the_original():
+    simulation = Simulation(seed=5, ai_ghosts=8, maze_size=25)
+    _play(simulation, 600)
+    copy = simulation.snapshot()
+    assert _play(copy, 900) == _play(simulation, 900)
+
+
+def test_snapshot_without_an_oracle_continues_like_the_original():
+    simulation = Simulation(seed=3, ai_ghosts=12, maze_size=81)
+    assert simulation.maze.get_distance_oracle() is None
+    for ghost in simulation.ghosts[::2]:
+        ghost.level_up()  # Gives ghosts weaker neighbours to chase
+    _play(simulation, 200)
+    copy = simulation.snapshot()
+    assert _play(copy, 600) == _play(simulation, 600)
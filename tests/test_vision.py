@@ -0,0 +1,40 @@
+import random
+from game.ai.vision import VisionQuery
+
+from tests.helpers import walk_distances
+
+
+def test_scan_reports_distances_within_the_radius(large_maze):
+    vision = VisionQuery(large_maze)
+    start = large_maze.get_random_walkable_position(random.Random(2))
+    reachable = walk_distances(large_maze, start)
+    candidates = list(reachable)[::41]
+    radius = 12
+
+    found = vision.scan(start, candidates, radius)
+    for position, distance in zip(candidates, found):
+        expected = reachable[position]
+        assert distance == (expected if expected <= radius else None)
+
+
+def test_shared_query_answers_every_scan_afresh(large_maze):
+    vision = large_maze.get_vision()
+    assert large_maze.get_vision() is vision
+    rng = random.Random(3)
+    starts = [large_maze.get_random_walkable_position(rng) for _ in range(2)]
+    reachable = [walk_distances(large_maze, start) for start in starts]
+    candidates = list(reachable[0])[::53] + list(reachable[1])[::53]
+
+    first = vision.scan(starts[0], candidates, 10)
+    vision.scan(starts[1], candidates, 10)
+    assert vision.scan(starts[0], candidates, 10) == first
+    assert first == [reachable[0].get(pos) if reachable[0].get(pos, 11) <= 10 else None for pos in candidates]
+
+
+def test_walls_and_far_candidates_are_not_seen(maze):
+    vision = VisionQuery(maze)
+    start = maze.get_random_walkable_position(random.Random(2))
+    wall = next((x, y) for y in range(maze.size) for x in range(maze.size) if not maze.is_walkable(x, y))
+    far = max(walk_distances(maze, start).items(), key=lambda item: item[1])[0]
+
+    assert vision.scan(start, [wall, far, (-1, -1)], 2) == [None, None, None]
@@ -1,11 +1,26 @@
 import pygame
 import random
 import os
-import numpy
+
+_mixer_failed = False
+
+def init_mixer():
+    """Initialize the mixer on first use (opening the audio device is slow); False if there is no audio"""
+    global _mixer_failed
+    if not pygame.mixer or _mixer_failed:
+        return False
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Could not initialize audio: {e}")
+            _mixer_failed = True
+            return False
+    return True
 
 def load_sound(filename):
     """Load a sound file and return a pygame Sound object"""
-    if not pygame.mixer or not pygame.mixer.get_init():
+    if not init_mixer():
         return None
         
     try:
@@ -56,7 +71,7 @@ def create_placeholder_image(width, height, color, name):
     
     return surface
 
-def get_random_color(exclude_color=None):
+def get_random_color(exclude_color=None, rng=None):
     """Get a random color, optionally excluding a specific color"""
     colors = [
         (255, 0, 0),      # Red
@@ -72,7 +87,7 @@ def get_random_color(exclude_color=None):
     if exclude_color:
         colors = [c for c in colors if c != exclude_color]
     
-    return random.choice(colors)
+    return (rng or random).choice(colors)
 
 def calculate_offset(maze_size, tile_size, screen_width, screen_height):
     """Calculate offset to center the maze on screen"""